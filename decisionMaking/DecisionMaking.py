@@ -97,16 +97,9 @@ class DecisionMaking:
                 "Tallbird", "Ghost", "GuardianPig", "Merm", "Tentacle", "ClockRook", "ClockKnight", "ClockBishop",
                 "Nightmare1", "Nightmare2", "Werepig", "Mosquito"
             ]
-            monster_lists = modeling.world_model.get_all_of(monsters)
-            all_objects = []
-            for monster_list in monster_lists.values():
-                all_objects = [*all_objects, *monster_list]
-            locations = [obj.position for obj in all_objects]
-            distances = [location.distance(modeling.player_model.position) for location in locations]
-            if len(distances) > 0:
-                closest_index = min(range(len(distances)), key=distances.__getitem__)
-                if distances[closest_index] < MONSTER_DANGER_DISTANCE:
-                    self.run_away_from(locations[closest_index], modeling.player_model.position)
+            closest, distance = modeling.world_model.object_store.nearest(modeling.player_model.position, monsters)
+            if closest is not None and distance < MONSTER_DANGER_DISTANCE:
+                self.run_away_from(closest.position, modeling.player_model.position)
 
     # helps with inventory management
     def inventory_management_system(self, modeling: Modeling) -> None:
@@ -114,14 +107,12 @@ class DecisionMaking:
 
     def choose_destination(self, objectives: list[Point2d], player_position: Point2d,
                            all_objects: list[ObjectModel]) -> None:
-        closest = None
-        closest_distance = None
-        closest_index = None
-        for index, obj_pos in enumerate(objectives):
-            if closest is None or closest_distance > obj_pos.distance(player_position):
-                closest = obj_pos
-                closest_distance = obj_pos.distance(player_position)
-                closest_index = index
+        positions = np.array([(obj_pos.x1, obj_pos.x2) for obj_pos in objectives])
+        distances = np.hypot(positions[:, 0] - player_position.x1, positions[:, 1] - player_position.x2)
+        # argmin returns the first closest objective, like a strict comparison would
+        closest_index = int(np.argmin(distances))
+        closest = objectives[closest_index]
+        closest_distance = float(distances[closest_index])
         if closest_distance < PICK_UP_DISTANCE:
             self.secondary_action = ("pick_up_item", all_objects[closest_index])
         else:
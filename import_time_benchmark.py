@@ -0,0 +1,61 @@
+import subprocess
+import sys
+
+# modules that each process imports when it starts, main is what every spawned process imports first
+PROCESS_MODULES = {
+    "main": ["main"],
+    "capture": ["perception.ScreenCapture"],
+    "vision": ["perception.Perception"],
+    "segmentation": ["perception.SegmentationModel"],
+    "control": ["action.Action", "control.Control", "decisionMaking.DecisionMaking", "modeling.Modeling", "utility.TickScheduler"],
+    "debug screen": ["utility.DebugScreen"],
+}
+# number of slowest modules shown for each process
+TOP_MODULES = 5
+
+
+def measure_import_time(modules : list[str]) -> tuple[float, list[tuple[float, str]]]:
+    """Import the modules in a fresh interpreter with -X importtime
+
+    :param modules: modules to be imported
+    :type modules: list[str]
+    :return: total import time in seconds of the modules and (cumulative time in seconds, module) for each module they
+    import directly, slowest first
+    :rtype: tuple[float, list[tuple[float, str]]]
+    """
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", "; ".join(f"import {m}" for m in modules)],
+                            capture_output=True, text=True)
+    if result.returncode != 0:
+        raise ImportError(result.stderr.strip().splitlines()[-1])
+    total = 0.
+    dependencies = []
+    # imports are printed after the ones they trigger, so direct imports are kept until we know who imported them
+    pending = []
+    for line in result.stderr.splitlines():
+        # import time: self [us] | cumulative | imported package
+        if not line.startswith("import time:") or "imported package" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        # nested imports are indented by two spaces per level
+        depth = (len(name) - len(name.lstrip()) - 1)//2
+        if depth == 1:
+            pending.append((int(cumulative)/1e6, name.strip()))
+        elif depth == 0:
+            # interpreter startup imports are ignored
+            if name.strip() in modules:
+                total += int(cumulative)/1e6
+                dependencies.extend(pending)
+            pending = []
+    return total, sorted(dependencies, reverse=True)
+
+
+if __name__ == "__main__":
+    for process, modules in PROCESS_MODULES.items():
+        try:
+            total, imports = measure_import_time(modules)
+        except ImportError as e:
+            print(f"{process}: failed ({e})")
+            continue
+        print(f"{process}: {total:.3f} s")
+        for t, name in imports[:TOP_MODULES]:
+            print(f"    {t:.3f} s {name}")
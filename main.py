@@ -1,87 +1,121 @@
 import time
-from multiprocessing import Process, Queue, Value
+from multiprocessing import Process, Queue
 
-import keyboard
-import pandas as pd
-
-from action.Action import Action
-from control.Control import Control
-from decisionMaking.DecisionMaking import DecisionMaking
-from modeling.Modeling import Modeling
-from perception.Perception import Perception
-from perception.SegmentationModel import SegmentationModel
-from utility.DebugScreen import DebugScreen
+# spawned processes import this module again, so only the lightweight shared transports are imported here.
+# each process imports what it needs (models, pandas, keyboard, tkinter) in its own entry function
+from perception.FrameRingBuffer import FrameRingBuffer
+from perception.SharedDetections import SharedDetections
+from perception.SharedSegmentationMask import SharedSegmentationMask
+from utility.Lifecycle import Lifecycle
 
 
 MAX_TIMEOUT_TIME = 60
+# how long consumers wait for a new frame or result before checking whether they should stop
+NEW_DATA_WAIT_TIMEOUT = 0.1
+# how often the debug screen is refreshed while the main process waits for the stop
+DEBUG_SCREEN_REFRESH_INTERVAL = 1/30
+# control ticks per second when no new detections arrive, new detections start a tick right away
+CONTROL_TICK_RATE = 30
+
+def capture_main(frame_buffer: FrameRingBuffer, lifecycle: Lifecycle, 
+                 should_record_times : bool = False):
+    from perception.ScreenCapture import ScreenCapture
+    capture = ScreenCapture(frame_buffer, measure_time=should_record_times)
+    print("Capture ready")
+    lifecycle.ready()
+    lifecycle.wait_for_start()
+    start = time.time()
+    while not lifecycle.should_stop() and time.time() - start < MAX_TIMEOUT_TIME:
+        capture.capture() # takes like 30 ms avg
+
+    if should_record_times:
+        import pandas as pd
+        # save capture time records
+        capture_df = pd.DataFrame(capture.time_records, columns=capture.split_names)
+        capture_df.to_csv("times/capture.csv", index=False)
+    print("Capture done")
 
-def vision_main(detected_objects_queue: Queue, should_start: Value, should_stop: Value, 
+def vision_main(frame_buffer: FrameRingBuffer, shared_detections: SharedDetections, lifecycle: Lifecycle, 
                 q: Queue = None, should_record_times : bool = False):
+    from perception.Perception import Perception
     perception = Perception(debug=q is not None, queue=q, measure_time=should_record_times)
     print("Perception ready")
-    while should_start.value == 0:
-        pass
+    lifecycle.ready()
+    lifecycle.wait_for_start()
     start = time.time()
-    while should_stop.value == 0 and time.time() - start < MAX_TIMEOUT_TIME:
-        timestamp = time.time()
-        objects = perception.perceive()[0]
-        try:
-            detected_objects_queue.put((objects, timestamp))
-        except ValueError:
-            print("detected_objects_queue closed")
+    last_frame_id = -1
+    while not lifecycle.should_stop() and time.time() - start < MAX_TIMEOUT_TIME:
+        frame, frame_id, timestamp = frame_buffer.wait_newer_than(last_frame_id, NEW_DATA_WAIT_TIMEOUT)
+        if frame is None:
+            continue
+        last_frame_id = frame_id
+        detections = perception.perceive(frame)[0]
+        shared_detections.publish(detections, timestamp)
 
     if should_record_times:
+        import pandas as pd
         # save perception time records
         perception_df = pd.DataFrame(perception.time_records, columns=perception.split_names)
         perception_df.to_csv("times/perception.csv", index=False)
 
-    detected_objects_queue.cancel_join_thread()
+    if perception.motion_gate is not None:
+        print(f"Perception motion gate: {perception.motion_gate.stats()}")
     if q is not None:
         q.cancel_join_thread()
     print("Perception done")
 
-def segmentation_main(segmentation_results_queue: Queue, should_start: Value, should_stop: Value, 
+def segmentation_main(frame_buffer: FrameRingBuffer, shared_segmentation_mask: SharedSegmentationMask, lifecycle: Lifecycle, 
                       q: Queue = None, should_record_times : bool = False):
+    from perception.SegmentationModel import SegmentationModel
     seg_model = SegmentationModel(debug=q is not None, queue=q, measure_time=should_record_times)
     print("Segmentation ready")
-    while should_start.value == 0:
-        pass
+    lifecycle.ready()
+    lifecycle.wait_for_start()
     start = time.time()
-    while should_stop.value == 0 and time.time() - start < MAX_TIMEOUT_TIME:
-        timestamp = time.time()
-        results = seg_model.perceive()
-        try:
-            segmentation_results_queue.put((results, timestamp))
-        except ValueError:
-            print("segmentation_results_queue closed")
+    last_frame_id = -1
+    while not lifecycle.should_stop() and time.time() - start < MAX_TIMEOUT_TIME:
+        frame, frame_id, timestamp = frame_buffer.wait_newer_than(last_frame_id, NEW_DATA_WAIT_TIMEOUT)
+        if frame is None:
+            continue
+        last_frame_id = frame_id
+        # frames are stored in BGR, but the segmentation model expects RGB (this is just a view, not a copy)
+        results = seg_model.perceive(frame[:, :, ::-1])
+        shared_segmentation_mask.publish(results, timestamp)
 
     if should_record_times:
+        import pandas as pd
         # save segmentation time records
         segmentation_df = pd.DataFrame(seg_model.time_records, columns=seg_model.split_names)
         segmentation_df.to_csv("times/segmentation.csv", index=False)
 
-    segmentation_results_queue.cancel_join_thread()
     if q is not None:
         q.cancel_join_thread()
     print("Segmentation done")
 
-def control_main(detected_objects_queue: Queue, segmentation_queue: Queue, should_start: Value, should_stop: Value, 
+def control_main(shared_detections: SharedDetections, shared_segmentation_mask: SharedSegmentationMask, lifecycle: Lifecycle, 
                  q: Queue = None, should_record_times : bool = False):
+    from action.Action import Action
+    from control.Control import Control
+    from decisionMaking.DecisionMaking import DecisionMaking
+    from modeling.Modeling import Modeling
+    from utility.TickScheduler import TickScheduler
     action = Action(debug=q is not None, measure_time=should_record_times)
     control = Control(debug=q is not None, measure_time=should_record_times)
     decision_making = DecisionMaking(debug=q is not None, measure_time=should_record_times)
     modeling = Modeling(debug=q is not None, measure_time=should_record_times)
+    scheduler = TickScheduler(rate=CONTROL_TICK_RATE, mailbox=shared_detections, measure_time=should_record_times)
     print("Control ready")
-    while should_start.value == 0:
-        pass
+    lifecycle.ready()
+    lifecycle.wait_for_start()
     start = time.time()
     modeling.clock.start()
     control.clock.start()
     # wait for YOLO to initialize, only start doing stuff after we receive information
-    while detected_objects_queue.empty():
+    while shared_detections.wait_for_newer(-1, NEW_DATA_WAIT_TIMEOUT) < 0 and not lifecycle.should_stop():
         pass
-    while should_stop.value == 0 and time.time() - start < MAX_TIMEOUT_TIME:
-        q1 = modeling.update_model(detected_objects_queue, segmentation_queue)
+    while not lifecycle.should_stop() and time.time() - start < MAX_TIMEOUT_TIME:
+        scheduler.wait_for_next_tick()
+        q1 = modeling.update_model(shared_detections, shared_segmentation_mask)
         q2 = decision_making.decide(modeling)
         q3 = control.control(decision_making, modeling)
         action.act(control)
@@ -91,8 +125,10 @@ def control_main(detected_objects_queue: Queue, segmentation_queue: Queue, shoul
                 q.put(("control_info", q1, q2, q3))
             except ValueError:
                 print("control debug_queue closed")
+        scheduler.end_tick()
 
     if should_record_times:
+        import pandas as pd
         # save modeling time records
         modeling_df = pd.DataFrame(modeling.time_records, columns=modeling.split_names)
         modeling_df.to_csv("times/modeling.csv", index=False)
@@ -120,73 +156,82 @@ def control_main(detected_objects_queue: Queue, segmentation_queue: Queue, shoul
         # save action time records
         action_df = pd.DataFrame({'act': action.time_records})
         action_df.to_csv("times/action.csv", index=False)
+
+        # save control tick time records
+        ticks_df = pd.DataFrame(scheduler.time_records, columns=scheduler.split_names)
+        ticks_df.to_csv("times/control_ticks.csv", index=False)
     
-    detected_objects_queue.cancel_join_thread()
-    segmentation_queue.cancel_join_thread()
     if q is not None:
         q.cancel_join_thread()
-    print("Control done")
+    print(f"Control done ({scheduler.overruns} ticks overran their budget)")
     
 
 if __name__ == "__main__":
+    import keyboard
+
     debug = True
     should_record_times = True
     if debug:
-        should_start = Value('b', 0)
-        should_stop = Value('b', 0)
-        detected_objects_queue = Queue()
-        segmentation_queue = Queue()
+        lifecycle = Lifecycle(processes=4)
+        frame_buffer = FrameRingBuffer()
+        shared_detections = SharedDetections()
+        shared_segmentation_mask = SharedSegmentationMask()
+        from utility.DebugScreen import DebugScreen
         debug_screen = DebugScreen()
+        capture_process = Process(target=capture_main, 
+                                  args=(frame_buffer, lifecycle, should_record_times))
+        capture_process.start()
         vision_process = Process(target=vision_main, 
-                                 args=(detected_objects_queue, should_start, should_stop, 
+                                 args=(frame_buffer, shared_detections, lifecycle, 
                                        debug_screen.vision_debug_queue, should_record_times))
         vision_process.start()
         segmentation_process = Process(target=segmentation_main, 
-                                       args=(segmentation_queue, should_start, should_stop, 
+                                       args=(frame_buffer, shared_segmentation_mask, lifecycle, 
                                              debug_screen.segmentation_debug_queue, should_record_times))
         segmentation_process.start()
         control_process = Process(target=control_main, 
-                                  args=(detected_objects_queue, segmentation_queue, should_start, should_stop, 
+                                  args=(shared_detections, shared_segmentation_mask, lifecycle, 
                                         debug_screen.control_debug_queue, should_record_times))
         control_process.start()
+        keyboard.add_hotkey("p", lifecycle.start)
+        keyboard.add_hotkey("l", lifecycle.stop)
         start = time.time()
-        while time.time() - start < MAX_TIMEOUT_TIME:
-            if keyboard.is_pressed("p"):
-                should_start.value = 1
+        started = False
+        while time.time() - start < MAX_TIMEOUT_TIME and not lifecycle.wait_for_stop(DEBUG_SCREEN_REFRESH_INTERVAL):
+            if not started and lifecycle.is_started():
+                started = True
                 start = time.time()
-            elif keyboard.is_pressed("l"):
-                should_stop.value = 1
             debug_screen.update()
-        should_stop.value = 1
+        lifecycle.stop()
         debug_screen.close()
-        detected_objects_queue.close()
-        segmentation_queue.close()
     else:
-        should_start = Value('b', 0)
-        should_stop = Value('b', 0)
-        detected_objects_queue = Queue()
-        segmentation_queue = Queue()
-        vision_process = Process(target=vision_main, args=(detected_objects_queue, should_start, should_stop, 
+        lifecycle = Lifecycle(processes=4)
+        frame_buffer = FrameRingBuffer()
+        shared_detections = SharedDetections()
+        shared_segmentation_mask = SharedSegmentationMask()
+        capture_process = Process(target=capture_main, 
+                                  args=(frame_buffer, lifecycle, should_record_times))
+        capture_process.start()
+        vision_process = Process(target=vision_main, args=(frame_buffer, shared_detections, lifecycle, 
                                                            None, should_record_times))
         vision_process.start()
         segmentation_process = Process(target=segmentation_main, 
-                                       args=(segmentation_queue, should_start, should_stop, 
+                                       args=(frame_buffer, shared_segmentation_mask, lifecycle, 
                                              None, should_record_times))
         segmentation_process.start()
-        control_process = Process(target=control_main, args=(detected_objects_queue, segmentation_queue, should_start, should_stop, 
+        control_process = Process(target=control_main, args=(shared_detections, shared_segmentation_mask, lifecycle, 
                                                              None, should_record_times))
         control_process.start()
-        start = time.time()
-        while time.time() - start < MAX_TIMEOUT_TIME:
-            if keyboard.is_pressed("p"):
-                should_start.value = 1
-            elif keyboard.is_pressed("l"):
-                should_stop.value = 1
-        should_stop.value = 1
-
-        detected_objects_queue.close()
-        segmentation_queue.close()
+        keyboard.add_hotkey("p", lifecycle.start)
+        keyboard.add_hotkey("l", lifecycle.stop)
+        lifecycle.wait_for_stop(MAX_TIMEOUT_TIME)
+        lifecycle.stop()
+
     
+    capture_process.join()
     vision_process.join()
     segmentation_process.join()
     control_process.join()
+    frame_buffer.close()
+    shared_detections.close()
+    shared_segmentation_mask.close()
@@ -0,0 +1,61 @@
+import gc
+import random
+import time
+import tracemalloc
+
+from modeling.Factory import factory
+from modeling.Modeling import Modeling
+from modeling.ObjectsInfo import objects_info
+from utility.Point2d import Point2d
+
+# number of objects in the synthetic world
+N_OBJECTS = 10000
+# number of Point2d operations in the arithmetic part
+N_POINT_OPERATIONS = 100000
+WORLD_SIZE = 1000
+
+
+def build_world(modeling : Modeling) -> None:
+    image_ids = [image_id for image_id in objects_info.all_image_ids()
+                 if objects_info.object_type_from_image_id(image_id) == "OBJECT"]
+    for _ in range(N_OBJECTS):
+        pos = Point2d(random.uniform(-WORLD_SIZE, WORLD_SIZE), random.uniform(-WORLD_SIZE, WORLD_SIZE))
+        obj = factory.create_object(random.choice(image_ids), pos, (0, 0, 10, 10), modeling.world_model.scheduler)
+        modeling.world_model.add_object(obj)
+
+
+def move_points(points : list[Point2d]) -> Point2d:
+    total = Point2d(0, 0)
+    for i in range(N_POINT_OPERATIONS):
+        p = points[i % len(points)]
+        total = total + (p - total)*0.001
+    return total
+
+
+if __name__ == "__main__":
+    random.seed(0)
+    modeling = Modeling()
+    gc.collect()
+
+    tracemalloc.start()
+    start = time.perf_counter()
+    build_world(modeling)
+    build_time = time.perf_counter() - start
+    world_memory, world_peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"World with {N_OBJECTS} objects: {world_memory/2**20:.2f} MiB ({world_memory/N_OBJECTS:.0f} B per object, "
+          f"peak {world_peak/2**20:.2f} MiB), built in {build_time:.3f} s")
+
+    start = time.perf_counter()
+    gc.collect()
+    print(f"Full GC pass: {(time.perf_counter() - start)*1e3:.2f} ms")
+
+    points = [obj.position for obj_list in modeling.world_model.object_lists.values() for obj in obj_list]
+    tracemalloc.start()
+    start = time.perf_counter()
+    move_points(points)
+    arithmetic_time = time.perf_counter() - start
+    _, arithmetic_peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{N_POINT_OPERATIONS} Point2d updates: {arithmetic_time*1e3:.1f} ms, peak {arithmetic_peak/1024:.1f} KiB")
+    print(f"GC collections: {[stats['collections'] for stats in gc.get_stats()]}")
@@ -0,0 +1,182 @@
+import math
+
+import numpy as np
+
+from modeling.constants import FOV, CAMERA_DISTANCE, CAMERA_PITCH, CAMERA_HEADING, CAMERA_FOLLOW_HEIGHT
+from perception.constants import SCREEN_SIZE, SEGMENTATION_INPUT_SIZE
+from utility.Point2d import Point2d
+
+
+class CameraModel:
+    # camera models are only computed once for each (heading, pitch, distance, fov)
+    _cache : dict[tuple[float, float, float, float], "CameraModel"] = {}
+
+    def __init__(self, heading : float, pitch : float, distance : float, fov : float,
+                 follow_height : float = CAMERA_FOLLOW_HEIGHT):
+        """Projection between screen positions and ground positions for a camera setup. Everything that depends only
+        on the camera (the screen to ground homography, its inverse, the corners of the visible region and the
+        segmentation warp matrix) is computed once here, use CameraModel.get() to reuse them between calls
+
+        :param heading: camera heading in degrees
+        :type heading: float
+        :param pitch: camera pitch in degrees
+        :type pitch: float
+        :param distance: camera distance
+        :type distance: float
+        :param fov: camera FOV in degrees
+        :type fov: float
+        :param follow_height: height of the point the camera follows, defaults to CAMERA_FOLLOW_HEIGHT
+        :type follow_height: float, optional
+        """
+        self.heading = heading
+        self.pitch = pitch
+        self.distance = distance
+        self.fov = fov
+        self.follow_height = follow_height
+        # f = H / (2*tan(AFOV/2)), f focal distance, H height, AFOV angular FOV
+        self.f = SCREEN_SIZE["height"]/(2*math.tan(fov/180*math.pi/2))
+        self.cx = SCREEN_SIZE["width"]/2
+        self.cy = SCREEN_SIZE["height"]/2
+        sin_heading = math.sin(heading*math.pi/180)
+        cos_heading = math.cos(heading*math.pi/180)
+        sin_pitch = math.sin(pitch*math.pi/180)
+        cos_pitch = math.cos(pitch*math.pi/180)
+        # the projection of the normalized image coordinates (fx, fy) to the ground is
+        # world_x = (a1*fx + b1*fy + c1)/(cos_pitch*fy + sin_pitch), world_z = (a2*fx + b2*fy + c2)/(cos_pitch*fy + sin_pitch)
+        a1 = -sin_heading*follow_height - sin_heading*sin_pitch*distance
+        b1 = cos_heading*sin_pitch*follow_height + cos_heading*distance
+        c1 = -cos_heading*cos_pitch*follow_height
+        a2 = cos_heading*follow_height + cos_heading*sin_pitch*distance
+        b2 = sin_heading*sin_pitch*follow_height + sin_heading*distance
+        c2 = -sin_heading*cos_pitch*follow_height
+        # with fx = (u - cx)/f and fy = (v - cy)/f, this is a homography from screen (u, v) to ground (x, z)
+        self.homography = np.array([
+            [a1/self.f, b1/self.f, c1 - a1*self.cx/self.f - b1*self.cy/self.f],
+            [a2/self.f, b2/self.f, c2 - a2*self.cx/self.f - b2*self.cy/self.f],
+            [0., cos_pitch/self.f, sin_pitch - cos_pitch*self.cy/self.f],
+        ])
+        self.inverse_homography = np.linalg.inv(self.homography)
+
+        width = SCREEN_SIZE["width"]
+        height = SCREEN_SIZE["height"]
+        corners = self.screen_to_world(np.array([
+            [0, 0], [0, height], [width, height], [width, 0],
+            [width*0.1, height*0.1], [width*0.1, height*0.9], [width*0.9, height*0.9], [width*0.9, height*0.1],
+        ]))
+        # corners of the trapezoid that we are seeing, relative to the point in the screen center
+        self.view_corners : list[Point2d] = [Point2d(x1, x2) for x1, x2 in corners[:4].tolist()]
+        # corners of the region in which objects can be deleted if they aren't detected
+        self.deletion_corners : list[Point2d] = [Point2d(x1, x2) for x1, x2 in corners[4:].tolist()]
+        self._ground_warp : tuple[np.array, tuple[float, float], tuple[float, float]] = None
+
+    @classmethod
+    def get(cls, heading : float = CAMERA_HEADING, pitch : float = CAMERA_PITCH,
+            distance : float = CAMERA_DISTANCE, fov : float = FOV) -> "CameraModel":
+        """Get the camera model for these parameters, it's only computed the first time it's requested
+
+        :param heading: camera heading in degrees, defaults to CAMERA_HEADING
+        :type heading: float, optional
+        :param pitch: camera pitch in degrees, defaults to CAMERA_PITCH
+        :type pitch: float, optional
+        :param distance: camera distance, defaults to CAMERA_DISTANCE
+        :type distance: float, optional
+        :param fov: camera FOV in degrees, defaults to FOV
+        :type fov: float, optional
+        :return: camera model
+        :rtype: CameraModel
+        """
+        key = (heading, pitch, distance, fov)
+        if key not in cls._cache:
+            cls._cache[key] = cls(heading, pitch, distance, fov)
+        return cls._cache[key]
+
+    def screen_to_world(self, points : np.array) -> np.array:
+        """Project screen positions to the ground
+
+        :param points: array with shape (N, 2) of screen positions (u, v), u to the right and v down
+        :type points: np.array
+        :return: array with shape (N, 2) of (x, z) positions in the world's coordinate system, but with the origin in
+        the point in the screen center
+        :rtype: np.array
+        """
+        points = np.asarray(points, dtype=np.float64)
+        u = points[:, 0]
+        v = points[:, 1]
+        h = self.homography
+        # this is written element by element so that a single point gives exactly the same result as in a batch
+        w = h[2, 1]*v + h[2, 2]
+        x = (h[0, 0]*u + h[0, 1]*v + h[0, 2])/w
+        z = (h[1, 0]*u + h[1, 1]*v + h[1, 2])/w
+        return np.stack([x, z], axis=1)
+
+    def world_to_screen(self, points : np.array) -> np.array:
+        """Project ground positions to the screen
+
+        :param points: array with shape (N, 2) of (x, z) positions relative to the point in the screen center
+        :type points: np.array
+        :return: array with shape (N, 2) of screen positions (u, v)
+        :rtype: np.array
+        """
+        points = np.asarray(points, dtype=np.float64)
+        x = points[:, 0]
+        z = points[:, 1]
+        h = self.inverse_homography
+        w = h[2, 0]*x + h[2, 1]*z + h[2, 2]
+        u = (h[0, 0]*x + h[0, 1]*z + h[0, 2])/w
+        v = (h[1, 0]*x + h[1, 1]*z + h[1, 2])/w
+        return np.stack([u, v], axis=1)
+
+    def ground_warp(self) -> tuple[np.array, tuple[float, float], tuple[float, float]]:
+        """Perspective transform that warps a segmentation image (SEGMENTATION_INPUT_SIZE) to the ground
+
+        :return: warp matrix, x range and y range relative to the player
+        :rtype: tuple[np.array, tuple[float, float], tuple[float, float]]
+        """
+        if self._ground_warp is not None:
+            return self._ground_warp
+        f = self.f
+        cx = self.cx
+        cy = self.cy
+        heading = self.heading*math.pi/180
+        pitch = self.pitch*math.pi/180
+        distance = self.distance
+        matrix = np.array([
+            [(-f*math.sin(heading)-cx*math.cos(pitch)*math.cos(heading))*SEGMENTATION_INPUT_SIZE[0]/SCREEN_SIZE["width"],
+             (f*math.cos(heading)-cx*math.cos(pitch)*math.sin(heading))*SEGMENTATION_INPUT_SIZE[0]/SCREEN_SIZE["width"],
+             (cx*distance+cx*self.follow_height*math.sin(pitch))*SEGMENTATION_INPUT_SIZE[0]/SCREEN_SIZE["width"]],
+
+            [(f*math.sin(pitch)*math.cos(heading)-cy*math.cos(pitch)*math.cos(heading))*SEGMENTATION_INPUT_SIZE[1]/SCREEN_SIZE["height"],
+             (f*math.sin(pitch)*math.sin(heading)-cy*math.cos(pitch)*math.sin(heading))*SEGMENTATION_INPUT_SIZE[1]/SCREEN_SIZE["height"],
+             (f*self.follow_height*math.cos(pitch)+cy*distance+cy*self.follow_height*math.sin(pitch))*SEGMENTATION_INPUT_SIZE[1]/SCREEN_SIZE["height"]],
+
+            [-math.cos(pitch)*math.cos(heading),
+             -math.cos(pitch)*math.sin(heading),
+             distance+self.follow_height*math.sin(pitch)],
+        ])
+
+        matrix = np.linalg.inv(matrix)
+        # 4 image corners
+        c1 = np.array([[0, 0, 1]]).T
+        c2 = np.array([[SEGMENTATION_INPUT_SIZE[0], 0, 1]]).T
+        c3 = np.array([[SEGMENTATION_INPUT_SIZE[0], SEGMENTATION_INPUT_SIZE[1], 1]]).T
+        c4 = np.array([[0, SEGMENTATION_INPUT_SIZE[1], 1]]).T
+        # converted corners
+        r1 = np.matmul(matrix, c1)
+        r2 = np.matmul(matrix, c2)
+        r3 = np.matmul(matrix, c3)
+        r4 = np.matmul(matrix, c4)
+        # finding x and y range
+        x_min = min(r1[0]/r1[2], r2[0]/r2[2], r3[0]/r3[2], r4[0]/r4[2])
+        y_min = min(r1[1]/r1[2], r2[1]/r2[2], r3[1]/r3[2], r4[1]/r4[2])
+        x_max = max(r1[0]/r1[2], r2[0]/r2[2], r3[0]/r3[2], r4[0]/r4[2])
+        y_max = max(r1[1]/r1[2], r2[1]/r2[2], r3[1]/r3[2], r4[1]/r4[2])
+        # this rescales the output because world coordinates would be like 50, but we need it to be like 500
+        matrix[0, :] = matrix[0, :]*(SEGMENTATION_INPUT_SIZE[0]/(x_max - x_min))
+        matrix[1, :] = matrix[1, :]*(SEGMENTATION_INPUT_SIZE[1]/(y_max - y_min))
+        # translating output to be on positive x and y
+        transl_mat = np.eye(3)
+        transl_mat[0, 2] = -x_min*(SEGMENTATION_INPUT_SIZE[0]/(x_max - x_min))
+        transl_mat[1, 2] = -y_min*(SEGMENTATION_INPUT_SIZE[1]/(y_max - y_min))
+        matrix = np.matmul(transl_mat, matrix)
+        self._ground_warp = (matrix, (x_min[0], x_max[0]), (y_min[0], y_max[0]))
+        return self._ground_warp
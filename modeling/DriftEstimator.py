@@ -0,0 +1,108 @@
+import numpy as np
+
+from modeling.constants import DRIFT_ESTIMATOR_CAPACITY, DRIFT_TRIM_FRACTION, DRIFT_SMOOTHING
+from utility.Point2d import Point2d
+
+
+class DriftEstimator:
+    def __init__(self, capacity : int = DRIFT_ESTIMATOR_CAPACITY, trim_fraction : float = DRIFT_TRIM_FRACTION,
+                 smoothing : float = DRIFT_SMOOTHING):
+        """Estimates the drift of the player position from the errors between where matched objects are observed and
+        where they are in the world model. Errors of the current cycle are kept in a fixed size ring with running sums,
+        so memory and cost per error don't grow over time. The estimate of each cycle is a trimmed mean of its errors,
+        smoothed over cycles with an exponential moving average
+
+        :param capacity: maximum number of errors kept in a cycle, older ones are replaced, defaults to DRIFT_ESTIMATOR_CAPACITY
+        :type capacity: int, optional
+        :param trim_fraction: fraction of the errors farthest from the cycle mean that is ignored, defaults to DRIFT_TRIM_FRACTION
+        :type trim_fraction: float, optional
+        :param smoothing: weight of the latest cycle on the estimate, defaults to DRIFT_SMOOTHING
+        :type smoothing: float, optional
+        """
+        self.capacity = capacity
+        self.trim_fraction = trim_fraction
+        self.smoothing = smoothing
+        self._errors = np.zeros((capacity, 2), dtype=np.float64)
+        # number of errors added this cycle (including replaced ones)
+        self._added = 0
+        self._sum_x1 = 0.
+        self._sum_x2 = 0.
+        self.cycle_mean : Point2d = Point2d(0, 0)
+        self.trimmed = 0
+        self.estimate : Point2d = None
+        self.cycles = 0
+
+    def start_cycle(self) -> None:
+        """Forget the errors of the previous cycle
+        """
+        self._added = 0
+        self._sum_x1 = 0.
+        self._sum_x2 = 0.
+
+    def add(self, err : Point2d) -> None:
+        """Add the error of one matched object
+
+        :param err: observed position minus world model position
+        :type err: Point2d
+        """
+        slot = self._added % self.capacity
+        if self._added >= self.capacity:
+            self._sum_x1 -= self._errors[slot, 0]
+            self._sum_x2 -= self._errors[slot, 1]
+        self._errors[slot] = (err.x1, err.x2)
+        self._sum_x1 += err.x1
+        self._sum_x2 += err.x2
+        self._added += 1
+
+    def __len__(self) -> int:
+        return min(self._added, self.capacity)
+
+    def errors(self) -> list[Point2d]:
+        """Get the errors kept this cycle
+
+        :return: errors
+        :rtype: list[Point2d]
+        """
+        return [Point2d(x1, x2) for x1, x2 in self._errors[:len(self)].tolist()]
+
+    def finish_cycle(self) -> Point2d:
+        """Update the estimate with the errors of this cycle, cycles without errors estimate no drift
+
+        :return: drift estimate
+        :rtype: Point2d
+        """
+        n = len(self)
+        self.trimmed = int(n*self.trim_fraction)
+        if n == 0:
+            self.cycle_mean = Point2d(0, 0)
+        elif self.trimmed == 0:
+            self.cycle_mean = Point2d(self._sum_x1/n, self._sum_x2/n)
+        else:
+            errors = self._errors[:n]
+            distances = np.hypot(errors[:, 0] - self._sum_x1/n, errors[:, 1] - self._sum_x2/n)
+            kept = errors[np.argsort(distances, kind="stable")[:n - self.trimmed]]
+            mean = kept.mean(axis=0)
+            self.cycle_mean = Point2d(float(mean[0]), float(mean[1]))
+        if self.estimate is None:
+            self.estimate = self.cycle_mean
+        else:
+            self.estimate = self.estimate*(1 - self.smoothing) + self.cycle_mean*self.smoothing
+        self.cycles += 1
+        return self.estimate
+
+    def stats(self) -> dict[str, float]:
+        """Get the estimator internals, for debugging
+
+        :return: dict with the number of errors kept, trimmed and replaced this cycle, the cycle mean and the estimate
+        :rtype: dict[str, float]
+        """
+        return {
+            "errors": len(self),
+            "trimmed": self.trimmed,
+            "replaced": max(self._added - self.capacity, 0),
+            "cycle_mean_x1": self.cycle_mean.x1,
+            "cycle_mean_x2": self.cycle_mean.x2,
+            "estimate_x1": self.estimate.x1 if self.estimate is not None else 0.,
+            "estimate_x2": self.estimate.x2 if self.estimate is not None else 0.,
+            "cycles": self.cycles,
+        }
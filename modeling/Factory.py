@@ -1,5 +1,5 @@
 from __future__ import annotations
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Callable
 
 from modeling.objects.TallbirdNest import TallbirdNest
 from modeling.objects.Grass import Grass
@@ -22,25 +22,120 @@ if TYPE_CHECKING:
 
 
 class Factory:
+    # image_id -> mob name, these don't always match the names in objects_info.csv
+    MOB_NAMES = {
+        1: "Treeguard",
+        2: "Bee",
+        3: "KillerBee",
+        4: "Frog",
+        5: "Hound",
+        6: "IceHound",
+        7: "FireHound",
+        8: "Spider",
+        9: "SpiderWarrior",
+        10: "Tallbird",
+        11: "Ghost",
+        12: "GuardianPig",
+        13: "Butterfly",
+        14: "Merm",
+        15: "BirdRed",
+        16: "BirdBlack",
+        17: "Rabbit",
+        47: "Tentacle",
+        48: "ClockRook",
+        49: "ClockKnight",
+        50: "ClockBishop",
+        51: "CrawlingHorror",
+        52: "Terrorbeak",
+        53: "Werepig",
+        54: "Mosquito",
+        55: "BirdBlue",
+        76: "Beefalo",
+        104: "Gobbler",
+    }
+
     def __init__(self):
         self.pickable_object_ids = [2, 6, [7,10], [15,19], 21, 22, [24,38], [40,42], 44, 46, [49,54], 57, 58, 60, [65,146]]
         self.structure_ids = [3, 20, 39, 43, 45, 47, 56, 59, [62,64]]
-        aux = []
+        aux = set()
         for elem in self.pickable_object_ids:
             if type(elem) == list:
                 for a in range(elem[0], elem[1]+1):
-                    aux.append(a)
+                    aux.add(a)
             else:
-                aux.append(elem)
+                aux.add(elem)
         self.pickable_object_ids = aux
-        aux = []
+        aux = set()
         for elem in self.structure_ids:
             if type(elem) == list:
                 for a in range(elem[0], elem[1]+1):
-                    aux.append(a)
+                    aux.add(a)
             else:
-                aux.append(elem)
+                aux.add(elem)
         self.structure_ids = aux
+        # image_id -> constructor with everything but the position (and scheduler) already bound
+        self._object_constructors : dict[int, Callable[[Point2d, Point2d, Scheduler], ObjectModel]] = {}
+        self._mob_constructors : dict[int, Callable[[Point2d, Point2d], MobModel]] = {}
+        for image_id in objects_info.all_image_ids():
+            object_type = objects_info.object_type_from_image_id(image_id)
+            if object_type == "OBJECT":
+                constructor = self._object_constructor(image_id)
+                if constructor is not None:
+                    self._object_constructors[image_id] = constructor
+            elif object_type == "MOB" and image_id in self.MOB_NAMES:
+                self._mob_constructors[image_id] = self._mob_constructor(image_id)
+        missing = self.uncovered_image_ids()
+        if len(missing) > 0:
+            raise ValueError(f"No constructor for image ids {missing}!")
+
+    def _object_constructor(self, image_id : int) -> Callable[[Point2d, Point2d, Scheduler], ObjectModel]:
+        obj_id = objects_info.obj_id_from_image_id(image_id)
+        name = objects_info.name_from_image_id(image_id)
+        if obj_id in self.pickable_object_ids:
+            return lambda pos, latest_screen_position, scheduler: PickableObjectModel(pos, latest_screen_position, obj_id, name)
+        if obj_id in self.structure_ids:
+            return lambda pos, latest_screen_position, scheduler: StructureModel(pos, latest_screen_position, obj_id, name)
+        if obj_id == 1:
+            return lambda pos, latest_screen_position, scheduler: TallbirdNest(pos, latest_screen_position)
+        if obj_id == 4:
+            return lambda pos, latest_screen_position, scheduler: Grass(pos, latest_screen_position, image_id, scheduler)
+        if obj_id == 5:
+            return lambda pos, latest_screen_position, scheduler: Sapling(pos, latest_screen_position, image_id, scheduler)
+        if obj_id == 11:
+            return lambda pos, latest_screen_position, scheduler: Ashes(pos, latest_screen_position, scheduler)
+        if obj_id == 12:
+            return lambda pos, latest_screen_position, scheduler: Evergreen(pos, latest_screen_position, image_id, scheduler, lumpy=False)
+        if obj_id == 13:
+            return lambda pos, latest_screen_position, scheduler: SpiderNest(pos, latest_screen_position, image_id, scheduler)
+        if obj_id == 14:
+            return lambda pos, latest_screen_position, scheduler: BerryBush(pos, latest_screen_position, image_id, scheduler)
+        if obj_id == 23:
+            return lambda pos, latest_screen_position, scheduler: Campfire(pos, latest_screen_position, image_id, scheduler)
+        if obj_id == 48:
+            return lambda pos, latest_screen_position, scheduler: Evergreen(pos, latest_screen_position, image_id, scheduler, lumpy=True)
+        if obj_id == 55:
+            return lambda pos, latest_screen_position, scheduler: MarshBush(pos, latest_screen_position, image_id, scheduler)
+        if obj_id == 61:
+            return lambda pos, latest_screen_position, scheduler: Reeds(pos, latest_screen_position, image_id, scheduler)
+        return None
+
+    def _mob_constructor(self, image_id : int) -> Callable[[Point2d, Point2d], MobModel]:
+        name = self.MOB_NAMES[image_id]
+        return lambda pos, latest_screen_position: MobModel(pos, image_id, name, latest_screen_position)
+
+    def uncovered_image_ids(self) -> list[int]:
+        """Get the image ids of objects and mobs in objects_info.csv that can't be created
+
+        :return: image ids without a constructor
+        :rtype: list[int]
+        """
+        missing = []
+        for image_id in objects_info.all_image_ids():
+            object_type = objects_info.object_type_from_image_id(image_id)
+            if ((object_type == "OBJECT" and image_id not in self._object_constructors) or
+                (object_type == "MOB" and image_id not in self._mob_constructors)):
+                missing.append(image_id)
+        return missing
 
     # receives image id and returns an object
     def create_object(self, image_id : int, pos : Point2d, latest_screen_position : Point2d, scheduler : Scheduler=None) -> ObjectModel:
@@ -54,105 +149,28 @@ class Factory:
         :type latest_screen_position: Point2d
         :param scheduler: update scheduler to pass to some objects, defaults to None
         :type scheduler: Scheduler
-        :return: requested object
+        :return: requested object, None if image_id isn't an object
         :rtype: ObjectModel
         """
-        obj_id = objects_info.get_item_info(info="obj_id", image_id=image_id)
-        name = objects_info.get_item_info(info="name", image_id=image_id)
-        if obj_id in self.pickable_object_ids:
-            return PickableObjectModel(pos, latest_screen_position, obj_id, name)
-        if obj_id in self.structure_ids:
-            return StructureModel(pos, latest_screen_position, obj_id, name)
-        if obj_id == 1:
-            return TallbirdNest(pos, latest_screen_position)
-        if obj_id == 4:
-            return Grass(pos, latest_screen_position, image_id, scheduler)
-        if obj_id == 5:
-            return Sapling(pos, latest_screen_position, image_id, scheduler)
-        if obj_id == 11:
-            return Ashes(pos, latest_screen_position, scheduler)
-        if obj_id == 12:
-            return Evergreen(pos, latest_screen_position, image_id, scheduler, lumpy=False)
-        if obj_id == 13:
-            return SpiderNest(pos, latest_screen_position, image_id, scheduler)
-        if obj_id == 14:
-            return BerryBush(pos, latest_screen_position, image_id, scheduler)
-        if obj_id == 23:
-            return Campfire(pos, latest_screen_position, image_id, scheduler)
-        if obj_id == 48:
-            return Evergreen(pos, latest_screen_position, image_id, scheduler, lumpy=True)
-        if obj_id == 55:
-            return MarshBush(pos, latest_screen_position, image_id, scheduler)
-        if obj_id == 61:
-            return Reeds(pos, latest_screen_position, image_id, scheduler)
+        constructor = self._object_constructors.get(image_id)
+        if constructor is None:
+            return None
+        return constructor(pos, latest_screen_position, scheduler)
 
-    @staticmethod
-    def create_mob(id_ : int, pos : Point2d, latest_screen_position : Point2d) -> MobModel:
+    def create_mob(self, id_ : int, pos : Point2d, latest_screen_position : Point2d) -> MobModel:
         """Create mob described by id_
 
         :param id_: image_id
         :type id_: int
         :param pos: position in the world
         :type pos: Point2d
-        :return: requested mob
+        :return: requested mob, None if id_ isn't a mob
         :rtype: MobModel
         """
-        if id_ == 1:
-            return MobModel(pos, id_, "Treeguard", latest_screen_position)
-        if id_ == 2:
-            return MobModel(pos, id_, "Bee", latest_screen_position)
-        if id_ == 3:
-            return MobModel(pos, id_, "KillerBee", latest_screen_position)
-        if id_ == 4:
-            return MobModel(pos, id_, "Frog", latest_screen_position)
-        if id_ == 5:
-            return MobModel(pos, id_, "Hound", latest_screen_position)
-        if id_ == 6:
-            return MobModel(pos, id_, "IceHound", latest_screen_position)
-        if id_ == 7:
-            return MobModel(pos, id_, "FireHound", latest_screen_position)
-        if id_ == 8:
-            return MobModel(pos, id_, "Spider", latest_screen_position)
-        if id_ == 9:
-            return MobModel(pos, id_, "SpiderWarrior", latest_screen_position)
-        if id_ == 10:
-            return MobModel(pos, id_, "Tallbird", latest_screen_position)
-        if id_ == 11:
-            return MobModel(pos, id_, "Ghost", latest_screen_position)
-        if id_ == 12:
-            return MobModel(pos, id_, "GuardianPig", latest_screen_position)
-        if id_ == 13:
-            return MobModel(pos, id_, "Butterfly", latest_screen_position)
-        if id_ == 14:
-            return MobModel(pos, id_, "Merm", latest_screen_position)
-        if id_ == 15:
-            return MobModel(pos, id_, "BirdRed", latest_screen_position)
-        if id_ == 16:
-            return MobModel(pos, id_, "BirdBlack", latest_screen_position)
-        if id_ == 17:
-            return MobModel(pos, id_, "Rabbit", latest_screen_position)
-        if id_ == 47:
-            return MobModel(pos, id_, "Tentacle", latest_screen_position)
-        if id_ == 48:
-            return MobModel(pos, id_, "ClockRook", latest_screen_position)
-        if id_ == 49:
-            return MobModel(pos, id_, "ClockKnight", latest_screen_position)
-        if id_ == 50:
-            return MobModel(pos, id_, "ClockBishop", latest_screen_position)
-        if id_ == 51:
-            return MobModel(pos, id_, "CrawlingHorror", latest_screen_position)
-        if id_ == 52:
-            return MobModel(pos, id_, "Terrorbeak", latest_screen_position)
-        if id_ == 53:
-            return MobModel(pos, id_, "Werepig", latest_screen_position)
-        if id_ == 54:
-            return MobModel(pos, id_, "Mosquito", latest_screen_position)
-        if id_ == 55:
-            return MobModel(pos, id_, "BirdBlue", latest_screen_position)
-        if id_ == 76:
-            return MobModel(pos, id_, "Beefalo", latest_screen_position)
-        if id_ == 104:
-            return MobModel(pos, id_, "Gobbler", latest_screen_position)
+        constructor = self._mob_constructors.get(id_)
+        if constructor is None:
+            return None
+        return constructor(pos, latest_screen_position)
 
 
 factory = Factory()
@@ -0,0 +1,133 @@
+from __future__ import annotations
+from typing import TYPE_CHECKING, Callable
+
+if TYPE_CHECKING:
+    from modeling.mobs.MobModel import MobModel
+    from modeling.objects.ObjectModel import ObjectModel
+
+
+def form_filter(method_name : str, expected : bool = True) -> Callable[[ObjectModel | MobModel], bool]:
+    """Create a filter that checks one of the object's form methods (is_harvested, is_small, etc), objects without the
+    method always pass it
+
+    :param method_name: name of the method
+    :type method_name: str
+    :param expected: method result for the object to pass, defaults to True
+    :type expected: bool, optional
+    :return: filter predicate
+    :rtype: Callable[[ObjectModel | MobModel], bool]
+    """
+    def predicate(obj : ObjectModel | MobModel) -> bool:
+        op = getattr(obj, method_name, None)
+        if callable(op):
+            return op() == expected
+        return True
+    return predicate
+
+
+# filters available to WorldModel.get_all_of
+DEFAULT_FILTERS : dict[str, Callable[[ObjectModel | MobModel], bool]] = {
+    "only_not_harvested": form_filter("is_harvested", expected=False),
+    "evergreen_small": form_filter("is_small"),
+    "evergreen_medium": form_filter("is_medium"),
+    "evergreen_big": form_filter("is_big"),
+    "evergreen_dead": form_filter("is_dead"),
+    "nest_small": form_filter("is_small"),
+    "nest_medium": form_filter("is_medium"),
+    "nest_big": form_filter("is_big"),
+}
+
+
+class FilterIndex:
+    def __init__(self, filters : dict[str, Callable[[ObjectModel | MobModel], bool]] = None):
+        """Objects that pass each filter, by object name. Membership is updated when objects are added, removed or change
+        form, so queries only cost the size of their result
+
+        :param filters: filter name -> predicate, defaults to None (DEFAULT_FILTERS)
+        :type filters: dict[str, Callable[[ObjectModel | MobModel], bool]], optional
+        """
+        self._filters : dict[str, Callable[[ObjectModel | MobModel], bool]] = {}
+        # filter name -> object name -> objects that pass it (a dict is used as an insertion ordered set)
+        self._members : dict[str, dict[str, dict[ObjectModel | MobModel, None]]] = {}
+        # object name -> (object list, its length) the memberships of that name were computed from
+        self._synced : dict[str, tuple[list[ObjectModel | MobModel], int]] = {}
+        for name, predicate in (DEFAULT_FILTERS if filters is None else filters).items():
+            self.register(name, predicate)
+
+    def register(self, filter_name : str, predicate : Callable[[ObjectModel | MobModel], bool]) -> None:
+        """Add a filter (or replace an existing one)
+
+        :param filter_name: filter name
+        :type filter_name: str
+        :param predicate: function that tells whether an object passes the filter
+        :type predicate: Callable[[ObjectModel | MobModel], bool]
+        """
+        self._filters[filter_name] = predicate
+        self._members[filter_name] = {}
+        # memberships of the new filter are computed on the next query of each object name
+        self._synced = {}
+
+    def add(self, obj : ObjectModel | MobModel) -> None:
+        """Add object, this should be called right after it's added to its object list
+
+        :param obj: object added
+        :type obj: ObjectModel | MobModel
+        """
+        name = obj.name_str()
+        if name in self._synced:
+            obj_list, length = self._synced[name]
+            self._synced[name] = (obj_list, length + 1)
+        for filter_name, predicate in self._filters.items():
+            if predicate(obj):
+                self._members[filter_name].setdefault(name, {})[obj] = None
+
+    def remove(self, obj : ObjectModel | MobModel) -> None:
+        """Remove object, this should be called right after it's removed from its object list
+
+        :param obj: object removed
+        :type obj: ObjectModel | MobModel
+        """
+        name = obj.name_str()
+        if name in self._synced:
+            obj_list, length = self._synced[name]
+            self._synced[name] = (obj_list, length - 1)
+        for members in self._members.values():
+            if name in members:
+                members[name].pop(obj, None)
+
+    def update(self, obj : ObjectModel | MobModel) -> None:
+        """Recheck the filters of an object after it changed form
+
+        :param obj: object that changed
+        :type obj: ObjectModel | MobModel
+        """
+        name = obj.name_str()
+        for filter_name, predicate in self._filters.items():
+            members = self._members[filter_name].setdefault(name, {})
+            if predicate(obj):
+                members[obj] = None
+            else:
+                members.pop(obj, None)
+
+    def query(self, filter_name : str, name : str, obj_list : list[ObjectModel | MobModel]) -> list[ObjectModel | MobModel]:
+        """Get the objects with the given name that pass the filter
+
+        :param filter_name: filter name
+        :type filter_name: str
+        :param name: object name
+        :type name: str
+        :param obj_list: current list of objects with that name, if it was replaced or changed without going through
+        this index, the memberships of this name are recomputed from it
+        :type obj_list: list[ObjectModel | MobModel]
+        :raises ValueError: if the filter doesn't exist
+        :return: objects that pass the filter
+        :rtype: list[ObjectModel | MobModel]
+        """
+        if filter_name not in self._filters:
+            raise ValueError("Filter not implemented")
+        synced = self._synced.get(name)
+        if synced is None or synced[0] is not obj_list or synced[1] != len(obj_list):
+            for f_name, predicate in self._filters.items():
+                self._members[f_name][name] = {obj: None for obj in obj_list if predicate(obj)}
+            self._synced[name] = (obj_list, len(obj_list))
+        return list(self._members[filter_name][name])
@@ -78,7 +78,7 @@ class Inventory:
         """
         for i in range(15):
             if (self.slots[i].object is not None and
-                    self.slots[i].object.id == objects_info.get_item_info(info="obj_id", name=item_name) and
+                    self.slots[i].object.id == objects_info.obj_id_from_name(item_name) and
                     not self.slots[i].is_full()):
                 return i
         return None
@@ -93,7 +93,7 @@ class Inventory:
         """
         for i in range(15):
             if (self.slots[i].object is not None and
-                    self.slots[i].object.id == objects_info.get_item_info(info="obj_id", name=name)):
+                    self.slots[i].object.id == objects_info.obj_id_from_name(name)):
                 return i
         return None
 
@@ -115,7 +115,7 @@ class Inventory:
         """
         for slot_name, item_info in slots_dict.items():
             item_name, count = item_info
-            obj_id = objects_info.get_item_info(info="obj_id", name=item_name)
+            obj_id = objects_info.obj_id_from_name(item_name)
             self.slots[slot_name].change_item(obj_id, count)
 
     def add_item(self, name : str, count : int) -> None:
@@ -132,15 +132,15 @@ class Inventory:
                 raise ValueError("Incorrect usage, equippable items can't be stacked")
             if equip_slot == "Head":
                 if self.slots["Head"].object is None:
-                    self.slots["Head"].add_item(objects_info.get_item_info(info="obj_id", name=name), count)
+                    self.slots["Head"].add_item(objects_info.obj_id_from_name(name), count)
                     return
             elif equip_slot == "Body":
                 if self.slots["Body"].object is None:
-                    self.slots["Body"].add_item(objects_info.get_item_info(info="obj_id", name=name), count)
+                    self.slots["Body"].add_item(objects_info.obj_id_from_name(name), count)
                     return
             else:
                 if self.slots["Hand"].object is None:
-                    self.slots["Hand"].add_item(objects_info.get_item_info(info="obj_id", name=name), count)
+                    self.slots["Hand"].add_item(objects_info.obj_id_from_name(name), count)
                     return
         # checking if there is a non full slot with this item
         first_non_full_slot = self._find_first_non_full_slot(name)
@@ -151,13 +151,13 @@ class Inventory:
                 raise Exception("Wrong usage! The inventory is full!")
             else:
                 self.slots[first_empty_slot].add_item(
-                    objects_info.get_item_info(info="obj_id", name=name), count)
+                    objects_info.obj_id_from_name(name), count)
                 return
         else:
             # add item to existing stack and possibly fill new slot
             extra_count = self.slots[first_non_full_slot].count + count - objects_info.get_item_info(info="stack_size", name=name)
             self.slots[first_non_full_slot].add_item(
-                objects_info.get_item_info(info="obj_id", name=name), count)
+                objects_info.obj_id_from_name(name), count)
             if extra_count <= 0:
                 return
             # add any items that didn't fit in the first stack to a new slot
@@ -166,7 +166,7 @@ class Inventory:
                 raise Exception("Wrong usage! The inventory is full!")
             else:
                 self.slots[first_empty_slot].add_item(
-                    objects_info.get_item_info(info="obj_id", name=name), extra_count)
+                    objects_info.obj_id_from_name(name), extra_count)
                 return
 
     def can_add_item(self, name : str, count : int) -> bool:
@@ -268,7 +268,7 @@ class Inventory:
         recipe = objects_info.get_item_info(info="crafting_recipe", name=name)
         for obj_id, count in recipe:
             if not self.simulate_consume_item(
-                    objects_info.get_item_info(info="name", obj_id=obj_id), count):
+                    objects_info.name_from_obj_id(obj_id), count):
                 self.revert_simulation()
                 raise Exception("Can't craft, not enough materials!")
         if self.can_add_item(name, 1):
@@ -291,7 +291,7 @@ class Inventory:
         recipe = objects_info.get_item_info(info="crafting_recipe", name=name)
         for obj_id, count in recipe:
             if not self.simulate_consume_item(
-                    objects_info.get_item_info(info="name", obj_id=obj_id), count):
+                    objects_info.name_from_obj_id(obj_id), count):
                 self.revert_simulation()
                 return False
         self.revert_simulation()
@@ -436,7 +436,7 @@ class Inventory:
                             # try to replace the item if it was consumed
                             if slot.object is None:
                                 first_slot = self.find_first_slot(
-                                    objects_info.get_item_info(info="name", obj_id=equip_id))
+                                    objects_info.name_from_obj_id(equip_id))
                                 if first_slot is not None:
                                     self.trade_slots(self.slots[first_slot], slot)
             else:
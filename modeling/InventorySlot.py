@@ -4,6 +4,8 @@ from utility.GameTime import GameTime
 
 
 class InventorySlot:
+    __slots__ = ("position", "object", "count")
+
     def __init__(self, position : int | str):
         # position is the inventory slot, so 0-14, "Head", "Body" or "Hand"
         self.position = position
@@ -1,10 +1,11 @@
 import copy
-from multiprocessing import Queue
 import time
 
 import numpy as np
 
-from perception.ImageObject import ImageObject
+from perception.ImageObject import ImageObject, detections_to_image_objects
+from perception.SharedDetections import SharedDetections
+from perception.SharedSegmentationMask import SharedSegmentationMask
 from modeling.WorldModel import WorldModel
 from modeling.PlayerModel import PlayerModel, PlayerModelRecorder
 from modeling.ObjectsInfo import objects_info
@@ -24,39 +25,50 @@ class Modeling:
         self.latest_segmentation_timestamp : float = None
         self.received_yolo_info : bool = False
         self.received_segmentation_info : bool = False
+        # ids of the latest results read from the shared transports
+        self.latest_yolo_id : int = -1
+        self.latest_segmentation_id : int = -1
         self.measure_time = measure_time
         if self.measure_time:
             self.time_records = []
-            self.split_names = ["handle_detected_objects_queue", "handle_segmentation_queue", "update_clock", 
+            self.split_names = ["handle_shared_detections", "handle_shared_segmentation_mask", "update_clock", 
                                 "update_world_model", "update_player_model", "use_received_yolo_info", "use_received_segmentation_info"]
 
-    def update_model(self, detected_objects_queue: Queue, segmentation_queue: Queue):
+    def update_model(self, shared_detections: SharedDetections, shared_segmentation_mask: SharedSegmentationMask):
         if self.measure_time:
             t1 = time.time_ns()
 
-        if detected_objects_queue.empty():
+        # results are read-only views into the shared buffers, they're copied and only used if their slot wasn't
+        # overwritten by the producer while being copied
+        detections, detections_id, timestamp = shared_detections.read_newer_than(self.latest_yolo_id)
+        if detections is not None:
+            obj_list = detections_to_image_objects(detections)
+            if not shared_detections.is_valid(detections_id):
+                detections = None
+        if detections is None:
             obj_list : list[ImageObject] = self.latest_detected_objects
             self.received_yolo_info = False
         else:
-            # it's very unlikely that Perception puts more than one detection in the queue before this finishes a cycle, but this is just in case
-            while not detected_objects_queue.empty():
-                obj_list, timestamp = detected_objects_queue.get()
-                self.latest_yolo_timestamp = timestamp
+            self.latest_yolo_id = detections_id
+            self.latest_yolo_timestamp = timestamp
             self.received_yolo_info = True
             self.latest_detected_objects = obj_list
 
         if self.measure_time:
             t2 = time.time_ns()
 
-        
-        if segmentation_queue.empty():
-            segmentation_info : list[ImageObject] = self.latest_segmentation_info
+        mask, mask_id, timestamp = shared_segmentation_mask.read_newer_than(self.latest_segmentation_id)
+        if mask is not None:
+            mask = mask.copy()
+            if not shared_segmentation_mask.is_valid(mask_id):
+                mask = None
+        if mask is None:
+            segmentation_info : np.array = self.latest_segmentation_info
             self.received_segmentation_info = False
         else:
-            # it's very unlikely that SegmentationModel puts more than one detection in the queue before this finishes a cycle, but this is just in case
-            while not segmentation_queue.empty():
-                segmentation_info, timestamp = segmentation_queue.get()
-                self.latest_segmentation_timestamp = timestamp
+            segmentation_info = mask
+            self.latest_segmentation_id = mask_id
+            self.latest_segmentation_timestamp = timestamp
             self.received_segmentation_info = True
             self.latest_segmentation_info = segmentation_info
 
@@ -88,15 +100,18 @@ class Modeling:
 
         if self.received_yolo_info:
             self.world_model.yolo_timestamp = self.latest_yolo_timestamp
-            player_positions = [Point2d.bottom_from_box(obj.box) for obj in obj_list if objects_info.get_item_info(image_id=obj.id, info="object_type") == "PLAYER"]
+            player_positions = [Point2d.bottom_from_box(obj.box) for obj in obj_list if objects_info.object_type_from_image_id(obj.id) == "PLAYER"]
             # decide which of the detected player positions is the real one
             self.world_model.decide_player_position(player_positions)
             self.world_model.start_cycle()
+            detected_objects = []
             for obj in obj_list:
-                if objects_info.get_item_info(image_id=obj.id, info="object_type") == "OBJECT":
-                    self.world_model.object_detected(obj)
-                elif objects_info.get_item_info(image_id=obj.id, info="object_type") == "MOB":
+                object_type = objects_info.object_type_from_image_id(obj.id)
+                if object_type == "OBJECT":
+                    detected_objects.append(obj)
+                elif object_type == "MOB":
                     self.world_model.mob_detected(obj)
+            self.world_model.objects_detected(detected_objects)
             self.world_model.finish_cycle()
             self.player_model.correct_error(self.world_model.avg_observed_error)
 
@@ -118,7 +133,8 @@ class Modeling:
             return ([(class_name, [obj.position for obj in obj_list]) for class_name, obj_list in self.world_model.object_lists.items()], 
                     [self.world_model.c1, self.world_model.c2, self.world_model.c3, self.world_model.c4], 
                     self.world_model.player.position, 
-                    self.world_model.tiles)
+                    self.world_model.terrain_map,
+                    self.world_model.drift_estimator.stats())
 
 class ModelingRecorder(Modeling):
     def __init__(self, debug=False, clock=Clock()):
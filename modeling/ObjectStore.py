@@ -0,0 +1,190 @@
+from __future__ import annotations
+from typing import TYPE_CHECKING, Callable
+
+import numpy as np
+
+from modeling.constants import OBJECT_STORE_INITIAL_CAPACITY
+if TYPE_CHECKING:
+    from modeling.mobs.MobModel import MobModel
+    from modeling.objects.ObjectModel import ObjectModel
+    from utility.Point2d import Point2d
+
+# state of objects that only have one form
+NO_STATE = -1
+# type id of free rows
+FREE = -1
+
+
+class ObjectStore:
+    def __init__(self, capacity : int = OBJECT_STORE_INITIAL_CAPACITY):
+        """Columnar copy of the world model objects (position, type, state and cycles to be deleted), so queries over
+        all of them can be done with array operations. Each object gets a row (its handle) when it's added, rows of
+        removed objects are reused. Objects keep their columns up to date themselves when they change
+
+        :param capacity: initial number of rows, it grows as needed, defaults to OBJECT_STORE_INITIAL_CAPACITY
+        :type capacity: int, optional
+        """
+        self.positions = np.zeros((capacity, 2), dtype=np.float64)
+        self.type_ids = np.full(capacity, FREE, dtype=np.int32)
+        self.states = np.full(capacity, NO_STATE, dtype=np.int32)
+        self.cycles_to_be_deleted = np.zeros(capacity, dtype=np.int32)
+        self.objects : list[ObjectModel | MobModel] = [None]*capacity
+        # names by type id and the other way around
+        self.type_names : list[str] = []
+        self._name_to_type_id : dict[str, int] = {}
+        # free rows, the last one is used first
+        self._free : list[int] = list(range(capacity - 1, -1, -1))
+        # rows after this one were never used
+        self._end = 0
+        self._count = 0
+        # functions called with an object whenever its state changes
+        self.state_listeners : list[Callable[[ObjectModel | MobModel], None]] = []
+
+    def type_id(self, name : str) -> int:
+        """Get the type id of an object name, a new one is created if needed
+
+        :param name: object name
+        :type name: str
+        :return: type id
+        :rtype: int
+        """
+        if name not in self._name_to_type_id:
+            self._name_to_type_id[name] = len(self.type_names)
+            self.type_names.append(name)
+        return self._name_to_type_id[name]
+
+    def _grow(self) -> None:
+        capacity = len(self.objects)
+        self.positions = np.concatenate([self.positions, np.zeros((capacity, 2), dtype=np.float64)])
+        self.type_ids = np.concatenate([self.type_ids, np.full(capacity, FREE, dtype=np.int32)])
+        self.states = np.concatenate([self.states, np.full(capacity, NO_STATE, dtype=np.int32)])
+        self.cycles_to_be_deleted = np.concatenate([self.cycles_to_be_deleted, np.zeros(capacity, dtype=np.int32)])
+        self.objects.extend([None]*capacity)
+        self._free = list(range(2*capacity - 1, capacity - 1, -1))
+
+    def add(self, obj : ObjectModel | MobModel) -> int:
+        """Add object to the store, from now on it writes its changes to its row
+
+        :param obj: object to be added
+        :type obj: ObjectModel | MobModel
+        :return: object handle
+        :rtype: int
+        """
+        if len(self._free) == 0:
+            self._grow()
+        handle = self._free.pop()
+        self._end = max(self._end, handle + 1)
+        self._count += 1
+        self.objects[handle] = obj
+        self.positions[handle] = (obj.position.x1, obj.position.x2)
+        self.type_ids[handle] = self.type_id(obj.name_str())
+        self.states[handle] = getattr(obj, "_state", NO_STATE)
+        self.cycles_to_be_deleted[handle] = obj.get_cycles_to_be_deleted()
+        obj._store = self
+        obj._handle = handle
+        return handle
+
+    def remove(self, obj : ObjectModel | MobModel) -> None:
+        """Remove object from the store, its row will be reused
+
+        :param obj: object to be removed
+        :type obj: ObjectModel | MobModel
+        """
+        handle = obj._handle
+        self.objects[handle] = None
+        self.type_ids[handle] = FREE
+        self.states[handle] = NO_STATE
+        self._free.append(handle)
+        self._count -= 1
+        obj._store = None
+        obj._handle = None
+
+    def set_state(self, handle : int, state : int) -> None:
+        """Update the state of an object and notify the state listeners
+
+        :param handle: object handle
+        :type handle: int
+        :param state: new state
+        :type state: int
+        """
+        self.states[handle] = state
+        for listener in self.state_listeners:
+            listener(self.objects[handle])
+
+    def _rows(self, names : list[str] = None, states : list[int] = None) -> np.array:
+        """Get the handles of the objects with one of the given names and states
+
+        :param names: object names, defaults to None (all of them)
+        :type names: list[str], optional
+        :param states: object states, defaults to None (all of them)
+        :type states: list[int], optional
+        :return: handles
+        :rtype: np.array
+        """
+        type_ids = self.type_ids[:self._end]
+        if names is None:
+            mask = type_ids != FREE
+        else:
+            wanted = [self._name_to_type_id[name] for name in names if name in self._name_to_type_id]
+            mask = np.isin(type_ids, wanted)
+        if states is not None:
+            mask &= np.isin(self.states[:self._end], states)
+        return np.flatnonzero(mask)
+
+    def nearest(self, pos : Point2d, names : list[str] = None, radius : float = None,
+                states : list[int] = None) -> tuple[ObjectModel | MobModel, float]:
+        """Get the closest object to pos with one of the given names and states
+
+        :param pos: query position
+        :type pos: Point2d
+        :param names: object names, defaults to None (all of them)
+        :type names: list[str], optional
+        :param radius: maximum distance, defaults to None (no limit)
+        :type radius: float, optional
+        :param states: object states, defaults to None (all of them)
+        :type states: list[int], optional
+        :return: closest object and its distance, or (None, None) if there's none
+        :rtype: tuple[ObjectModel | MobModel, float]
+        """
+        rows = self._rows(names, states)
+        if len(rows) == 0:
+            return None, None
+        distances = np.hypot(self.positions[rows, 0] - pos.x1, self.positions[rows, 1] - pos.x2)
+        best = int(np.argmin(distances))
+        if radius is not None and distances[best] > radius:
+            return None, None
+        return self.objects[rows[best]], float(distances[best])
+
+    def within_radius(self, pos : Point2d, radius : float, names : list[str] = None,
+                      states : list[int] = None) -> list[ObjectModel | MobModel]:
+        """Get all objects within radius of pos with one of the given names and states
+
+        :param pos: query position
+        :type pos: Point2d
+        :param radius: maximum distance
+        :type radius: float
+        :param names: object names, defaults to None (all of them)
+        :type names: list[str], optional
+        :param states: object states, defaults to None (all of them)
+        :type states: list[int], optional
+        :return: objects within radius, in handle order
+        :rtype: list[ObjectModel | MobModel]
+        """
+        rows = self._rows(names, states)
+        distances = np.hypot(self.positions[rows, 0] - pos.x1, self.positions[rows, 1] - pos.x2)
+        return [self.objects[row] for row in rows[distances <= radius].tolist()]
+
+    def with_states(self, names : list[str], states : list[int]) -> list[ObjectModel | MobModel]:
+        """Get all objects with one of the given names and states
+
+        :param names: object names
+        :type names: list[str]
+        :param states: object states
+        :type states: list[int]
+        :return: objects, in handle order
+        :rtype: list[ObjectModel | MobModel]
+        """
+        return [self.objects[row] for row in self._rows(names, states).tolist()]
+
+    def __len__(self) -> int:
+        return self._count
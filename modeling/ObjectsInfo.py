@@ -1,13 +1,26 @@
-import pandas as pd
+import os
+import pickle
+import tempfile
 
 from utility.GameTime import GameTime
 
+ITEM_TABLE_PATH = 'utility/objects_info.csv'
+# the lookups compiled from the item table are cached here, they're rebuilt whenever the csv changes
+ITEM_TABLE_CACHE_PATH = 'utility/objects_info.cache.pickle'
+# this should be increased whenever the format of the cached lookups changes
+ITEM_TABLE_CACHE_VERSION = 1
+
 
 class ObjectsInfo:
-    def __init__(self):
+    def __init__(self, use_cache : bool = True):
         # name refers to the object name, not the image name
         # for example: both harvested and not harvested grass are "Grass"
-        self._item_table = pd.read_csv('utility/objects_info.csv')
+        # the table is only read once, every lookup uses these dicts, (key column, attribute) -> {key: value}
+        # names and obj_ids can have several rows, in which case the first one is used
+        self._lookup : dict[tuple[str, str], dict] = None
+        # name -> image_ids of all of its rows
+        self._name_to_image_ids : dict[str, list[int]] = None
+        self._load_item_table(use_cache)
         self._food_values = {
             "BaconAndEggs": [20, 75, 5, 15],
             "BatiliskWing": [3, 12.5, -10, 6],
@@ -249,27 +262,81 @@ class ObjectsInfo:
             31: [(32, 2), (33, 2)],
         }
 
-    # get one of the attributes to image_id, name or obj_id, passing the current values (two of them are None)
+    def _load_item_table(self, use_cache : bool) -> None:
+        """Load the lookups from the cache if it's up to date, otherwise compile them from the csv (and update the cache)
+
+        :param use_cache: whether the cache should be used
+        :type use_cache: bool
+        """
+        csv_mtime = os.path.getmtime(ITEM_TABLE_PATH)
+        if use_cache and os.path.exists(ITEM_TABLE_CACHE_PATH):
+            try:
+                with open(ITEM_TABLE_CACHE_PATH, "rb") as f:
+                    cache = pickle.load(f)
+                if cache["version"] == ITEM_TABLE_CACHE_VERSION and cache["csv_mtime"] == csv_mtime:
+                    self._lookup = cache["lookup"]
+                    self._name_to_image_ids = cache["name_to_image_ids"]
+                    return
+            except (OSError, EOFError, pickle.UnpicklingError, KeyError, TypeError):
+                pass
+
+        # pandas is only needed (and imported) when the cache is missing or outdated
+        import pandas as pd
+        item_table = pd.read_csv(ITEM_TABLE_PATH)
+        self._lookup = {}
+        for key in ["image_id", "name", "obj_id"]:
+            for attr in ["image_id", "name", "obj_id", "object_type"]:
+                if key != attr:
+                    table = item_table.drop_duplicates(subset=key)
+                    self._lookup[(key, attr)] = dict(zip(table[key].tolist(), table[attr].tolist()))
+        self._name_to_image_ids = {name: group.tolist() for name, group in item_table.groupby("name", sort=False)["image_id"]}
+        if use_cache:
+            # every process loads this table, so the cache is written to a temporary file and then moved into place,
+            # otherwise another process could read it half written
+            tmp_path = None
+            try:
+                fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(ITEM_TABLE_CACHE_PATH), suffix=".tmp")
+                with os.fdopen(fd, "wb") as f:
+                    pickle.dump({"version": ITEM_TABLE_CACHE_VERSION, "csv_mtime": csv_mtime, "lookup": self._lookup,
+                                 "name_to_image_ids": self._name_to_image_ids}, f)
+                os.replace(tmp_path, ITEM_TABLE_CACHE_PATH)
+            except OSError:
+                if tmp_path is not None and os.path.exists(tmp_path):
+                    os.remove(tmp_path)
+
+    def all_image_ids(self) -> list[int]:
+        return list(self._lookup[("image_id", "name")])
+
+    def name_from_image_id(self, image_id : int) -> str:
+        return self._lookup[("image_id", "name")][image_id]
+
+    def obj_id_from_image_id(self, image_id : int) -> int:
+        return self._lookup[("image_id", "obj_id")][image_id]
+
+    def object_type_from_image_id(self, image_id : int) -> str:
+        return self._lookup[("image_id", "object_type")][image_id]
+
+    def image_ids_from_name(self, name : str) -> list[int]:
+        return self._name_to_image_ids[name]
+
+    def obj_id_from_name(self, name : str) -> int:
+        return self._lookup[("name", "obj_id")][name]
+
+    def name_from_obj_id(self, obj_id : int) -> str:
+        return self._lookup[("obj_id", "name")][obj_id]
+
+    # get one of the attributes to image_id, name, obj_id or object_type, passing the current values (two of them are None)
     # example: _get_attr("image_id", None, "Rocks", None) gets the image_id of the object with name "Rocks"
     def _get_attr(self, attr_to, image_id, name, obj_id):
-        if attr_to == "image_id":
-            if name is not None:
-                return self._item_table[self._item_table["name"] == name][attr_to].iloc[0]
-            if obj_id is not None:
-                return self._item_table[self._item_table["obj_id"] == obj_id][attr_to].iloc[0]
-            return image_id
-        if attr_to == "name":
-            if image_id is not None:
-                return self._item_table[self._item_table["image_id"] == image_id][attr_to].iloc[0]
-            if obj_id is not None:
-                return self._item_table[self._item_table["obj_id"] == obj_id][attr_to].iloc[0]
-            return name
-        if attr_to == "obj_id":
-            if image_id is not None:
-                return self._item_table[self._item_table["image_id"] == image_id][attr_to].iloc[0]
-            if name is not None:
-                return self._item_table[self._item_table["name"] == name][attr_to].iloc[0]
-            return obj_id
+        if image_id is not None:
+            key, value = "image_id", image_id
+        elif name is not None:
+            key, value = "name", name
+        else:
+            key, value = "obj_id", obj_id
+        if key == attr_to:
+            return value
+        return self._lookup[(key, attr_to)][value]
 
     # valid values for params:
     # info: equip_slot, max_uses, use_time, stack_size, spoil_time, crafting_recipe, food_stats,
@@ -340,12 +407,7 @@ class ObjectsInfo:
         if info == "obj_id":
             return self._get_attr("obj_id", image_id, name, obj_id)
         if info == "object_type":
-            if image_id is not None:
-                return self._item_table[self._item_table["image_id"] == image_id].object_type.iloc[0]
-            if name is not None:
-                return self._item_table[self._item_table["name"] == name].object_type.iloc[0]
-            if obj_id is not None:
-                return self._item_table[self._item_table["obj_id"] == obj_id].object_type.iloc[0]
+            return self._get_attr("object_type", image_id, name, obj_id)
 
         raise NotImplementedError("Not implemented!")
 
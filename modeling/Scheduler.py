@@ -1,8 +1,9 @@
 from __future__ import annotations
-import time
 import heapq
+import itertools
 from typing import TYPE_CHECKING
 
+from modeling.constants import SCHEDULER_SLOT_SECONDS
 if TYPE_CHECKING:
     from modeling.WorldModel import WorldModel
     from modeling.objects.ObjectModel import ObjectModel
@@ -11,26 +12,141 @@ if TYPE_CHECKING:
     from utility.Point2d import Point2d
 
 class Scheduler:
-    def __init__(self, clock : Clock, world_model : WorldModel):
-        # update_queue has (time, object_id, index, change, instance)
-        self.update_queue = []
+    def __init__(self, clock : Clock, world_model : WorldModel, slot_seconds : float = SCHEDULER_SLOT_SECONDS):
+        """Applies scheduled changes (growth, disappearing) to world model objects when their time comes. Changes due in
+        the current time slot are kept in a heap, later ones are kept unsorted in their slot and only go to the heap when
+        the slot starts, so scheduling and updating don't get slower with the number of far away changes (regrowth is
+        usually days away). Cancelled changes are only dropped when they're reached
+
+        :param clock: game clock
+        :type clock: Clock
+        :param world_model: world model
+        :type world_model: WorldModel
+        :param slot_seconds: length of each time slot in seconds, defaults to SCHEDULER_SLOT_SECONDS
+        :type slot_seconds: float, optional
+        """
         self.clock = clock
         self.world_model = world_model
-    
+        self.slot_seconds = slot_seconds
+        # pending changes, handle -> (time, position, change, instance)
+        self._events : dict[int, tuple[float, Point2d, str, ObjectModel]] = {}
+        # handles of the pending changes of each object
+        self._instance_events : dict[ObjectModel, set[int]] = {}
+        # update_queue has (time, handle) for changes in slots that already started, handles break ties in
+        # scheduling order
+        self.update_queue : list[tuple[float, int]] = []
+        # slot index -> (time, handle) for changes in slots that haven't started, and a heap with those slot indices
+        self._slots : dict[int, list[tuple[float, int]]] = {}
+        self._slot_queue : list[int] = []
+        # slots up to this one already started
+        self._current_slot = int(self.clock.time() // self.slot_seconds)
+        self._handles = itertools.count()
+
     def update(self) -> None:
+        now = self.clock.time()
+        self._current_slot = max(self._current_slot, int(now // self.slot_seconds))
+        while len(self._slot_queue) > 0 and self._slot_queue[0] <= self._current_slot:
+            for entry in self._slots.pop(heapq.heappop(self._slot_queue)):
+                # cancelled changes are dropped here instead of going to the heap
+                if entry[1] in self._events:
+                    heapq.heappush(self.update_queue, entry)
         # the [0] gets the 'timestamp' in which the change should happen
-        while len(self.update_queue) > 0 and self.update_queue[0][0] <= self.clock.time():
-            tup = heapq.heappop(self.update_queue)
-            pos = tup[2]
-            change = tup[3]
-            instance = tup[4]
+        while len(self.update_queue) > 0 and self.update_queue[0][0] <= now:
+            _, handle = heapq.heappop(self.update_queue)
+            if handle not in self._events:
+                continue
+            _, pos, change, instance = self._pop_event(handle)
             if change == "disappear":
-                self.world_model.remove_object(instance, pos)
+                # objects that aren't in the world model (anymore) have nothing to be removed from
+                if instance._store is not None:
+                    self.world_model.remove_object(instance, pos)
             else:
                 instance.update(change)
-    
-    def schedule_change(self, time_from_now : GameTime, position : Point2d, change : str, instance : ObjectModel):
-        heapq.heappush(self.update_queue, (self.clock.time_from_now(time_from_now), time.time(), position, change, instance))
+
+    def _pop_event(self, handle : int) -> tuple[float, Point2d, str, ObjectModel]:
+        event = self._events.pop(handle)
+        instance_events = self._instance_events[event[3]]
+        instance_events.discard(handle)
+        if len(instance_events) == 0:
+            del self._instance_events[event[3]]
+        return event
+
+    def schedule_change(self, time_from_now : GameTime, position : Point2d, change : str, instance : ObjectModel,
+                        replace : bool = False) -> int:
+        """Schedule a change to an object
+
+        :param time_from_now: time until the change
+        :type time_from_now: GameTime
+        :param position: object position
+        :type position: Point2d
+        :param change: change name, "disappear" removes the object and anything else is passed to instance.update()
+        :type change: str
+        :param instance: object
+        :type instance: ObjectModel
+        :param replace: whether pending changes of the object should be cancelled, defaults to False
+        :type replace: bool, optional
+        :return: handle that can be used to cancel the change
+        :rtype: int
+        """
+        if replace:
+            self.cancel_all(instance)
+        t = self.clock.time_from_now(time_from_now)
+        handle = next(self._handles)
+        self._events[handle] = (t, position, change, instance)
+        self._instance_events.setdefault(instance, set()).add(handle)
+        slot = int(t // self.slot_seconds)
+        if slot <= self._current_slot:
+            heapq.heappush(self.update_queue, (t, handle))
+        else:
+            if slot not in self._slots:
+                self._slots[slot] = []
+                heapq.heappush(self._slot_queue, slot)
+            self._slots[slot].append((t, handle))
+        return handle
+
+    def schedule_changes(self, changes : list[tuple[GameTime, Point2d, str, ObjectModel]]) -> list[int]:
+        """Schedule many changes at once
+
+        :param changes: (time from now, position, change, instance) for each change, see schedule_change
+        :type changes: list[tuple[GameTime, Point2d, str, ObjectModel]]
+        :return: handles of the changes
+        :rtype: list[int]
+        """
+        return [self.schedule_change(*change) for change in changes]
+
+    def cancel(self, handle : int) -> bool:
+        """Cancel a scheduled change
+
+        :param handle: handle given by schedule_change
+        :type handle: int
+        :return: whether the change was still pending
+        :rtype: bool
+        """
+        if handle not in self._events:
+            return False
+        self._pop_event(handle)
+        return True
+
+    def cancel_all(self, instance : ObjectModel) -> int:
+        """Cancel all scheduled changes to an object, for example because it was removed from the world model
+
+        :param instance: object
+        :type instance: ObjectModel
+        :return: number of changes cancelled
+        :rtype: int
+        """
+        handles = self._instance_events.pop(instance, ())
+        for handle in handles:
+            del self._events[handle]
+        return len(handles)
+
+    def queue_depth(self) -> int:
+        """Get the number of pending changes
+
+        :return: number of pending changes
+        :rtype: int
+        """
+        return len(self._events)
 
 class SchedulerMock(Scheduler):
     def __init__(self, clock : Clock, world_model : WorldModel):
@@ -39,5 +155,6 @@ class SchedulerMock(Scheduler):
     def update(self) -> None:
         pass
     
-    def schedule_change(self, time_from_now : GameTime, position : Point2d, change : str, instance : ObjectModel):
+    def schedule_change(self, time_from_now : GameTime, position : Point2d, change : str, instance : ObjectModel,
+                        replace : bool = False) -> int:
         pass
@@ -0,0 +1,119 @@
+import math
+
+from modeling.constants import DISTANCE_FOR_SAME_OBJECT
+from modeling.objects.ObjectModel import ObjectModel
+from utility.Point2d import Point2d
+
+
+class SpatialHash:
+    def __init__(self, cell_size : float = DISTANCE_FOR_SAME_OBJECT):
+        """Uniform grid index of objects keyed by cell and object name. With the cell size equal to the search radius,
+        every object within the radius of a point is in the 3x3 block of cells around it
+
+        :param cell_size: cell size, defaults to DISTANCE_FOR_SAME_OBJECT
+        :type cell_size: float, optional
+        """
+        self.cell_size = cell_size
+        # (i, j, name) -> objects in that cell (a dict is used as an insertion ordered set)
+        self._cells : dict[tuple[int, int, str], dict[ObjectModel, None]] = {}
+
+    def point_to_cell(self, p : Point2d) -> tuple[int, int]:
+        return (math.floor(p.x1/self.cell_size), math.floor(p.x2/self.cell_size))
+
+    def insert(self, obj : ObjectModel, pos : Point2d = None) -> None:
+        """Add object to the index
+
+        :param obj: object to be added
+        :type obj: ObjectModel
+        :param pos: object position, defaults to None (obj.position)
+        :type pos: Point2d, optional
+        """
+        if pos is None:
+            pos = obj.position
+        cell = self.point_to_cell(pos)
+        key = (cell[0], cell[1], obj.name_str())
+        if key in self._cells:
+            self._cells[key][obj] = None
+        else:
+            self._cells[key] = {obj: None}
+
+    def remove(self, obj : ObjectModel, pos : Point2d = None) -> None:
+        """Remove object from the index
+
+        :param obj: object to be removed
+        :type obj: ObjectModel
+        :param pos: position the object was indexed with, defaults to None (obj.position)
+        :type pos: Point2d, optional
+        """
+        if pos is None:
+            pos = obj.position
+        cell = self.point_to_cell(pos)
+        key = (cell[0], cell[1], obj.name_str())
+        del self._cells[key][obj]
+        if len(self._cells[key]) == 0:
+            del self._cells[key]
+
+    def move(self, obj : ObjectModel, old_pos : Point2d, new_pos : Point2d) -> None:
+        """Update the index after an object moved, this should be called whenever an indexed object's position changes
+
+        :param obj: object that moved
+        :type obj: ObjectModel
+        :param old_pos: position the object was indexed with
+        :type old_pos: Point2d
+        :param new_pos: new position
+        :type new_pos: Point2d
+        """
+        if self.point_to_cell(old_pos) != self.point_to_cell(new_pos):
+            self.remove(obj, old_pos)
+            self.insert(obj, new_pos)
+
+    def near(self, pos : Point2d, name : str, radius : float = None) -> list[ObjectModel]:
+        """Get the objects with the given name in the cells that could be within radius of pos, they still have to be
+        filtered by distance
+
+        :param pos: query position
+        :type pos: Point2d
+        :param name: object name
+        :type name: str
+        :param radius: search radius, defaults to None (the cell size)
+        :type radius: float, optional
+        :return: candidate objects
+        :rtype: list[ObjectModel]
+        """
+        if radius is None:
+            radius = self.cell_size
+        reach = math.ceil(radius/self.cell_size)
+        i, j = self.point_to_cell(pos)
+        candidates = []
+        for di in range(-reach, reach+1):
+            for dj in range(-reach, reach+1):
+                key = (i+di, j+dj, name)
+                if key in self._cells:
+                    candidates.extend(self._cells[key])
+        return candidates
+
+    def nearest(self, pos : Point2d, name : str, radius : float = None) -> tuple[ObjectModel, float]:
+        """Get the closest object with the given name within radius of pos
+
+        :param pos: query position
+        :type pos: Point2d
+        :param name: object name
+        :type name: str
+        :param radius: search radius, defaults to None (the cell size)
+        :type radius: float, optional
+        :return: closest object and its distance, or (None, None) if there's no object within radius
+        :rtype: tuple[ObjectModel, float]
+        """
+        if radius is None:
+            radius = self.cell_size
+        best_match : ObjectModel = None
+        lowest_distance : float = None
+        for obj in self.near(pos, name, radius):
+            distance = pos.distance(obj.position)
+            if distance <= radius and (best_match is None or distance < lowest_distance):
+                best_match = obj
+                lowest_distance = distance
+        return best_match, lowest_distance
+
+    def __len__(self) -> int:
+        return sum(len(objs) for objs in self._cells.values())
@@ -0,0 +1,126 @@
+import numpy as np
+
+from modeling.constants import TERRAIN_BLOCK_SIZE, TERRAIN_CLASSES, TERRAIN_VOTES
+
+
+class TerrainMap:
+    def __init__(self, block_size : int = TERRAIN_BLOCK_SIZE, votes : int = TERRAIN_VOTES, classes : int = TERRAIN_CLASSES):
+        """Terrain type of every tile seen so far. Each tile keeps its latest detections in a ring of votes and its type
+        is the most common one among them (ties go to the smallest type). Tiles are stored in square blocks of arrays
+        that are only allocated when a tile inside them is first detected. Type 0 means the tile is unknown
+
+        :param block_size: number of tiles in each side of a block, defaults to TERRAIN_BLOCK_SIZE
+        :type block_size: int, optional
+        :param votes: number of latest detections that decide the type of a tile, defaults to TERRAIN_VOTES
+        :type votes: int, optional
+        :param classes: number of terrain types, including 0 (unknown), defaults to TERRAIN_CLASSES
+        :type classes: int, optional
+        """
+        self.block_size = block_size
+        self.votes = votes
+        self.classes = classes
+        # all dicts are keyed by block index (tile index // block_size)
+        # latest detections of each tile, 0 for empty slots
+        self._votes : dict[tuple[int, int], np.array] = {}
+        # slot of the ring the next detection of each tile goes to
+        self._next_slot : dict[tuple[int, int], np.array] = {}
+        # number of votes for each type in each tile
+        self._counts : dict[tuple[int, int], np.array] = {}
+        self._types : dict[tuple[int, int], np.array] = {}
+
+    def _allocate_block(self, key : tuple[int, int]) -> None:
+        self._votes[key] = np.zeros((self.block_size, self.block_size, self.votes), dtype=np.uint8)
+        self._next_slot[key] = np.zeros((self.block_size, self.block_size), dtype=np.uint8)
+        self._counts[key] = np.zeros((self.block_size, self.block_size, self.classes), dtype=np.uint8)
+        self._types[key] = np.zeros((self.block_size, self.block_size), dtype=np.uint8)
+
+    def add_detections(self, x1 : np.array, x2 : np.array, types : np.array) -> None:
+        """Add one detection to each of the given tiles, each tile should appear at most once
+
+        :param x1: x1 tile indices
+        :type x1: np.array
+        :param x2: x2 tile indices
+        :type x2: np.array
+        :param types: detected terrain types, detections of type 0 are ignored
+        :type types: np.array
+        """
+        x1 = np.asarray(x1, dtype=np.int64)
+        x2 = np.asarray(x2, dtype=np.int64)
+        types = np.asarray(types, dtype=np.uint8)
+        detected = types != 0
+        x1, x2, types = x1[detected], x2[detected], types[detected]
+        if len(types) == 0:
+            return
+        blocks, block_of_tile = np.unique(np.stack([x1 // self.block_size, x2 // self.block_size], axis=1), axis=0, return_inverse=True)
+        block_of_tile = block_of_tile.reshape(-1)
+        for k, (b1, b2) in enumerate(blocks.tolist()):
+            in_block = block_of_tile == k
+            self._add_to_block((b1, b2), x1[in_block] - b1*self.block_size, x2[in_block] - b2*self.block_size, types[in_block])
+
+    def _add_to_block(self, key : tuple[int, int], i : np.array, j : np.array, types : np.array) -> None:
+        if key not in self._votes:
+            self._allocate_block(key)
+        votes = self._votes[key]
+        next_slot = self._next_slot[key]
+        counts = self._counts[key]
+        slots = next_slot[i, j]
+        # the oldest vote is replaced once the ring is full
+        old = votes[i, j, slots]
+        full = old != 0
+        counts[i[full], j[full], old[full]] -= 1
+        counts[i, j, types] += 1
+        votes[i, j, slots] = types
+        next_slot[i, j] = (slots + 1) % self.votes
+        # argmax returns the first maximum, so ties go to the smallest type
+        self._types[key][i, j] = np.argmax(counts[i, j], axis=1)
+
+    def type_at(self, x1 : int, x2 : int) -> int:
+        """Get the type of a tile
+
+        :param x1: x1 tile index
+        :type x1: int
+        :param x2: x2 tile index
+        :type x2: int
+        :return: tile type, 0 if it's unknown
+        :rtype: int
+        """
+        key = (x1 // self.block_size, x2 // self.block_size)
+        if key not in self._types:
+            return 0
+        return int(self._types[key][x1 - key[0]*self.block_size, x2 - key[1]*self.block_size])
+
+    def region(self, x1_min : int, x1_max : int, x2_min : int, x2_max : int) -> np.array:
+        """Get the types of all tiles in a rectangular region
+
+        :param x1_min: first x1 tile index
+        :type x1_min: int
+        :param x1_max: x1 tile index after the last one
+        :type x1_max: int
+        :param x2_min: first x2 tile index
+        :type x2_min: int
+        :param x2_max: x2 tile index after the last one
+        :type x2_max: int
+        :return: array with shape (x1_max - x1_min, x2_max - x2_min) with tile types, 0 for unknown tiles
+        :rtype: np.array
+        """
+        res = np.zeros((max(x1_max - x1_min, 0), max(x2_max - x2_min, 0)), dtype=np.uint8)
+        if res.size == 0:
+            return res
+        for b1 in range(x1_min // self.block_size, (x1_max - 1) // self.block_size + 1):
+            for b2 in range(x2_min // self.block_size, (x2_max - 1) // self.block_size + 1):
+                if (b1, b2) not in self._types:
+                    continue
+                # intersection between the region and the block, in tile indices
+                lo1 = max(x1_min, b1*self.block_size)
+                hi1 = min(x1_max, (b1 + 1)*self.block_size)
+                lo2 = max(x2_min, b2*self.block_size)
+                hi2 = min(x2_max, (b2 + 1)*self.block_size)
+                res[lo1 - x1_min:hi1 - x1_min, lo2 - x2_min:hi2 - x2_min] = self._types[(b1, b2)][
+                    lo1 - b1*self.block_size:hi1 - b1*self.block_size, lo2 - b2*self.block_size:hi2 - b2*self.block_size]
+        return res
+
+    def __contains__(self, tile : tuple[int, int]) -> bool:
+        return self.type_at(tile[0], tile[1]) != 0
+
+    def __len__(self) -> int:
+        return sum(int(np.count_nonzero(types)) for types in self._types.values())
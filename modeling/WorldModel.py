@@ -17,13 +17,18 @@ from modeling.objects.ObjectWithMultipleForms import ObjectWithMultipleForms
 from modeling.Factory import factory
 from modeling.constants import DISTANCE_FOR_SAME_OBJECT, DISTANCE_FOR_SAME_MOB, CYCLES_TO_ADMIT_OBJECT, CYCLES_FOR_MOB_REMOVAL
 from modeling.constants import FOV, CAMERA_DISTANCE, CAMERA_PITCH, CAMERA_HEADING, CHUNK_SIZE, DISTANCE_FOR_VALID_PLAYER_POSITION
-from modeling.constants import TILE_SIZE
+from modeling.constants import TILE_SIZE, CAMERA_FOLLOW_HEIGHT
+from modeling.CameraModel import CameraModel
+from modeling.DriftEstimator import DriftEstimator
+from modeling.FilterIndex import FilterIndex
+from modeling.ObjectStore import ObjectStore
 from modeling.ObjectsInfo import objects_info
-from modeling.TerrainTile import TerrainTile
+from modeling.TerrainMap import TerrainMap
 from modeling.Scheduler import Scheduler
+from modeling.SpatialHash import SpatialHash
 from utility.Clock import Clock
 from utility.Point2d import Point2d
-from utility.utility import is_inside_convex_polygon, get_color_representation_dict
+from utility.utility import points_inside_convex_polygon, get_color_representation_dict, block_modes
 
 
 class WorldModel:
@@ -31,7 +36,7 @@ class WorldModel:
         """Generates the world model. It should be noted that the full workflow for a cycle of updating is:
             - if player was detected (on perception), call player_detected()
             - call start_cycle()
-            - for each object detected, call object_detected()
+            - call objects_detected() with all the objects detected (or object_detected() for each one)
             - after all that, call finish_cycle()
 
         :param player: the player model
@@ -44,15 +49,24 @@ class WorldModel:
         # objects_by_chunks maps a chunk index to a list of objects in it
         # (x1, x2) -> list
         self.objects_by_chunks : dict[tuple[int, int], list[ObjectModel]] = {}
+        # spatial indices used to find matches for detected objects, one for world model objects and one for recent objects
+        self.object_index = SpatialHash(DISTANCE_FOR_SAME_OBJECT)
+        self.recent_object_index = SpatialHash(DISTANCE_FOR_SAME_OBJECT)
+        # columnar copy of everything in object_lists, for vectorized queries (nearest, within radius, by state)
+        self.object_store = ObjectStore()
+        # objects in object_lists that pass each get_all_of filter, updated when objects change form
+        self.filter_index = FilterIndex()
+        self.object_store.state_listeners.append(self.filter_index.update)
         self.mob_lists : dict[str, list[MobModel]] = {}
         self.explored_chunks = set()
-        self.objects_detected_this_cycle : list[list[ObjectModel, bool]] = {}
-        self.mobs_detected_this_cycle : list[list[MobModel, bool]] = {}
+        # objects (and mobs) that should be detected this cycle, mapped to whether they were detected
+        self.objects_detected_this_cycle : dict[ObjectModel, bool] = {}
+        self.mobs_detected_this_cycle : dict[MobModel, bool] = {}
         self.player : PlayerModel = player
         self.latest_detected_player_position : Point2d = None
         self.cycles_since_player_detected : int = 0
         self.origin_coordinates : Point2d = player.position
-        self.FOLLOW_HEIGHT = 1.5 # extracted from the game code
+        self.FOLLOW_HEIGHT = CAMERA_FOLLOW_HEIGHT
         self.clock : Clock = clock
         self.c1 : Point2d = None # for usual values, (2.202, -36.468)
         self.c2 : Point2d = None # for usual values, (16.263, -2.791)
@@ -67,16 +81,19 @@ class WorldModel:
         self.c2_deletion_border : Point2d = None
         self.c3_deletion_border : Point2d = None
         self.c4_deletion_border : Point2d = None
-        self.estimation_errors : list[Point2d] = []
+        # errors between observed and world model positions of matched objects, used to correct the player position
+        self.drift_estimator = DriftEstimator()
+        # only kept in debug mode
         self.estimation_pairs : list[tuple[str, Point2d, Point2d]] = []
         self.avg_observed_error : Point2d = None
-        self.recent_objects : list[list[ObjectModel, int]] = []
-        self.recent_mobs : list[list[MobModel, int]] = []
-        self.additions_to_recent_objects : list[list[ObjectModel, int]] = []
-        self.additions_to_recent_mobs : list[list[MobModel, int]] = []
+        # recent objects (and mobs) are mapped to how many cycles in a row they were detected
+        self.recent_objects : dict[ObjectModel, int] = {}
+        self.recent_mobs : dict[MobModel, int] = {}
+        self.additions_to_recent_objects : dict[ObjectModel, int] = {}
+        self.additions_to_recent_mobs : dict[MobModel, int] = {}
         self.hovering_object : ObjectModel = None
         # i, j index is leftuppermost corner (to get i, j for x, y, divide by TILE_SIZE and round down)
-        self.tiles : dict[tuple[int, int], TerrainTile] = {}
+        self.terrain_map = TerrainMap()
         self.scheduler = Scheduler(self.clock, self)
         self.yolo_timestamp : float = None
         self.segmentation_timestamp : float = None
@@ -104,14 +121,20 @@ class WorldModel:
 
         :param instance: object instance
         :type instance: ObjectModel
-        :param pos: position in the world
+        :param pos: position in the world when the removal was requested, the object is removed from where it's stored
+        (instance.position), since it may have moved while it was a recent object
         :type pos: Point2d
         """
         if self.measure_time:
             t1 = time.time_ns()
 
-        self.objects_by_chunks[self.point_to_chunk_index(pos)].remove(instance)
+        self.objects_by_chunks[self.point_to_chunk_index(instance.position)].remove(instance)
         self.object_lists[instance.name_str()].remove(instance)
+        self.object_index.remove(instance)
+        self.object_store.remove(instance)
+        self.filter_index.remove(instance)
+        # removed objects shouldn't grow or disappear later
+        self.scheduler.cancel_all(instance)
 
         if self.measure_time:
             t2 = time.time_ns()
@@ -138,61 +161,15 @@ class WorldModel:
         if self.measure_time:
             t1 = time.time_ns()
 
-        # f = H / (2*tan(AFOV/2)), f focal distance, H height, AFOV angular FOV
-        f = SCREEN_SIZE["height"]/(2*math.tan(fov/180*math.pi/2))
-        cx = SCREEN_SIZE["width"]/2
-        cy = SCREEN_SIZE["height"]/2
-        heading = heading*math.pi/180
-        pitch = pitch*math.pi/180
-        matrix = np.array([
-            [(-f*math.sin(heading)-cx*math.cos(pitch)*math.cos(heading))*SEGMENTATION_INPUT_SIZE[0]/SCREEN_SIZE["width"], 
-             (f*math.cos(heading)-cx*math.cos(pitch)*math.sin(heading))*SEGMENTATION_INPUT_SIZE[0]/SCREEN_SIZE["width"], 
-             (cx*distance+cx*self.FOLLOW_HEIGHT*math.sin(pitch))*SEGMENTATION_INPUT_SIZE[0]/SCREEN_SIZE["width"]],
-
-            [(f*math.sin(pitch)*math.cos(heading)-cy*math.cos(pitch)*math.cos(heading))*SEGMENTATION_INPUT_SIZE[1]/SCREEN_SIZE["height"],
-             (f*math.sin(pitch)*math.sin(heading)-cy*math.cos(pitch)*math.sin(heading))*SEGMENTATION_INPUT_SIZE[1]/SCREEN_SIZE["height"],
-             (f*self.FOLLOW_HEIGHT*math.cos(pitch)+cy*distance+cy*self.FOLLOW_HEIGHT*math.sin(pitch))*SEGMENTATION_INPUT_SIZE[1]/SCREEN_SIZE["height"]],
-
-            [-math.cos(pitch)*math.cos(heading),
-             -math.cos(pitch)*math.sin(heading),
-             distance+self.FOLLOW_HEIGHT*math.sin(pitch)],
-        ])
-        
-        matrix = np.linalg.inv(matrix)
-        # matrix[0, :] = matrix[0, :]*(SEGMENTATION_INPUT_SIZE[0]/52.731)
-        # matrix[1, :] = matrix[1, :]*(SEGMENTATION_INPUT_SIZE[1]/52.731)
-        # 4 image corners
-        c1 = np.array([[0, 0, 1]]).T
-        c2 = np.array([[SEGMENTATION_INPUT_SIZE[0], 0, 1]]).T
-        c3 = np.array([[SEGMENTATION_INPUT_SIZE[0], SEGMENTATION_INPUT_SIZE[1], 1]]).T
-        c4 = np.array([[0, SEGMENTATION_INPUT_SIZE[1], 1]]).T
-        # converted corners
-        r1 = np.matmul(matrix, c1)
-        r2 = np.matmul(matrix, c2)
-        r3 = np.matmul(matrix, c3)
-        r4 = np.matmul(matrix, c4)
-        # finding x and y range
-        x_min = min(r1[0]/r1[2], r2[0]/r2[2], r3[0]/r3[2], r4[0]/r4[2])
-        y_min = min(r1[1]/r1[2], r2[1]/r2[2], r3[1]/r3[2], r4[1]/r4[2])
-        x_max = max(r1[0]/r1[2], r2[0]/r2[2], r3[0]/r3[2], r4[0]/r4[2])
-        y_max = max(r1[1]/r1[2], r2[1]/r2[2], r3[1]/r3[2], r4[1]/r4[2])
-        # this rescales the output because world coordinates would be like 50, but we need it to be like 500
-        matrix[0, :] = matrix[0, :]*(SEGMENTATION_INPUT_SIZE[0]/(x_max - x_min))
-        matrix[1, :] = matrix[1, :]*(SEGMENTATION_INPUT_SIZE[1]/(y_max - y_min))
-        # translating output to be on positive x and y
-        transl_mat = np.eye(3)
-        transl_mat[0, 2] = -x_min*(SEGMENTATION_INPUT_SIZE[0]/(x_max - x_min))
-        transl_mat[1, 2] = -y_min*(SEGMENTATION_INPUT_SIZE[1]/(y_max - y_min))
-        matrix = np.matmul(transl_mat, matrix)
-        
-        image = image.astype('uint8')
+        matrix, x_range, y_range = CameraModel.get(heading, pitch, distance, fov).ground_warp()
+        image = image.astype('uint8', copy=False)
         res = cv2.warpPerspective(image, matrix, (SEGMENTATION_INPUT_SIZE[0], SEGMENTATION_INPUT_SIZE[1]), flags=cv2.INTER_NEAREST)
         
         if self.measure_time:
             t2 = time.time_ns()
             self.time_records_list.append(("warp_image_to_ground", t2-t1))
 
-        return res, (x_min[0], x_max[0]), (y_min[0], y_max[0])
+        return res, x_range, y_range
 
     def process_segmentation_image(self, image: np.array) -> Image.Image:
         """Updates tiles based on segmentation info
@@ -225,28 +202,10 @@ class WorldModel:
             y_lines.append(int((aux - y_min)/(y_max - y_min)*SEGMENTATION_INPUT_SIZE[1]))
             aux += TILE_SIZE
 
-        # how to do averages efficiently?
-        # kernel_size = x_lines[1] - x_lines[0]
-        # conv_kernel = torch.Tensor(np.ones((kernel_size, kernel_size))/kernel_size/kernel_size)
-        # res_tensor = torch.Tensor(warped_image[x_lines[0]:x_lines[-1], y_lines[0]:y_lines[-1], :]).unsqueeze(0).permute(0, 3, 1, 2)
-
-        for i in range(len(x_lines)-1):
-            x1 = x_lines[i]
-            x2 = x_lines[i+1]
-            for j in range(len(y_lines)-1):
-                y1 = y_lines[j]
-                y2 = y_lines[j+1]
-                # again, opencv x = x2, opencv y = x1
-                cur_chunk = warped_image[x1:x2, y1:y2]
-                values, counts = np.unique(cur_chunk, return_counts=True)
-                tile_id = values[np.argmax(counts)]
-                tile_x1 = int(left_corner_y // TILE_SIZE) + j
-                tile_x2 = int(left_corner_x // TILE_SIZE) + i
-                if tile_id != 0:
-                    if (tile_x1, tile_x2) not in self.tiles.keys():
-                        self.tiles[(tile_x1, tile_x2)] = TerrainTile(tile_id)
-                    else:
-                        self.tiles[(tile_x1, tile_x2)].add_detection(tile_id)
+        # most common class in each tile, again, opencv x = x2, opencv y = x1
+        tile_ids = block_modes(warped_image, x_lines, y_lines)
+        i, j = np.nonzero(tile_ids)
+        self.terrain_map.add_detections(int(left_corner_y // TILE_SIZE) + j, int(left_corner_x // TILE_SIZE) + i, tile_ids[i, j])
         
         if self.debug:
             # files = glob.glob(debug_folder_path + "*.png")
@@ -320,7 +279,18 @@ class WorldModel:
         :rtype: tuple[int, int]
         """
         return (math.floor(p.x1/CHUNK_SIZE), math.floor(p.x2/CHUNK_SIZE))
-    
+
+    @staticmethod
+    def positions_array(objs : list[ObjectModel | MobModel]) -> np.array:
+        """Get the positions of objects (or mobs) as an array
+
+        :param objs: objects
+        :type objs: list[ObjectModel | MobModel]
+        :return: array with shape (len(objs), 2) with (x1, x2) for each object
+        :rtype: np.array
+        """
+        return np.array([(obj.position.x1, obj.position.x2) for obj in objs], dtype=np.float64).reshape(-1, 2)
+
     def required_nearby_chunks(self, p : Point2d) -> list[tuple[int, int]]:
         """Calculates which nearby chunks should be checked for nearby objects (two close objects could be in 
         different chunks if close to a border)
@@ -422,37 +392,38 @@ class WorldModel:
             # pos in (x, z) in world coords
             pos = self.local_to_almost_global_position(self.latest_detected_player_position, heading, pitch, distance, fov)
             self.origin_coordinates = self.player.estimate_position_at_timestamp(self.yolo_timestamp) - pos
-        # corners of the trapezoid that we are seeing
-        self.c1 = self.local_to_global_position(Point2d(0, 0), heading, pitch, distance, fov)
-        self.c2 = self.local_to_global_position(Point2d(0, SCREEN_SIZE["height"]), heading, pitch, distance, fov)
-        self.c3 = self.local_to_global_position(Point2d(SCREEN_SIZE["width"], SCREEN_SIZE["height"]), heading, pitch, distance, fov)
-        self.c4 = self.local_to_global_position(Point2d(SCREEN_SIZE["width"], 0), heading, pitch, distance, fov)
-        self.c1_deletion_border = self.local_to_global_position(Point2d(SCREEN_SIZE["width"]*0.1, SCREEN_SIZE["height"]*0.1), heading, pitch, distance, fov)
-        self.c2_deletion_border = self.local_to_global_position(Point2d(SCREEN_SIZE["width"]*0.1, SCREEN_SIZE["height"]*0.9), heading, pitch, distance, fov)
-        self.c3_deletion_border = self.local_to_global_position(Point2d(SCREEN_SIZE["width"]*0.9, SCREEN_SIZE["height"]*0.9), heading, pitch, distance, fov)
-        self.c4_deletion_border = self.local_to_global_position(Point2d(SCREEN_SIZE["width"]*0.9, SCREEN_SIZE["height"]*0.1), heading, pitch, distance, fov)
+        # corners of the trapezoid that we are seeing (the camera model only computes them once)
+        camera = CameraModel.get(heading, pitch, distance, fov)
+        self.c1, self.c2, self.c3, self.c4 = [self.origin_coordinates + c for c in camera.view_corners]
+        self.c1_deletion_border, self.c2_deletion_border, self.c3_deletion_border, self.c4_deletion_border = [
+            self.origin_coordinates + c for c in camera.deletion_corners]
         # chunks in the trapezoid view
         cur_chunk_list = self.get_current_chunks()
-        # objects in our modeling that should be currently rendered, paired with a flag indicating 
-        cur_obj_list = []
-        for chunk in cur_chunk_list:
+        # objects in the current chunks, the same chunk can show up more than once, but each object is only considered once
+        chunk_objs : list[ObjectModel] = []
+        for chunk in dict.fromkeys(cur_chunk_list):
             # if the chunk exists in our modeling (there are objects in our WorldModel that are in that chunk), 
             # we get all the objects that should be currently rendered
             if chunk in self.objects_by_chunks:
-                cur_obj_list.extend([[obj, False] for obj in self.objects_by_chunks[chunk] 
-                                                if is_inside_convex_polygon([self.c1, self.c2, self.c3, self.c4], obj.position)])
-        self.objects_detected_this_cycle = cur_obj_list
-        cur_mob_list = []
+                chunk_objs.extend(self.objects_by_chunks[chunk])
+        inside = points_inside_convex_polygon([self.c1, self.c2, self.c3, self.c4], self.positions_array(chunk_objs))
+        # objects in our modeling that should be currently rendered, mapped to a flag indicating whether they were detected
+        cur_objs : dict[ObjectModel, bool] = {obj: False for obj, is_inside in zip(chunk_objs, inside.tolist()) if is_inside}
+        self.objects_detected_this_cycle = cur_objs
+        cur_mobs : dict[MobModel, bool] = {}
         for mob_list in self.mob_lists.values():
-            cur_mob_list.extend([[mob, False] for mob in mob_list])
-        self.mobs_detected_this_cycle = cur_mob_list
-        # add recent objects to the list that we're going to observe whether we detect them this cycle
-        self.objects_detected_this_cycle.extend([[pair[0], False] for pair in self.recent_objects])
-        # add recent mobs to the list that we're going to observe whether we detect them this cycle
-        self.mobs_detected_this_cycle.extend([[pair[0], False] for pair in self.recent_mobs])
-        self.estimation_errors = []
-        self.additions_to_recent_objects = []
-        self.additions_to_recent_mobs = []
+            for mob in mob_list:
+                cur_mobs[mob] = False
+        self.mobs_detected_this_cycle = cur_mobs
+        # add recent objects to the ones that we're going to observe whether we detect them this cycle
+        for obj in self.recent_objects:
+            self.objects_detected_this_cycle[obj] = False
+        # add recent mobs to the ones that we're going to observe whether we detect them this cycle
+        for mob in self.recent_mobs:
+            self.mobs_detected_this_cycle[mob] = False
+        self.drift_estimator.start_cycle()
+        self.additions_to_recent_objects = {}
+        self.additions_to_recent_mobs = {}
         self.estimation_pairs = []
 
         if self.measure_time:
@@ -479,30 +450,36 @@ class WorldModel:
         :return: position in the world's coordinate system, but with the origin in the point in the screen center
         :rtype: Point2d
         """
-        # f = H / (2*tan(AFOV/2)), f focal distance, H height, AFOV angular FOV
-        f = SCREEN_SIZE["height"]/(2*math.tan(fov/180*math.pi/2))
         # in opencv, y points down and x points to the right, but in our coordinate system x is down and y to the right 
-        fx = (local_position.x1 - SCREEN_SIZE["width"]/2)/f
-        fy = (local_position.x2 - SCREEN_SIZE["height"]/2)/f
-        heading = heading*math.pi/180
-        pitch = pitch*math.pi/180
-        sin_heading = math.sin(heading)
-        cos_heading = math.cos(heading)
-        sin_pitch = math.sin(pitch)
-        cos_pitch = math.cos(pitch)
-        world_x = (-sin_heading*self.FOLLOW_HEIGHT*fx
-                    -sin_heading*sin_pitch*distance*fx
-                    +cos_heading*sin_pitch*self.FOLLOW_HEIGHT*fy
-                    +cos_heading*distance*fy
-                    -cos_heading*cos_pitch*self.FOLLOW_HEIGHT)/(cos_pitch*fy+sin_pitch)
-        world_z = (cos_heading*self.FOLLOW_HEIGHT*fx
-                    +cos_heading*sin_pitch*distance*fx
-                    +sin_heading*sin_pitch*self.FOLLOW_HEIGHT*fy
-                    +sin_heading*distance*fy
-                    -sin_heading*cos_pitch*self.FOLLOW_HEIGHT)/(cos_pitch*fy+sin_pitch)
+        pos = CameraModel.get(heading, pitch, distance, fov).screen_to_world(np.array([[local_position.x1, local_position.x2]]))
+        world_x, world_z = pos[0].tolist()
         # in our world model, we'll use (x,z) as the two coordinates
         return Point2d(world_x, world_z)
 
+    def local_to_almost_global_positions(self, u : np.array, v : np.array, 
+            heading : float, pitch : float, distance : float, fov : float) -> tuple[np.array, np.array]:
+        """Vectorized version of local_to_almost_global_position, converts many local positions at once
+
+        :param u: horizontal image positions (Point2d.x1 of the local positions)
+        :type u: np.array
+        :param v: vertical image positions (Point2d.x2 of the local positions)
+        :type v: np.array
+        :param heading: camera heading
+        :type heading: float
+        :param pitch: camera pitch
+        :type pitch: float
+        :param distance: camera distance
+        :type distance: float
+        :param fov: camera FOV
+        :type fov: float
+        :return: x and z arrays of the positions in the world's coordinate system, but with the origin in the point in the screen center
+        :rtype: tuple[np.array, np.array]
+        """
+        pos = CameraModel.get(heading, pitch, distance, fov).screen_to_world(np.stack([u, v], axis=1))
+        world_x = pos[:, 0]
+        world_z = pos[:, 1]
+        return world_x, world_z
+
     def local_to_global_position(self, local_position : Point2d, heading : float, pitch : float, distance : float, fov : float) -> Point2d:
         """Converts the local position (2d image position) to the global position (could be 3d, 
         but everything is on the ground)
@@ -537,66 +514,137 @@ class WorldModel:
             Point2d.bottom_from_box(image_obj.box),
             CAMERA_HEADING, CAMERA_PITCH, CAMERA_DISTANCE, FOV)
         self.handle_object_at_position(image_obj, pos)
-    
+
+    def objects_detected(self, image_objs : list[ImageObject]) -> None:
+        """Batch version of object_detected, it handles all the objects detected in a frame at once. All positions are 
+        projected in a single operation and each object type gets a detection by candidate distance matrix, the effects 
+        on the world model are the same as calling object_detected for each object in order
+
+        :param image_objs: detected objects, they should all be of the OBJECT type
+        :type image_objs: list[ImageObject]
+        """
+        if len(image_objs) == 0:
+            return
+
+        if self.measure_time:
+            t1 = time.time_ns()
+
+        boxes = np.array([image_obj.box for image_obj in image_objs], dtype=np.float64)
+        # anchor points are usually at the bottom (y) and middle (x), like in Point2d.bottom_from_box
+        pos_x1, pos_x2 = self.local_to_almost_global_positions(boxes[:, 0], boxes[:, 1] + boxes[:, 3]//2, 
+                                                               CAMERA_HEADING, CAMERA_PITCH, CAMERA_DISTANCE, FOV)
+        pos_x1 = (self.origin_coordinates.x1 + pos_x1).tolist()
+        pos_x2 = (self.origin_coordinates.x2 + pos_x2).tolist()
+        positions = [Point2d(x1, x2) for x1, x2 in zip(pos_x1, pos_x2)]
+
+        names = {}
+        rows_by_name : dict[str, list[int]] = {}
+        for k, image_obj in enumerate(image_objs):
+            if image_obj.id not in names:
+                names[image_obj.id] = objects_info.name_from_image_id(image_obj.id)
+            rows_by_name.setdefault(names[image_obj.id], []).append(k)
+
+        # for each object type, the candidates are the world model objects near any of the detections and the recent
+        # objects near any of them, world model objects come first so that they're preferred when distances are tied
+        candidates_by_name : dict[str, list[ObjectModel]] = {}
+        distances_by_name : dict[str, np.array] = {}
+        row_in_matrix = [0]*len(image_objs)
+        for name, rows in rows_by_name.items():
+            candidates = {}
+            for k in rows:
+                candidates.update(dict.fromkeys(self.object_index.near(positions[k], name, DISTANCE_FOR_SAME_OBJECT)))
+            for k in rows:
+                candidates.update(dict.fromkeys(self.recent_object_index.near(positions[k], name, DISTANCE_FOR_SAME_OBJECT)))
+            candidates = list(candidates)
+            for i, k in enumerate(rows):
+                row_in_matrix[k] = i
+            candidates_by_name[name] = candidates
+            if len(candidates) > 0:
+                det_x1 = np.array([pos_x1[k] for k in rows])
+                det_x2 = np.array([pos_x2[k] for k in rows])
+                cand_x1 = np.array([obj.position.x1 for obj in candidates])
+                cand_x2 = np.array([obj.position.x2 for obj in candidates])
+                distances = np.sqrt((det_x1[:, None] - cand_x1[None, :])**2 + (det_x2[:, None] - cand_x2[None, :])**2)
+                distances[distances > DISTANCE_FOR_SAME_OBJECT] = np.inf
+                distances_by_name[name] = distances
+
+        # the matches are applied in the original order, because matching a recent object moves it
+        for k, image_obj in enumerate(image_objs):
+            name = names[image_obj.id]
+            candidates = candidates_by_name[name]
+            best_match : ObjectModel = None
+            if len(candidates) > 0:
+                distances = distances_by_name[name]
+                row = distances[row_in_matrix[k]]
+                col = int(np.argmin(row))
+                if row[col] != np.inf:
+                    best_match = candidates[col]
+            moved = self.register_object_detection(image_obj, positions[k], best_match)
+            if moved:
+                rows = rows_by_name[name]
+                det_x1 = np.array([pos_x1[r] for r in rows])
+                det_x2 = np.array([pos_x2[r] for r in rows])
+                column = np.sqrt((det_x1 - best_match.position.x1)**2 + (det_x2 - best_match.position.x2)**2)
+                column[column > DISTANCE_FOR_SAME_OBJECT] = np.inf
+                distances[:, col] = column
+
+        if self.measure_time:
+            t2 = time.time_ns()
+            self.time_records_list.append(("objects_detected", t2-t1))
 
     def handle_object_at_position(self, image_obj : ImageObject, pos : Point2d):
         if self.measure_time:
             t1 = time.time_ns()
 
-        obj_name = objects_info.get_item_info(info="name", image_id=image_obj.id)
-        required_chunks = [self.point_to_chunk_index(pos)]
-        adj_required_chunks = self.required_nearby_chunks(pos)
-        required_chunks.extend(adj_required_chunks)
-        objects_to_analyze : list[ObjectModel]= []
-        for chunk_index in required_chunks:
-            if chunk_index in self.objects_by_chunks:
-                objects_to_analyze.extend(self.objects_by_chunks[chunk_index])
-        
-        # getting object from pair (obj, cycle_count)
-        objects_to_analyze.extend([pair[0] for pair in self.recent_objects])
+        obj_name = objects_info.name_from_image_id(image_obj.id)
+        # closest object of the same type that is close enough to be considered the same object, 
+        # world model objects are preferred over recent objects if both are at the same distance
+        best_match, lowest_distance = self.object_index.nearest(pos, obj_name, DISTANCE_FOR_SAME_OBJECT)
+        recent_match, recent_distance = self.recent_object_index.nearest(pos, obj_name, DISTANCE_FOR_SAME_OBJECT)
+        if recent_match is not None and (best_match is None or recent_distance < lowest_distance):
+            best_match = recent_match
+        self.register_object_detection(image_obj, pos, best_match)
 
-        best_match : ObjectModel = None
-        lowest_distance : float = None
-        for obj in objects_to_analyze:
-            # if the object is close enough to an already detected object of the same type
-            if pos.distance(obj.position) <= DISTANCE_FOR_SAME_OBJECT and obj.name_str() == obj_name:
-                if best_match is None or obj.position.distance(pos) < lowest_distance:
-                    best_match = obj
-                    lowest_distance = obj.position.distance(pos)
-        
+        if self.measure_time:
+            t2 = time.time_ns()
+            self.time_records_list.append(("handle_object_at_position", t2-t1))
+
+    def register_object_detection(self, image_obj : ImageObject, pos : Point2d, best_match : ObjectModel) -> bool:
+        """Apply the effects of detecting an object at pos, given the object it was matched to
+
+        :param image_obj: detected object
+        :type image_obj: ImageObject
+        :param pos: detected position in the world
+        :type pos: Point2d
+        :param best_match: closest known object of the same type within DISTANCE_FOR_SAME_OBJECT, None if there's none
+        :type best_match: ObjectModel
+        :return: whether best_match was moved to pos (only recent objects are moved)
+        :rtype: bool
+        """
+        moved = False
         if best_match is None:
             # in this case, I just identified something that's not in the WorldModel yet, so I create a new object1
             obj = factory.create_object(image_obj.id, pos, image_obj.box, self.scheduler)
 
-            self.additions_to_recent_objects.append([obj, 1])
+            self.additions_to_recent_objects[obj] = 1
         else:
             best_match.latest_screen_position = image_obj.box
-            # in this case, I identified an object that's already in my WorldModel or in the recent objects list
-            if best_match in [pair[0] for pair in self.objects_detected_this_cycle]:
-                obj_index = [pair[0] for pair in self.objects_detected_this_cycle].index(best_match)
-                self.objects_detected_this_cycle[obj_index][1] = True
-                # if it's in the recent objects list, update its position
-                if best_match in [pair[0] for pair in self.recent_objects]:
+            # in this case, I identified an object that's already in my WorldModel or in the recent objects
+            if best_match in self.objects_detected_this_cycle:
+                self.objects_detected_this_cycle[best_match] = True
+                # if it's a recent object, update its position
+                if best_match in self.recent_objects:
                     # maybe there's a better way, but for now just update its position
+                    self.recent_object_index.move(best_match, best_match.position, pos)
                     best_match.position = pos
+                    moved = True
             if isinstance(best_match, ObjectWithMultipleForms):
                 best_match.handle_object_detected(image_obj.id)
             # this is the error from the position in modeling to the one being observed now 
-            self.estimation_errors.append(pos - best_match.position)
-            self.estimation_pairs.append((best_match.name_str(), pos, best_match.position))
-            
-        # if obj_name in self.object_lists:
-        #     self.object_lists[obj_name].append(obj)
-        # else:
-        #     self.object_lists[obj_name] = [obj]
-        # if self.point_to_chunk_index(pos) in self.objects_by_chunks:
-        #     self.objects_by_chunks[self.point_to_chunk_index(pos)].append(obj)
-        # else:
-        #     self.objects_by_chunks[self.point_to_chunk_index(pos)] = [obj]
-
-        if self.measure_time:
-            t2 = time.time_ns()
-            self.time_records_list.append(("handle_object_at_position", t2-t1))
+            self.drift_estimator.add(pos - best_match.position)
+            if self.debug:
+                self.estimation_pairs.append((best_match.name_str(), pos, best_match.position))
+        return moved
 
     def mob_detected(self, image_obj : ImageObject):
         # anchor points are usually at the bottom (y) and middle (x)
@@ -610,11 +658,10 @@ class WorldModel:
         if self.measure_time:
             t1 = time.time_ns()
 
-        obj_name = objects_info.get_item_info(info="name", image_id=image_obj.id)
+        obj_name = objects_info.name_from_image_id(image_obj.id)
         mobs_to_analyze : list[MobModel]= []
         
-        # getting object from pair (obj, cycle_count)
-        mobs_to_analyze.extend([pair[0] for pair in self.recent_mobs])
+        mobs_to_analyze.extend(self.recent_mobs)
 
         best_match : MobModel = None
         lowest_distance : float = None
@@ -629,15 +676,14 @@ class WorldModel:
             # in this case, I just identified something that's not in the WorldModel yet, so I create a new object1
             obj = factory.create_mob(image_obj.id, pos, image_obj.box)
 
-            self.additions_to_recent_mobs.append([obj, 1])
+            self.additions_to_recent_mobs[obj] = 1
         else:
             best_match.latest_screen_position = image_obj.box
-            # in this case, I identified an object that's already in my WorldModel or in the recent objects list
-            if best_match in [pair[0] for pair in self.mobs_detected_this_cycle]:
-                obj_index = [pair[0] for pair in self.mobs_detected_this_cycle].index(best_match)
-                self.mobs_detected_this_cycle[obj_index][1] = True
-                # if it's in the recent objects list, update its position
-                if best_match in [pair[0] for pair in self.recent_mobs]:
+            # in this case, I identified an object that's already in my WorldModel or in the recent mobs
+            if best_match in self.mobs_detected_this_cycle:
+                self.mobs_detected_this_cycle[best_match] = True
+                # if it's a recent mob, update its position
+                if best_match in self.recent_mobs:
                     # maybe there's a better way, but for now just update its position
                     best_match.position = pos
             best_match.handle_mob_detected(image_obj.id)
@@ -654,25 +700,34 @@ class WorldModel:
             t1 = time.time_ns()
         
         self.cycles_since_player_detected += 1
-        for pair in self.objects_detected_this_cycle:
-            obj = pair[0]
-            detected = pair[1]
+        # whether each world model object (or mob) that wasn't detected is inside the deletion border
+        deletion_border = [self.c1_deletion_border, self.c2_deletion_border, self.c3_deletion_border, self.c4_deletion_border]
+        missed = [obj for obj, detected in self.objects_detected_this_cycle.items()
+                  if not detected and obj not in self.recent_objects]
+        missed += [mob for mob, detected in self.mobs_detected_this_cycle.items()
+                   if not detected and mob not in self.recent_mobs]
+        inside_deletion_border : dict[ObjectModel | MobModel, bool] = dict(zip(
+            missed, points_inside_convex_polygon(deletion_border, self.positions_array(missed)).tolist()))
+        for obj, detected in self.objects_detected_this_cycle.items():
             # handling the case in which obj is a recent object
-            if obj in [pair[0] for pair in self.recent_objects]:
-                obj_index = [pair[0] for pair in self.recent_objects].index(obj)
+            if obj in self.recent_objects:
                 if detected:
-                    new_count = self.recent_objects[obj_index][1]+1
+                    new_count = self.recent_objects[obj]+1
                     # if the required number of cycles to admit an object is met, add it to both object_lists and objects_by_chunks
                     if new_count == CYCLES_TO_ADMIT_OBJECT:
-                        self.add_object(obj)
                         # also remove it from recent objects
-                        del self.recent_objects[obj_index]
+                        del self.recent_objects[obj]
+                        self.recent_object_index.remove(obj)
+                        self.add_object(obj)
                     else:
                         # update the cycle count for the object
-                        self.recent_objects[obj_index][1] = new_count
+                        self.recent_objects[obj] = new_count
                 else:
                     # if the object wasn't detected, we remove it
-                    del self.recent_objects[obj_index]
+                    del self.recent_objects[obj]
+                    self.recent_object_index.remove(obj)
+                    # discarded objects shouldn't grow or disappear later
+                    self.scheduler.cancel_all(obj)
             # handling the case in which obj is a world model object (object removal if it wasn't detected for
             # many cycles in a row)
             else:
@@ -681,10 +736,7 @@ class WorldModel:
                 else:
                     # we make it so that objects on the screen border aren't deleted if they aren't seen for a while
                     # since they often are offscreen or blocked by HUD
-                    if is_inside_convex_polygon([self.c1_deletion_border, 
-                                                    self.c2_deletion_border,
-                                                    self.c3_deletion_border, 
-                                                    self.c4_deletion_border], obj.position):
+                    if inside_deletion_border[obj]:
                         # we shouldn't count down an object for deletion if we're hovering over it
                         if obj != self.hovering_object:
                             obj.countdown_cycles_to_be_deleted()
@@ -697,26 +749,27 @@ class WorldModel:
                                 chunk_obj_list = self.objects_by_chunks[chunk_index]
                                 obj_index_in_chunk_list = chunk_obj_list.index(obj)
                                 del chunk_obj_list[obj_index_in_chunk_list]
+                                self.object_index.remove(obj)
+                                self.object_store.remove(obj)
+                                self.filter_index.remove(obj)
+                                self.scheduler.cancel_all(obj)
 
-        for pair in self.mobs_detected_this_cycle:
-            mob = pair[0]
-            detected = pair[1]
+        for mob, detected in self.mobs_detected_this_cycle.items():
             # handling the case in which mob is a recent object
-            if mob in [pair[0] for pair in self.recent_mobs]:
-                mob_index = [pair[0] for pair in self.recent_mobs].index(mob)
+            if mob in self.recent_mobs:
                 if detected:
-                    new_count = self.recent_mobs[mob_index][1]+1
+                    new_count = self.recent_mobs[mob]+1
                     # if the required number of cycles to admit a mob is met, add it to both object_lists and objects_by_chunks
                     if new_count == CYCLES_FOR_MOB_REMOVAL:
                         self.add_mob(mob)
                         # also remove it from recent objects
-                        del self.recent_mobs[mob_index]
+                        del self.recent_mobs[mob]
                     else:
                         # update the cycle count for the object
-                        self.recent_mobs[mob_index][1] = new_count
+                        self.recent_mobs[mob] = new_count
                 else:
                     # if the object wasn't detected, we remove it
-                    del self.recent_mobs[mob_index]
+                    del self.recent_mobs[mob]
             # handling the case in which mob is a world model object (object removal if it wasn't detected for
             # many cycles in a row)
             else:
@@ -725,10 +778,7 @@ class WorldModel:
                 else:
                     # we make it so that objects on the screen border aren't deleted if they aren't seen for a while
                     # since they often are offscreen or blocked by HUD
-                    if is_inside_convex_polygon([self.c1_deletion_border, 
-                                                    self.c2_deletion_border,
-                                                    self.c3_deletion_border, 
-                                                    self.c4_deletion_border], mob.position):
+                    if inside_deletion_border[mob]:
                         # we shouldn't count down an object for deletion if we're hovering over it
                         if mob != self.hovering_object:
                             mob.countdown_cycles_to_be_deleted()
@@ -739,19 +789,11 @@ class WorldModel:
                                 del mob_list[mob_index]
 
         # adding new recent objects 
-        self.recent_objects.extend(self.additions_to_recent_objects)
-
-        avg_error_x1 = 0
-        avg_error_x2 = 0
-        if len(self.estimation_errors) > 0:
-            for err in self.estimation_errors:
-                avg_error_x1 += err.x1
-                avg_error_x2 += err.x2
-            avg_error_x1 /= len(self.estimation_errors)
-            avg_error_x2 /= len(self.estimation_errors)
-            self.avg_observed_error = Point2d(avg_error_x1, avg_error_x2)
-        else:
-            self.avg_observed_error = Point2d(0, 0)
+        self.recent_objects.update(self.additions_to_recent_objects)
+        for obj in self.additions_to_recent_objects:
+            self.recent_object_index.insert(obj)
+
+        self.avg_observed_error = self.drift_estimator.finish_cycle()
         
         # mark current chunk as explored if applicable
         player_chunk = self.point_to_chunk_index(self.player.estimate_position_at_timestamp(self.yolo_timestamp))
@@ -817,9 +859,9 @@ class WorldModel:
 
         :param obj_list: list of object names
         :type obj_list: list[str]
-        :param filter_: filter name, defaults to None
+        :param filter_: filter name (see FilterIndex), defaults to None
         :type filter_: str, optional
-        :raises ValueError: _description_
+        :raises ValueError: if the filter doesn't exist
         :return: dict with keys being object names and values being lists of objects
         :rtype: dict[str, list[ObjectModel]]
         """
@@ -832,96 +874,7 @@ class WorldModel:
                 if filter_ is None:
                     result[obj] = self.object_lists[obj]
                 else:
-                    if filter_ == "only_not_harvested":
-                        res_aux = []
-                        for obj_aux in self.object_lists[obj]:
-                            # if the object has the is_harvested method, we can choose it
-                            op = getattr(obj_aux, "is_harvested", None)
-                            if callable(op):
-                                if not obj_aux.is_harvested():
-                                    res_aux.append(obj_aux)
-                            else:
-                                res_aux.append(obj_aux)
-                        result[obj] = res_aux
-                    elif filter_ == "evergreen_small":
-                        res_aux = []
-                        for obj_aux in self.object_lists[obj]:
-                            # if the object has the is_small method, we can choose it
-                            op = getattr(obj_aux, "is_small", None)
-                            if callable(op):
-                                if obj_aux.is_small():
-                                    res_aux.append(obj_aux)
-                            else:
-                                res_aux.append(obj_aux)
-                        result[obj] = res_aux
-                    elif filter_ == "evergreen_medium":
-                        res_aux = []
-                        for obj_aux in self.object_lists[obj]:
-                            # if the object has the is_medium method, we can choose it
-                            op = getattr(obj_aux, "is_medium", None)
-                            if callable(op):
-                                if obj_aux.is_medium():
-                                    res_aux.append(obj_aux)
-                            else:
-                                res_aux.append(obj_aux)
-                        result[obj] = res_aux
-                    elif filter_ == "evergreen_big":
-                        res_aux = []
-                        for obj_aux in self.object_lists[obj]:
-                            # if the object has the is_big method, we can choose it
-                            op = getattr(obj_aux, "is_big", None)
-                            if callable(op):
-                                if obj_aux.is_big():
-                                    res_aux.append(obj_aux)
-                            else:
-                                res_aux.append(obj_aux)
-                        result[obj] = res_aux
-                    elif filter_ == "evergreen_dead":
-                        res_aux = []
-                        for obj_aux in self.object_lists[obj]:
-                            # if the object has the is_dead method, we can choose it
-                            op = getattr(obj_aux, "is_dead", None)
-                            if callable(op):
-                                if obj_aux.is_dead():
-                                    res_aux.append(obj_aux)
-                            else:
-                                res_aux.append(obj_aux)
-                        result[obj] = res_aux
-                    elif filter_ == "nest_small":
-                        res_aux = []
-                        for obj_aux in self.object_lists[obj]:
-                            # if the object has the is_small method, we can choose it
-                            op = getattr(obj_aux, "is_small", None)
-                            if callable(op):
-                                if obj_aux.is_small():
-                                    res_aux.append(obj_aux)
-                            else:
-                                res_aux.append(obj_aux)
-                        result[obj] = res_aux
-                    elif filter_ == "nest_medium":
-                        res_aux = []
-                        for obj_aux in self.object_lists[obj]:
-                            # if the object has the is_medium method, we can choose it
-                            op = getattr(obj_aux, "is_medium", None)
-                            if callable(op):
-                                if obj_aux.is_medium():
-                                    res_aux.append(obj_aux)
-                            else:
-                                res_aux.append(obj_aux)
-                        result[obj] = res_aux
-                    elif filter_ == "nest_big":
-                        res_aux = []
-                        for obj_aux in self.object_lists[obj]:
-                            # if the object has the is_big method, we can choose it
-                            op = getattr(obj_aux, "is_big", None)
-                            if callable(op):
-                                if obj_aux.is_big():
-                                    res_aux.append(obj_aux)
-                            else:
-                                res_aux.append(obj_aux)
-                        result[obj] = res_aux
-                    else:
-                        raise ValueError("Filter not implemented")
+                    result[obj] = self.filter_index.query(filter_, obj, self.object_lists[obj])
             else:
                 result[obj] = []
 
@@ -947,6 +900,9 @@ class WorldModel:
             self.objects_by_chunks[self.point_to_chunk_index(pos)].append(obj)
         else:
             self.objects_by_chunks[self.point_to_chunk_index(pos)] = [obj]
+        self.object_index.insert(obj)
+        self.object_store.add(obj)
+        self.filter_index.add(obj)
     
     def add_mob(self, mob : MobModel) -> None:
         """Add object to world model
@@ -959,3 +915,5 @@ class WorldModel:
             self.object_lists[mob_name].append(mob)
         else:
             self.object_lists[mob_name] = [mob]
+        self.object_store.add(mob)
+        self.filter_index.add(mob)
@@ -23,6 +23,25 @@ FOV = 35 # degrees
 CAMERA_DISTANCE = 30
 CAMERA_PITCH = 42.857142 # (30 - 15)/ (50 - 15) * 60 + (50 - 30)/ (50 - 15) * 30, degrees
 CAMERA_HEADING = 45
+# height of the point the camera follows
+CAMERA_FOLLOW_HEIGHT = 1.5 # extracted from the game code
 
 CHUNK_SIZE = 64
-TILE_SIZE = 4
\ No newline at end of file
+# initial number of rows in the object store, it doubles whenever it's full
+OBJECT_STORE_INITIAL_CAPACITY = 1024
+TILE_SIZE = 4
+# the terrain map is stored in square blocks of TERRAIN_BLOCK_SIZE x TERRAIN_BLOCK_SIZE tiles
+TERRAIN_BLOCK_SIZE = 32
+# the type of a tile is the most common one among its latest TERRAIN_VOTES detections
+TERRAIN_VOTES = 10
+# number of terrain types given by segmentation, 0 is unknown
+TERRAIN_CLASSES = 8
+# scheduled changes more than one slot away are kept in coarse time slots (in seconds) and only sorted when their slot starts
+SCHEDULER_SLOT_SECONDS = 60
+
+# maximum number of position errors kept for drift estimation each cycle
+DRIFT_ESTIMATOR_CAPACITY = 256
+# fraction of the position errors farthest from the cycle mean that is ignored when estimating drift
+DRIFT_TRIM_FRACTION = 0.1
+# weight of the latest cycle on the drift estimate (exponential moving average), 1 only uses the latest cycle
+DRIFT_SMOOTHING = 1.
@@ -8,6 +8,8 @@ if TYPE_CHECKING:
     from utility.Point2d import Point2d
 
 class Ashes(ObjectWithSingleForm):
+    __slots__ = ("scheduler",)
+
     def __init__(self, position : Point2d, latest_screen_position : Point2d, scheduler : Scheduler):
         super().__init__(True, position, latest_screen_position)
         self.scheduler = scheduler
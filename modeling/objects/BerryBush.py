@@ -12,6 +12,8 @@ BERRYBUSH_HARVESTED = 36
 
 
 class BerryBush(ObjectWithMultipleForms):
+    __slots__ = ()
+
     def __init__(self, position : Point2d, latest_screen_position : Point2d, id_ : int, scheduler : Scheduler):
         super().__init__(False, position, latest_screen_position, [BERRYBUSH_READY, BERRYBUSH_HARVESTED], id_, scheduler)
         if id_ == BERRYBUSH_HARVESTED:
@@ -33,7 +35,7 @@ class BerryBush(ObjectWithMultipleForms):
 
     def harvest(self):
         self._state = BERRYBUSH_HARVESTED
-        self.scheduler.schedule_change(GameTime(non_winter_days=4.6875), self.position, "grow", self)
+        self.scheduler.schedule_change(GameTime(non_winter_days=4.6875), self.position, "grow", self, replace=True)
 
     def is_harvested(self) -> bool:
         return self._state == BERRYBUSH_HARVESTED
@@ -14,6 +14,8 @@ EVERGREEN_DEAD = 57
 
 
 class Evergreen(ObjectWithMultipleForms):
+    __slots__ = ("lumpy",)
+
     def __init__(self, position : Point2d, latest_screen_position : Point2d, id_ : int, scheduler : Scheduler, lumpy : bool):
         super().__init__(False, position, latest_screen_position,
                          [EVERGREEN_SMALL, EVERGREEN_MEDIUM, EVERGREEN_BIG, EVERGREEN_DEAD], id_, scheduler)
@@ -12,6 +12,8 @@ GRASS_HARVESTED = 22
 
 
 class Grass(ObjectWithMultipleForms):
+    __slots__ = ()
+
     def __init__(self, position : Point2d, latest_screen_position : Point2d, id_ : int, scheduler : Scheduler):
         super().__init__(False, position, latest_screen_position, [GRASS_READY, GRASS_HARVESTED], id_, scheduler)
         if id_ == GRASS_HARVESTED:
@@ -33,7 +35,7 @@ class Grass(ObjectWithMultipleForms):
 
     def harvest(self):
         self._state = GRASS_HARVESTED
-        self.scheduler.schedule_change(GameTime(non_winter_days=3), self.position, "grow", self)
+        self.scheduler.schedule_change(GameTime(non_winter_days=3), self.position, "grow", self, replace=True)
 
     def is_harvested(self) -> bool:
         return self._state == GRASS_HARVESTED
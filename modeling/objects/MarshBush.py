@@ -12,6 +12,8 @@ MARSH_BUSH_HARVESTED = 185
 
 
 class MarshBush(ObjectWithMultipleForms):
+    __slots__ = ()
+
     def __init__(self, position : Point2d, latest_screen_position : Point2d, id_ : int, scheduler : Scheduler):
         super().__init__(False, position, latest_screen_position, [MARSH_BUSH_READY, MARSH_BUSH_HARVESTED], id_, scheduler)
         if id_ == MARSH_BUSH_HARVESTED:
@@ -33,7 +35,7 @@ class MarshBush(ObjectWithMultipleForms):
 
     def harvest(self):
         self._state = MARSH_BUSH_HARVESTED
-        self.scheduler.schedule_change(GameTime(days=4), self.position, "grow", self)
+        self.scheduler.schedule_change(GameTime(days=4), self.position, "grow", self, replace=True)
 
     def is_harvested(self) -> bool:
         return self._state == MARSH_BUSH_HARVESTED
@@ -1,19 +1,44 @@
+from __future__ import annotations
+from typing import TYPE_CHECKING
+
 from modeling.constants import CYCLES_FOR_OBJECT_REMOVAL
 from utility.Point2d import Point2d
+if TYPE_CHECKING:
+    from modeling.ObjectStore import ObjectStore
 
 
 class ObjectModel:
+    __slots__ = ("pickable", "_position", "latest_screen_position", "_cycles_to_be_deleted", "_store", "_handle")
+
     def __init__(self, pickable : bool, position : Point2d, latest_screen_position : Point2d):
+        # object store this object is in and its handle there, see ObjectStore
+        self._store : ObjectStore = None
+        self._handle : int = None
         self.pickable = pickable
         self.position = position
         self.latest_screen_position = latest_screen_position
         self._cycles_to_be_deleted = CYCLES_FOR_OBJECT_REMOVAL
 
+    @property
+    def position(self) -> Point2d:
+        return self._position
+
+    @position.setter
+    def position(self, position : Point2d) -> None:
+        self._position = position
+        # keep the object store copy up to date
+        if self._store is not None:
+            self._store.positions[self._handle] = (position.x1, position.x2)
+
     def reset_cycles_to_be_deleted(self) -> None:
         self._cycles_to_be_deleted = CYCLES_FOR_OBJECT_REMOVAL
+        if self._store is not None:
+            self._store.cycles_to_be_deleted[self._handle] = self._cycles_to_be_deleted
     
     def countdown_cycles_to_be_deleted(self) -> None:
         self._cycles_to_be_deleted -= 1
+        if self._store is not None:
+            self._store.cycles_to_be_deleted[self._handle] = self._cycles_to_be_deleted
 
     def get_cycles_to_be_deleted(self) -> int:
         return self._cycles_to_be_deleted
@@ -1,15 +1,16 @@
 from __future__ import annotations
 from typing import TYPE_CHECKING
 
-import pandas as pd
-
 from modeling.objects.ObjectModel import ObjectModel
+from modeling.ObjectsInfo import objects_info
 if TYPE_CHECKING:
     from modeling.Scheduler import Scheduler
     from utility.Point2d import Point2d
 
 
 class ObjectWithMultipleForms(ObjectModel):
+    __slots__ = ("object_ids", "_form", "scheduler")
+
     # object_ids should be an array like this: [id1, id2]
     def __init__(self, pickable : bool, position : Point2d, latest_screen_position : Point2d, 
                  object_ids : list[int], initial_state : int, scheduler : Scheduler):
@@ -18,15 +19,25 @@ class ObjectWithMultipleForms(ObjectModel):
         if type(object_ids) is not list:
             raise Exception("Invalid constructor arguments!")
         
-        obj_info = pd.read_csv('utility/objects_info.csv')
         for obj_id in object_ids:
-            assert obj_id in obj_info[obj_info["name"] == type(self).__name__]["image_id"]
+            assert obj_id in objects_info.image_ids_from_name(type(self).__name__)
 
         super().__init__(pickable, position, latest_screen_position)
         self.object_ids = object_ids
         self._state = initial_state
         self.scheduler = scheduler
 
+    @property
+    def _state(self) -> int:
+        return self._form
+
+    @_state.setter
+    def _state(self, state : int) -> None:
+        self._form = state
+        # keep the object store copy (and the world model filters) up to date
+        if self._store is not None:
+            self._store.set_state(self._handle, state)
+
     def handle_object_detected(self, state):
         raise NotImplementedError()
 
@@ -7,6 +7,8 @@ if TYPE_CHECKING:
 
 
 class ObjectWithSingleForm(ObjectModel):
+    __slots__ = ()
+
     # object_ids should be an array like this: [id1, id2]
     def __init__(self, pickable : bool, position : Point2d, latest_screen_position : Point2d):
         super().__init__(pickable, position, latest_screen_position)
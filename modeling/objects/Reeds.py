@@ -12,6 +12,8 @@ REEDS_HARVESTED = 186
 
 
 class Reeds(ObjectWithMultipleForms):
+    __slots__ = ()
+
     def __init__(self, position : Point2d, latest_screen_position : Point2d, id_ : int, scheduler : Scheduler):
         super().__init__(False, position, latest_screen_position, [REEDS_READY, REEDS_HARVESTED], id_, scheduler)
         if id_ == REEDS_HARVESTED:
@@ -33,7 +35,7 @@ class Reeds(ObjectWithMultipleForms):
 
     def harvest(self):
         self._state = REEDS_HARVESTED
-        self.scheduler.schedule_change(GameTime(non_winter_days=3), self.position, "grow", self)
+        self.scheduler.schedule_change(GameTime(non_winter_days=3), self.position, "grow", self, replace=True)
 
     def is_harvested(self) -> bool:
         return self._state == REEDS_HARVESTED
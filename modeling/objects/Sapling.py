@@ -12,6 +12,8 @@ SAPLING_HARVESTED = 24
 
 
 class Sapling(ObjectWithMultipleForms):
+    __slots__ = ()
+
     def __init__(self, position : Point2d, latest_screen_position : Point2d, id_ : int, scheduler : Scheduler):
         super().__init__(False, position, latest_screen_position, [SAPLING_READY, SAPLING_HARVESTED], id_, scheduler)
         if id_ == SAPLING_HARVESTED:
@@ -33,7 +35,7 @@ class Sapling(ObjectWithMultipleForms):
 
     def harvest(self):
         self._state = SAPLING_HARVESTED
-        self.scheduler.schedule_change(GameTime(non_winter_days=4), self.position, "grow", self)
+        self.scheduler.schedule_change(GameTime(non_winter_days=4), self.position, "grow", self, replace=True)
 
     def is_harvested(self) -> bool:
         return self._state == SAPLING_HARVESTED
@@ -12,6 +12,8 @@ NEST_MEDIUM = 74
 NEST_BIG = 75
 
 class SpiderNest(ObjectWithMultipleForms):
+    __slots__ = ()
+
     def __init__(self, position : Point2d, latest_screen_position : Point2d, id_ : int, scheduler : Scheduler):
         super().__init__(False, position, latest_screen_position, [NEST_SMALL, NEST_MEDIUM, NEST_BIG], id_, scheduler)
         # times are random, 5-10 days, 5-10 days, 12.5-25 days, but I'm using the maximum value
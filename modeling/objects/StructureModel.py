@@ -7,6 +7,8 @@ if TYPE_CHECKING:
 
 
 class StructureModel(ObjectWithSingleForm):
+    __slots__ = ("id", "name")
+
     def __init__(self, position : Point2d, latest_screen_position : Point2d, id_ : int, name : str):
         super().__init__(False, position, latest_screen_position)
         self.id = id_
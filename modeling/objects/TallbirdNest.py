@@ -7,6 +7,8 @@ if TYPE_CHECKING:
 
 
 class TallbirdNest(ObjectWithSingleForm):
+    __slots__ = ("has_egg",)
+
     def __init__(self, position : Point2d, latest_screen_position :  Point2d):
         super().__init__(False, position, latest_screen_position)
         self.has_egg = False
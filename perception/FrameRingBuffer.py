@@ -0,0 +1,36 @@
+import numpy as np
+
+from perception.constants import SCREEN_SIZE, FRAME_RING_BUFFER_SLOTS
+from utility.SharedRingBuffer import SharedRingBuffer
+
+
+class FrameRingBuffer(SharedRingBuffer):
+    def __init__(self, slots : int = FRAME_RING_BUFFER_SLOTS,
+                 frame_shape : tuple[int, int, int] = (SCREEN_SIZE["height"], SCREEN_SIZE["width"], 3)):
+        """Shared memory ring buffer of captured frames. A single producer (the capture process) publishes each
+        frame once, with its frame id and capture timestamp, and any number of consumers read it without copying
+
+        :param slots: number of frames kept, defaults to FRAME_RING_BUFFER_SLOTS
+        :type slots: int, optional
+        :param frame_shape: shape of each frame, defaults to the screen size with 3 channels (BGR)
+        :type frame_shape: tuple[int, int, int], optional
+        """
+        super().__init__(slots, frame_shape, np.uint8)
+        self.channels = frame_shape[2]
+
+    def publish(self, frame : np.array, timestamp : float) -> int:
+        """Write a new frame into the next slot, this should only be called by the producer
+
+        :param frame: frame to be published, extra channels (like mss' alpha) are dropped
+        :type frame: np.array
+        :param timestamp: capture timestamp
+        :type timestamp: float
+        :return: id of the published frame
+        :rtype: int
+        """
+        slot_array, frame_id = self._begin_write()
+        np.copyto(slot_array, frame[:, :, :self.channels])
+        return self._finish_write(frame_id, timestamp, len(slot_array))
+
+    def latest_frame_id(self) -> int:
+        return self.latest_id()
@@ -1,5 +1,41 @@
+import numpy as np
+
+# columnar representation of detections, box is (x, y, w, h) with x and y being the box center
+DETECTION_DTYPE = np.dtype([("class", np.int32), ("score", np.float32),
+                            ("x", np.int32), ("y", np.int32), ("w", np.int32), ("h", np.int32)])
+
+
 class ImageObject:
+    __slots__ = ("id", "score", "box")
+
     def __init__(self, class_id : int, score : float, box : tuple[int, int, int, int]):
         self.id = class_id
         self.score = score
         self.box = box
+
+
+def image_objects_to_detections(objects : list[ImageObject]) -> np.array:
+    """Convert a list of ImageObject to a structured array with DETECTION_DTYPE
+
+    :param objects: detected objects
+    :type objects: list[ImageObject]
+    :return: structured array with one row per object
+    :rtype: np.array
+    """
+    detections = np.empty(len(objects), dtype=DETECTION_DTYPE)
+    for i, obj in enumerate(objects):
+        detections[i] = (obj.id, obj.score, obj.box[0], obj.box[1], obj.box[2], obj.box[3])
+    return detections
+
+def detections_to_image_objects(detections : np.array) -> list[ImageObject]:
+    """Convert a structured array with DETECTION_DTYPE to a list of ImageObject
+
+    :param detections: structured array with one row per object
+    :type detections: np.array
+    :return: detected objects
+    :rtype: list[ImageObject]
+    """
+    classes = detections["class"].tolist()
+    scores = detections["score"].tolist()
+    boxes = np.stack([detections["x"], detections["y"], detections["w"], detections["h"]], axis=1).tolist()
+    return [ImageObject(class_id, score, box) for class_id, score, box in zip(classes, scores, boxes)]
@@ -0,0 +1,107 @@
+import numpy as np
+import torch
+
+from perception.constants import SEGMENTATION_BACKEND, SEGMENTATION_MODEL_PATH, SEGMENTATION_ONNX_MODEL_PATH
+from perception.constants import SEGMENTATION_CPU_THREADS, SEGMENTATION_INPUT_SIZE
+
+
+class InferenceBackend:
+    def __init__(self, device : str, input_shape : tuple[int, int, int, int]):
+        """Runs a model on a device. The input is copied to a tensor that is allocated once on that device
+
+        :param device: torch device the input tensor lives on
+        :type device: str
+        :param input_shape: model input shape (batch, channels, height, width)
+        :type input_shape: tuple[int, int, int, int]
+        """
+        self.device = device
+        self.input = torch.zeros(input_shape, dtype=torch.float32, device=device)
+
+    def forward(self, image : torch.Tensor) -> torch.Tensor:
+        """Run the model
+
+        :param image: input with the shape given in the constructor, in any dtype and device
+        :type image: torch.Tensor
+        :return: model output, on self.device
+        :rtype: torch.Tensor
+        """
+        raise NotImplementedError()
+
+
+class TorchScriptBackend(InferenceBackend):
+    def __init__(self, device : str, model_path : str = SEGMENTATION_MODEL_PATH,
+                 input_shape : tuple[int, int, int, int] = (1, 3, *SEGMENTATION_INPUT_SIZE),
+                 num_threads : int = SEGMENTATION_CPU_THREADS):
+        """Runs a TorchScript model. On CPU, the model is frozen and uses channels last layout and a limited number of
+        threads
+
+        :param device: "cuda" or "cpu"
+        :type device: str
+        :param model_path: path to the TorchScript model, defaults to SEGMENTATION_MODEL_PATH
+        :type model_path: str, optional
+        :param input_shape: model input shape, defaults to (1, 3, *SEGMENTATION_INPUT_SIZE)
+        :type input_shape: tuple[int, int, int, int], optional
+        :param num_threads: number of threads used on CPU, defaults to SEGMENTATION_CPU_THREADS
+        :type num_threads: int, optional
+        """
+        super().__init__(device, input_shape)
+        self.model = torch.jit.load(model_path, map_location=device)
+        self.model.eval()
+        if device == "cpu":
+            torch.set_num_threads(num_threads)
+            self.model = self.model.to(memory_format=torch.channels_last)
+            self.model = torch.jit.optimize_for_inference(torch.jit.freeze(self.model))
+            self.input = self.input.contiguous(memory_format=torch.channels_last)
+
+    def forward(self, image : torch.Tensor) -> torch.Tensor:
+        with torch.inference_mode():
+            self.input.copy_(image)
+            return self.model(self.input)
+
+
+class OnnxBackend(InferenceBackend):
+    def __init__(self, model_path : str = SEGMENTATION_ONNX_MODEL_PATH,
+                 input_shape : tuple[int, int, int, int] = (1, 3, *SEGMENTATION_INPUT_SIZE),
+                 num_threads : int = SEGMENTATION_CPU_THREADS):
+        """Runs an ONNX model on CPU with ONNX Runtime (optional dependency)
+
+        :param model_path: path to the ONNX model, defaults to SEGMENTATION_ONNX_MODEL_PATH
+        :type model_path: str, optional
+        :param input_shape: model input shape, defaults to (1, 3, *SEGMENTATION_INPUT_SIZE)
+        :type input_shape: tuple[int, int, int, int], optional
+        :param num_threads: number of threads, defaults to SEGMENTATION_CPU_THREADS
+        :type num_threads: int, optional
+        """
+        # only needed by this backend
+        import onnxruntime
+
+        super().__init__("cpu", input_shape)
+        options = onnxruntime.SessionOptions()
+        options.intra_op_num_threads = num_threads
+        self.session = onnxruntime.InferenceSession(model_path, options, providers=["CPUExecutionProvider"])
+        self.input_name = self.session.get_inputs()[0].name
+        # the session reads directly from the input tensor memory
+        self.input_array : np.array = self.input.numpy()
+
+    def forward(self, image : torch.Tensor) -> torch.Tensor:
+        with torch.inference_mode():
+            self.input.copy_(image)
+        return torch.from_numpy(self.session.run(None, {self.input_name: self.input_array})[0])
+
+
+def create_inference_backend(name : str = SEGMENTATION_BACKEND) -> InferenceBackend:
+    """Create an inference backend by name
+
+    :param name: "auto" (CUDA if available, otherwise CPU), "cuda", "cpu" or "onnx", defaults to SEGMENTATION_BACKEND
+    :type name: str, optional
+    :raises ValueError: if the name is unknown
+    :return: the backend
+    :rtype: InferenceBackend
+    """
+    if name == "auto":
+        name = "cuda" if torch.cuda.is_available() else "cpu"
+    if name == "cuda" or name == "cpu":
+        return TorchScriptBackend(name)
+    if name == "onnx":
+        return OnnxBackend()
+    raise ValueError(f"Unknown inference backend {name}")
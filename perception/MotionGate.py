@@ -0,0 +1,71 @@
+import cv2
+import numpy as np
+
+from perception.constants import MOTION_GATE_THUMBNAIL_SIZE, MOTION_GATE_THRESHOLD, MOTION_GATE_MAX_SKIPPED
+
+
+class MotionGate:
+    def __init__(self, threshold : float = MOTION_GATE_THRESHOLD, max_skipped : int = MOTION_GATE_MAX_SKIPPED,
+                 thumbnail_size : tuple[int, int] = MOTION_GATE_THUMBNAIL_SIZE):
+        """Decides whether a frame changed enough since the last processed one to be worth processing. Frames are
+        compared as small grayscale thumbnails, always against the last processed frame so slow changes add up
+
+        :param threshold: mean absolute difference (in gray levels) below which a frame is considered unchanged, 
+        defaults to MOTION_GATE_THRESHOLD
+        :type threshold: float, optional
+        :param max_skipped: maximum number of frames skipped in a row, defaults to MOTION_GATE_MAX_SKIPPED
+        :type max_skipped: int, optional
+        :param thumbnail_size: thumbnail (height, width), defaults to MOTION_GATE_THUMBNAIL_SIZE
+        :type thumbnail_size: tuple[int, int], optional
+        """
+        self.threshold = threshold
+        self.max_skipped = max_skipped
+        self.thumbnail_size = thumbnail_size
+        self._reference : np.array = None
+        self._skipped = 0
+        # frames skipped, frames processed and frames processed only because too many were skipped in a row
+        self.hits = 0
+        self.misses = 0
+        self.forced = 0
+        self.latest_difference : float = None
+
+    def _thumbnail(self, frame : np.array) -> np.array:
+        small = cv2.resize(frame, (self.thumbnail_size[1], self.thumbnail_size[0]), interpolation=cv2.INTER_AREA)
+        return small.mean(axis=2, dtype=np.float32)
+
+    def should_skip(self, frame : np.array) -> bool:
+        """Check whether a frame can be skipped, if it can't, it becomes the new reference
+
+        :param frame: frame with shape (height, width, channels)
+        :type frame: np.array
+        :return: whether the frame barely changed since the last processed one
+        :rtype: bool
+        """
+        thumbnail = self._thumbnail(frame)
+        if self._reference is not None:
+            self.latest_difference = float(np.mean(np.abs(thumbnail - self._reference)))
+            if self.latest_difference < self.threshold:
+                if self._skipped < self.max_skipped:
+                    self._skipped += 1
+                    self.hits += 1
+                    return True
+                self.forced += 1
+        self._reference = thumbnail
+        self._skipped = 0
+        self.misses += 1
+        return False
+
+    def stats(self) -> dict[str, float]:
+        """Get the gate counters
+
+        :return: dict with hits, misses, forced, hit rate and the latest difference
+        :rtype: dict[str, float]
+        """
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "forced": self.forced,
+            "hit_rate": self.hits/total if total > 0 else 0.,
+            "latest_difference": self.latest_difference,
+        }
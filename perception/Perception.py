@@ -5,8 +5,9 @@ import numpy as np
 from PIL import Image
 from ultralytics import YOLO
 
-from perception.ImageObject import ImageObject
-from perception.constants import SCREEN_SIZE, SCREEN_POS
+from perception.ImageObject import ImageObject, DETECTION_DTYPE, detections_to_image_objects
+from perception.constants import SCREEN_SIZE, SCREEN_POS, MOTION_GATE_ENABLED
+from perception.MotionGate import MotionGate
 from perception.YoloIdConverter import yolo_id_converter
 from utility.utility import hide_huds_numpy, draw_annotations
 
@@ -15,14 +16,19 @@ mon = {"top": SCREEN_POS["top"], "left": SCREEN_POS["left"],
 
 
 class Perception:
-    def __init__(self, debug=False, queue=None, measure_time=False):
+    def __init__(self, debug=False, queue=None, measure_time=False, motion_gate=MOTION_GATE_ENABLED):
         self.model = YOLO("perception/darknet/best.pt")
         self.CONFIDENCE_THRESHOLD = .5
         self.NMS_THRESHOLD = .7
         # net.setPreferableBackend(cv2.dnn.DNN_BACKEND_CUDA)
         # net.setPreferableTarget(cv2.dnn.DNN_TARGET_CUDA)
         self.sct = mss.mss()
-        self.objects = []
+        # detections of the latest frame (DETECTION_DTYPE), ImageObjects are only created if objects is used
+        self.detections : np.array = np.empty(0, dtype=DETECTION_DTYPE)
+        # latest YOLO results (classes, scores, boxes), reused while the frames barely change
+        self._latest_results : tuple[np.array, np.array, np.array] = None
+        # frames coming from the shared frame buffer are read-only, so hiding the HUDs is done on this copy
+        self._frame_copy : np.array = None
         self.debug = debug
         if self.debug:
             self.queue = queue
@@ -35,6 +41,8 @@ class Perception:
         frame = np.asarray(frame)
         self.process_frame(frame)
         self.process_frame(frame)
+        # created after warming up so the warm up frames aren't counted
+        self.motion_gate = MotionGate() if motion_gate else None
 
     def get_screenshot(self):
         img = np.asarray(self.sct.grab(mon)) # this is in BGRA
@@ -42,12 +50,17 @@ class Perception:
         # no_alpha_img = no_alpha_img[:, :, ::-1]
         return no_alpha_img # this is in RGB
 
-    def process_frame(self, frame : np.array):
+    @property
+    def objects(self) -> list[ImageObject]:
+        return detections_to_image_objects(self.detections)
+
+    def process_frame(self, frame : np.array) -> tuple[np.array, np.array, np.array]:
         # box is (x, y, l, h)
         result = self.model.predict(frame, conf=self.CONFIDENCE_THRESHOLD, iou=self.NMS_THRESHOLD, verbose=False)[0].boxes
-        classes = [int(res.cls) for res in result]
-        scores = [res.conf.item() for res in result]
-        boxes = [res.xywh.cpu().numpy().astype(int)[0] for res in result]
+        # each column is copied to the host at once instead of once per box
+        classes = result.cls.cpu().numpy().astype(int)
+        scores = result.conf.cpu().numpy()
+        boxes = result.xywh.cpu().numpy().astype(int)
             
         return classes, scores, boxes
 
@@ -57,6 +70,11 @@ class Perception:
 
         if frame is None:
             frame = self.get_screenshot() # takes like 30 ms avg
+        elif not frame.flags.writeable:
+            if self._frame_copy is None or self._frame_copy.shape != frame.shape:
+                self._frame_copy = np.empty_like(frame)
+            np.copyto(self._frame_copy, frame)
+            frame = self._frame_copy
 
         if self.measure_time:
             t2 = time.time_ns()
@@ -66,16 +84,26 @@ class Perception:
         if self.measure_time:
             t3 = time.time_ns()
             
-        classes, scores, boxes = self.process_frame(frame) # takes like 50 ms avg
+        # if the frame barely changed, the previous detections are still valid
+        skipped = self.motion_gate is not None and self.motion_gate.should_skip(frame)
+        if skipped:
+            classes, scores, boxes = self._latest_results
+        else:
+            classes, scores, boxes = self.process_frame(frame) # takes like 50 ms avg
+            self._latest_results = (classes, scores, boxes)
 
         if self.measure_time:
             t4 = time.time_ns()
             
-        new_classes = [yolo_id_converter.yolo_to_actual_id(id_) for id_ in classes]
-        self.objects = []
-        for class_id, score, box in zip(new_classes, scores, boxes):
-            obj = ImageObject(class_id, score, box)
-            self.objects.append(obj)
+        if not skipped:
+            detections = np.empty(len(classes), dtype=DETECTION_DTYPE)
+            detections["class"] = yolo_id_converter.yolo_to_actual_ids(classes)
+            detections["score"] = scores
+            detections["x"] = boxes[:, 0]
+            detections["y"] = boxes[:, 1]
+            detections["w"] = boxes[:, 2]
+            detections["h"] = boxes[:, 3]
+            self.detections = detections
 
         if self.measure_time:
             t5 = time.time_ns()
@@ -90,7 +118,7 @@ class Perception:
             t6 = time.time_ns()
             self.time_records.append([t2-t1, t3-t2, t4-t3, t5-t4, t6-t5])
             
-        return self.objects, classes, scores, boxes
+        return self.detections, classes, scores, boxes
 
 class PerceptionRecorder(Perception):
     def __init__(self, debug=False, queue=None):
@@ -0,0 +1,49 @@
+import time
+
+import mss
+import numpy as np
+
+from perception.constants import SCREEN_SIZE, SCREEN_POS
+from perception.FrameRingBuffer import FrameRingBuffer
+
+mon = {"top": SCREEN_POS["top"], "left": SCREEN_POS["left"],
+       "width": SCREEN_SIZE["width"], "height": SCREEN_SIZE["height"]}
+
+
+class ScreenCapture:
+    def __init__(self, frame_buffer : FrameRingBuffer, measure_time=False):
+        """Grabs the screen once per frame and publishes it to the shared frame buffer, so that Perception and
+        SegmentationModel work on the same frame instead of each one taking its own screenshot
+
+        :param frame_buffer: buffer to publish frames to
+        :type frame_buffer: FrameRingBuffer
+        """
+        self.sct = mss.mss()
+        self.frame_buffer = frame_buffer
+        self.measure_time = measure_time
+        if self.measure_time:
+            self.time_records = []
+            self.split_names = ["screenshot", "publish"]
+
+    def capture(self) -> int:
+        """Grab a frame and publish it
+
+        :return: id of the published frame
+        :rtype: int
+        """
+        if self.measure_time:
+            t1 = time.time_ns()
+
+        timestamp = time.time()
+        img = np.asarray(self.sct.grab(mon)) # this is in BGRA, the buffer drops the alpha channel
+
+        if self.measure_time:
+            t2 = time.time_ns()
+
+        frame_id = self.frame_buffer.publish(img, timestamp)
+
+        if self.measure_time:
+            t3 = time.time_ns()
+            self.time_records.append([t2-t1, t3-t2])
+
+        return frame_id
@@ -4,17 +4,17 @@ import mss
 import numpy as np
 import torch
 
-from perception.constants import SCREEN_SIZE, SCREEN_POS, SEGMENTATION_INPUT_SIZE
+from perception.constants import SCREEN_SIZE, SCREEN_POS, SEGMENTATION_INPUT_SIZE, SEGMENTATION_BACKEND
+from perception.InferenceBackend import create_inference_backend
+from utility.utility import resize_and_normalize
 
 mon = {"top": SCREEN_POS["top"], "left": SCREEN_POS["left"],
        "width": SCREEN_SIZE["width"], "height": SCREEN_SIZE["height"]}
 
 
 class SegmentationModel:
-    def __init__(self, debug=False, queue=None, measure_time=False):
-        self.model = torch.jit.load("perception/segmentation/model_scripted.pt")
-        self.model.to("cuda")
-        self.model.eval()
+    def __init__(self, debug=False, queue=None, measure_time=False, backend=SEGMENTATION_BACKEND):
+        self.backend = create_inference_backend(backend)
         self.CONFIDENCE_THRESHOLD = .5
         self.sct = mss.mss()
         self.debug = debug
@@ -28,18 +28,22 @@ class SegmentationModel:
 
         self.mean = np.array([0.485, 0.456, 0.406])
         self.std = np.array([0.229, 0.224, 0.225])
-        self.input_range = [0, 1]
+        # preprocessed frames are written here, so no new arrays are allocated for each frame
+        self.input_buffer = np.empty((*SEGMENTATION_INPUT_SIZE, 3), dtype=np.float32)
         frame = self.get_screenshot()
         self.process_frame(frame)
         self.process_frame(frame)
 
-    def preprocess_input(self, x):
-        if x.max() > 1 and self.input_range[1] == 1:
-            x = x / 255.0
-        x = x - self.mean
-        x = x / self.std
+    def preprocess_input(self, frame : np.array) -> torch.Tensor:
+        """Resize the frame to the model input size and normalize it
 
-        return x
+        :param frame: RGB uint8 frame
+        :type frame: np.array
+        :return: tensor with shape (1, 3, height, width), a view of self.input_buffer
+        :rtype: torch.Tensor
+        """
+        resize_and_normalize(frame, SEGMENTATION_INPUT_SIZE, self.mean, self.std, out=self.input_buffer)
+        return torch.from_numpy(self.input_buffer).permute(2, 0, 1).unsqueeze(0)
 
     def get_screenshot(self):
         img = np.asarray(self.sct.grab(mon)) # this is in BGRA
@@ -47,20 +51,22 @@ class SegmentationModel:
         no_alpha_img = no_alpha_img[:, :, ::-1]
         return no_alpha_img # this is in RGB
 
-    def process_frame(self, frame : np.array):
-        with torch.no_grad():
-            frame = self.preprocess_input(frame)
-            frame = np.transpose(frame, (2, 0, 1))
-            image = torch.from_numpy(frame.copy()).unsqueeze(0)
-            image = torch.nn.functional.interpolate(image, SEGMENTATION_INPUT_SIZE).to("cuda")
-            image = image.float()
-            result = self.model.forward(image)
-        prediction = result.squeeze().cpu().numpy().round()
-        prediction = np.transpose(prediction, axes=(1, 2, 0))
-        prediction = prediction > self.CONFIDENCE_THRESHOLD
-        prediction = prediction.argmax(axis=2)
-        
-        return prediction
+    def process_frame(self, frame : np.array) -> np.array:
+        """Segment a frame, the mask is computed on the inference device and only it is copied back
+
+        :param frame: RGB uint8 frame
+        :type frame: np.array
+        :return: uint8 mask with shape SEGMENTATION_INPUT_SIZE with the class of each pixel, the first class above the
+        confidence threshold or 0 if there's none
+        :rtype: np.array
+        """
+        with torch.inference_mode():
+            image = self.preprocess_input(frame)
+            result = self.backend.forward(image)
+            # argmax returns the first maximum, so this is the first class above the threshold (or 0)
+            above_threshold = (torch.round(result[0]) > self.CONFIDENCE_THRESHOLD).to(torch.uint8)
+            mask = torch.argmax(above_threshold, dim=0).to(torch.uint8)
+            return mask.cpu().numpy()
 
     def perceive(self, frame : np.array = None) -> np.array:
         if self.measure_time:
@@ -91,9 +97,9 @@ class SegmentationModel:
         return prediction
 
 class SegmentationRecorder(SegmentationModel):
-    def __init__(self, debug=False, queue=None):
+    def __init__(self, debug=False, queue=None, backend=SEGMENTATION_BACKEND):
         self.all_captured_images : list[np.array] = []
-        super().__init__(debug, queue)
+        super().__init__(debug, queue, backend=backend)
 
     def get_screenshot(self):
         ans = super().get_screenshot()
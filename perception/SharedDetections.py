@@ -0,0 +1,33 @@
+import numpy as np
+
+from perception.constants import MAX_DETECTIONS, SHARED_RESULTS_SLOTS
+from perception.ImageObject import ImageObject, DETECTION_DTYPE, image_objects_to_detections
+from utility.SharedRingBuffer import SharedRingBuffer
+
+
+class SharedDetections(SharedRingBuffer):
+    def __init__(self, capacity : int = MAX_DETECTIONS, slots : int = SHARED_RESULTS_SLOTS):
+        """Shared memory transport for YOLO detections, each published result is a fixed capacity structured array 
+        (DETECTION_DTYPE) so nothing has to be pickled between Perception and Modeling
+
+        :param capacity: maximum number of detections per frame, defaults to MAX_DETECTIONS
+        :type capacity: int, optional
+        :param slots: number of results kept, defaults to SHARED_RESULTS_SLOTS
+        :type slots: int, optional
+        """
+        super().__init__(slots, (capacity,), DETECTION_DTYPE)
+        self.capacity = capacity
+
+    def publish(self, detections : np.ndarray | list[ImageObject], timestamp : float) -> int:
+        """Publish the detections of a frame, anything beyond the capacity is dropped
+
+        :param detections: structured array with DETECTION_DTYPE or list of ImageObject
+        :type detections: np.ndarray | list[ImageObject]
+        :param timestamp: timestamp of the frame in which the objects were detected
+        :type timestamp: float
+        :return: id of the published result
+        :rtype: int
+        """
+        if not isinstance(detections, np.ndarray):
+            detections = image_objects_to_detections(detections)
+        return super().publish(detections[:self.capacity], timestamp)
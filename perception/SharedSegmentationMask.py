@@ -0,0 +1,30 @@
+import numpy as np
+
+from perception.constants import SEGMENTATION_INPUT_SIZE, SHARED_RESULTS_SLOTS
+from utility.SharedRingBuffer import SharedRingBuffer
+
+
+class SharedSegmentationMask(SharedRingBuffer):
+    def __init__(self, mask_shape : tuple[int, int] = SEGMENTATION_INPUT_SIZE, slots : int = SHARED_RESULTS_SLOTS):
+        """Shared memory transport for segmentation masks, masks are stored as uint8 class ids in preallocated slots
+
+        :param mask_shape: mask shape, defaults to SEGMENTATION_INPUT_SIZE
+        :type mask_shape: tuple[int, int], optional
+        :param slots: number of masks kept, defaults to SHARED_RESULTS_SLOTS
+        :type slots: int, optional
+        """
+        super().__init__(slots, mask_shape, np.uint8)
+
+    def publish(self, mask : np.array, timestamp : float) -> int:
+        """Publish a segmentation mask, class ids are converted to uint8 while being written
+
+        :param mask: mask with the class id of each pixel
+        :type mask: np.array
+        :param timestamp: timestamp of the segmented frame
+        :type timestamp: float
+        :return: id of the published mask
+        :rtype: int
+        """
+        slot_array, mask_id = self._begin_write()
+        np.copyto(slot_array, mask, casting="unsafe")
+        return self._finish_write(mask_id, timestamp, len(slot_array))
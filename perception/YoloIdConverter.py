@@ -1,3 +1,5 @@
+import numpy as np
+
 from perception.classes import get_class_names
 
 class YoloIdConverter:
@@ -47,6 +49,8 @@ class YoloIdConverter:
         }
         # can be used to convert yolo_id to image_id
         self.important_classes = [self.yolo_names_to_image_id[n] for n in get_class_names()]
+        # the same as an array, to convert many ids at once
+        self._important_classes_array = np.array(self.important_classes, dtype=np.int32)
         
         # can be used to convert image_id to yolo_id
         self.reverse_important_classes = {}
@@ -63,6 +67,16 @@ class YoloIdConverter:
         """
         return self.important_classes[yolo_id]
 
+    def yolo_to_actual_ids(self, yolo_ids : np.array) -> np.array:
+        """Converts many YOLO ids to the ids used in perception (image_id)
+
+        :param yolo_ids: YOLO ids
+        :type yolo_ids: np.array
+        :return: image_ids
+        :rtype: np.array
+        """
+        return self._important_classes_array[np.asarray(yolo_ids, dtype=np.int64)]
+
     def actual_to_yolo_id(self, actual_id : int) -> int:
         """Converts the id used in perception (image_id) to the YOLO id
 
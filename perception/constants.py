@@ -8,4 +8,28 @@ SCREEN_POS = {
     "left": 0
 }
 
-SEGMENTATION_INPUT_SIZE = (512, 512)
\ No newline at end of file
+SEGMENTATION_INPUT_SIZE = (512, 512)
+
+# number of frames kept by the shared screen capture ring buffer, consumers can use a frame
+# until the capture process wraps around and overwrites its slot
+FRAME_RING_BUFFER_SLOTS = 4
+
+# capacity of the shared detections buffer (YOLO's default max_det is 300)
+MAX_DETECTIONS = 300
+# number of results kept by the shared detections and segmentation buffers
+SHARED_RESULTS_SLOTS = 3
+
+# backend used by SegmentationModel: "auto" (CUDA if available, otherwise CPU), "cuda", "cpu" or "onnx"
+SEGMENTATION_BACKEND = "auto"
+SEGMENTATION_MODEL_PATH = "perception/segmentation/model_scripted.pt"
+SEGMENTATION_ONNX_MODEL_PATH = "perception/segmentation/model.onnx"
+# number of threads used by the CPU backends, the other processes also need CPU time
+SEGMENTATION_CPU_THREADS = 4
+
+# Perception reuses the previous detections while frames barely change: frames are compared as grayscale thumbnails
+# (height, width), and a frame is considered unchanged if the mean absolute difference is below the threshold (in gray
+# levels). A full pass is forced after MOTION_GATE_MAX_SKIPPED skipped frames in a row
+MOTION_GATE_ENABLED = True
+MOTION_GATE_THUMBNAIL_SIZE = (36, 64)
+MOTION_GATE_THRESHOLD = 2.
+MOTION_GATE_MAX_SKIPPED = 10
@@ -1,5 +1,5 @@
 import time
-from multiprocessing import Process, Queue, Value
+from multiprocessing import Process, Queue
 import os
 
 import keyboard
@@ -11,82 +11,81 @@ from decisionMaking.DecisionMaking import DecisionMaking
 from modeling.Modeling import ModelingRecorder
 from perception.Perception import PerceptionRecorder
 from perception.SegmentationModel import SegmentationRecorder
+from perception.SharedDetections import SharedDetections
+from perception.SharedSegmentationMask import SharedSegmentationMask
 from utility.DebugScreen import DebugScreen
 from utility.Clock import ClockRecorder
+from utility.Lifecycle import Lifecycle
 from utility.Point2d import Point2d
 
 MAX_TIMEOUT_TIME = 600
+# how long control waits for the first detections before checking whether it should stop
+NEW_DATA_WAIT_TIMEOUT = 0.1
+# how often the debug screen is refreshed while the main process waits for the stop
+DEBUG_SCREEN_REFRESH_INTERVAL = 1/30
 
-def vision_main_recorder(detected_objects_queue: Queue, should_start: Value, should_stop: Value, 
+def vision_main_recorder(shared_detections: SharedDetections, lifecycle: Lifecycle, 
                          trajectory_name: str, folder_name : str, q: Queue = None):
     perception = PerceptionRecorder(debug=q is not None, queue=q)
     vision_timestamps = []
     print("Vision ready")
-    while should_start.value == 0:
-        pass
+    lifecycle.ready()
+    lifecycle.wait_for_start()
     start = time.time()
-    while should_stop.value == 0 and time.time() - start < MAX_TIMEOUT_TIME:
+    while not lifecycle.should_stop() and time.time() - start < MAX_TIMEOUT_TIME:
         timestamp = time.time()
         vision_timestamps.append(timestamp)
-        objects = perception.perceive()[0]
-        try:
-            detected_objects_queue.put((objects, timestamp))
-        except ValueError:
-            print("detected_objects_queue closed")
+        detections = perception.perceive()[0]
+        shared_detections.publish(detections, timestamp)
     np.save(f"{folder_name}/{trajectory_name}_vision_times.npy", vision_timestamps, allow_pickle=False)
     for i, cap_img in enumerate(perception.all_captured_images):
         np.save(f"{folder_name}/vision_{i}.npy", cap_img, allow_pickle=False)
 
-    detected_objects_queue.cancel_join_thread()
     if q is not None:
         q.cancel_join_thread()
     print("Vision done")
     
 
-def segmentation_main_recorder(segmentation_results_queue: Queue, should_start: Value, should_stop: Value, 
+def segmentation_main_recorder(shared_segmentation_mask: SharedSegmentationMask, lifecycle: Lifecycle, 
                                trajectory_name : str, folder_name: str, q: Queue = None):
     seg_model = SegmentationRecorder(debug=q is not None, queue=q)
     seg_timestamps = []
     print("Segmentation ready")
-    while should_start.value == 0:
-        pass
+    lifecycle.ready()
+    lifecycle.wait_for_start()
     start = time.time()
-    while should_stop.value == 0 and time.time() - start < MAX_TIMEOUT_TIME:
+    while not lifecycle.should_stop() and time.time() - start < MAX_TIMEOUT_TIME:
         timestamp = time.time()
         seg_timestamps.append(timestamp)
         results = seg_model.perceive()
-        try:
-            segmentation_results_queue.put((results, timestamp))
-        except ValueError:
-            print("segmentation_results_queue closed")
+        shared_segmentation_mask.publish(results, timestamp)
     np.save(f"{folder_name}/{trajectory_name}_segmentation_times.npy", seg_timestamps, allow_pickle=False)
     for i, cap_img in enumerate(seg_model.all_captured_images):
         np.save(f"{folder_name}/segmentation_{i}.npy", cap_img, allow_pickle=False)
 
-    segmentation_results_queue.cancel_join_thread()
     if q is not None:
         q.cancel_join_thread()
     print("Segmentation done")
 
-def control_main_recorder(detected_objects_queue: Queue, segmentation_queue: Queue, should_start: Value, 
-                          should_stop: Value, trajectory_name: str, folder_name : str, trajectory: dict[str, list[Point2d]], q: Queue = None):
+def control_main_recorder(shared_detections: SharedDetections, shared_segmentation_mask: SharedSegmentationMask, 
+                          lifecycle: Lifecycle, trajectory_name: str, folder_name : str, trajectory: dict[str, list[Point2d]], q: Queue = None):
     clock = ClockRecorder()
     action = Action(debug=q is not None)
     control = Control(debug=q is not None)
     decision_making = DecisionMaking(debug=q is not None)
     modeling = ModelingRecorder(debug=q is not None, clock=clock) # we want to record modeling's clock times to be able to reproduce them later
     print("Control ready")
-    while should_start.value == 0:
-        pass
+    lifecycle.ready()
+    lifecycle.wait_for_start()
     start = time.time()
     clock.start()
     # wait for YOLO to initialize, only start doing stuff after we receive information
-    while detected_objects_queue.empty():
+    while shared_detections.wait_for_newer(-1, NEW_DATA_WAIT_TIMEOUT) < 0 and not lifecycle.should_stop():
         pass
     i = 0
     idle_start = None
-    while should_stop.value == 0 and time.time() - start < MAX_TIMEOUT_TIME:
-        q1 = modeling.update_model(detected_objects_queue, segmentation_queue)
+    while not lifecycle.should_stop() and time.time() - start < MAX_TIMEOUT_TIME:
+        q1 = modeling.update_model(shared_detections, shared_segmentation_mask)
         q2 = decision_making.decide(modeling)
         decision_making.secondary_action = ("go_precisely_to", trajectory[i])
         q2 = (decision_making.primary_action, decision_making.secondary_action)
@@ -105,7 +104,7 @@ def control_main_recorder(detected_objects_queue: Queue, segmentation_queue: Que
             except ValueError:
                 print("control debug_queue closed")
         if i >= len(trajectory):
-            should_stop.value = 1
+            lifecycle.stop()
             print("Stopping")
             break
     np.save(f"{folder_name}/{trajectory_name}_modeling_clock_times.npy", clock.time_records, allow_pickle=False)
@@ -114,8 +113,6 @@ def control_main_recorder(detected_objects_queue: Queue, segmentation_queue: Que
     np.save(f"{folder_name}/{trajectory_name}_modeling_direction_changes_timestamps.npy", 
             modeling.player_model.all_direction_changes_timestamps, allow_pickle=False)
     
-    detected_objects_queue.cancel_join_thread()
-    segmentation_queue.cancel_join_thread()
     if q is not None:
         q.cancel_join_thread()
     print("Control done")
@@ -153,62 +150,57 @@ if __name__ == "__main__":
     os.makedirs(folder_name)
     debug = True
     if debug:
-        should_start = Value('b', 0)
-        should_stop = Value('b', 0)
-        detected_objects_queue = Queue()
-        segmentation_queue = Queue()
+        lifecycle = Lifecycle(processes=3)
+        shared_detections = SharedDetections()
+        shared_segmentation_mask = SharedSegmentationMask()
         debug_screen = DebugScreen()
         vision_process = Process(target=vision_main_recorder, 
-                                 args=(detected_objects_queue, should_start, should_stop, 
+                                 args=(shared_detections, lifecycle, 
                                        trajectory_choice, folder_name, debug_screen.vision_debug_queue))
         vision_process.start()
         segmentation_process = Process(target=segmentation_main_recorder, 
-                                       args=(segmentation_queue, should_start, should_stop, 
+                                       args=(shared_segmentation_mask, lifecycle, 
                                              trajectory_choice, folder_name, debug_screen.segmentation_debug_queue))
         segmentation_process.start()
         control_process = Process(target=control_main_recorder, 
-                                  args=(detected_objects_queue, segmentation_queue, should_start, should_stop, 
+                                  args=(shared_detections, shared_segmentation_mask, lifecycle, 
                                         trajectory_choice, folder_name, trajectory, debug_screen.control_debug_queue))
         control_process.start()
+        keyboard.add_hotkey("p", lifecycle.start)
+        keyboard.add_hotkey("l", lifecycle.stop)
         start = time.time()
-        while time.time() - start < MAX_TIMEOUT_TIME and should_stop.value == 0:
-            if keyboard.is_pressed("p"):
-                should_start.value = 1
-            elif keyboard.is_pressed("l"):
-                should_stop.value = 1
+        started = False
+        while time.time() - start < MAX_TIMEOUT_TIME and not lifecycle.wait_for_stop(DEBUG_SCREEN_REFRESH_INTERVAL):
+            if not started and lifecycle.is_started():
+                started = True
+                start = time.time()
             debug_screen.update()
-        should_stop.value = 1
+        lifecycle.stop()
         debug_screen.close()
-        detected_objects_queue.close()
-        segmentation_queue.close()
     else:
-        should_start = Value('b', 0)
-        should_stop = Value('b', 0)
-        detected_objects_queue = Queue()
-        segmentation_queue = Queue()
-        vision_process = Process(target=vision_main_recorder, args=(detected_objects_queue, should_start, should_stop, 
+        lifecycle = Lifecycle(processes=3)
+        shared_detections = SharedDetections()
+        shared_segmentation_mask = SharedSegmentationMask()
+        vision_process = Process(target=vision_main_recorder, args=(shared_detections, lifecycle, 
                                                                     trajectory_choice, folder_name))
         vision_process.start()
         segmentation_process = Process(target=segmentation_main_recorder, 
-                                       args=(segmentation_queue, should_start, should_stop, 
+                                       args=(shared_segmentation_mask, lifecycle, 
                                              trajectory_choice, folder_name))
         segmentation_process.start()
-        control_process = Process(target=control_main_recorder, args=(detected_objects_queue, segmentation_queue, should_start, should_stop, 
+        control_process = Process(target=control_main_recorder, args=(shared_detections, shared_segmentation_mask, lifecycle, 
                                                                       trajectory_choice, folder_name, trajectory))
         control_process.start()
-        start = time.time()
-        while time.time() - start < MAX_TIMEOUT_TIME and should_stop.value == 0:
-            if keyboard.is_pressed("p"):
-                should_start.value = 1
-            elif keyboard.is_pressed("l"):
-                should_stop.value = 1
-        should_stop.value = 1
-        detected_objects_queue.close()
-        segmentation_queue.close()
+        keyboard.add_hotkey("p", lifecycle.start)
+        keyboard.add_hotkey("l", lifecycle.stop)
+        lifecycle.wait_for_stop(MAX_TIMEOUT_TIME)
+        lifecycle.stop()
 
     vision_process.join()
     segmentation_process.join()
     control_process.join()
+    shared_detections.close()
+    shared_segmentation_mask.close()
 
 
 # import time
@@ -268,7 +260,8 @@ if __name__ == "__main__":
 #     orders = []
 #     # press p again to end the program
 #     while not keyboard.is_pressed("p"):
-#         objects = perception.perceive()[0]
+#         perception.perceive()
+#         objects = perception.objects
 #         modeling.update_model(objects)
 #         decision_making.decide(modeling)
 #         cur_time = time.time() - start_time
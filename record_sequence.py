@@ -27,7 +27,8 @@ if __name__ == '__main__':
     orders = []
     # press p again to end the program
     while not keyboard.is_pressed("p"):
-        objects = perception.perceive()[0]
+        perception.perceive()
+        objects = perception.objects
         modeling.update_model(objects)
         decision_making.decide(modeling)
         orders.append(decision_making.secondary_action)
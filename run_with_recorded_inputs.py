@@ -6,6 +6,7 @@ import numpy as np
 import pandas as pd
 
 from modeling.Modeling import Modeling
+from perception.ImageObject import detections_to_image_objects
 from perception.Perception import Perception
 from perception.SegmentationModel import SegmentationModel
 from utility.Clock import ClockMock
@@ -59,7 +60,8 @@ if __name__ == "__main__":
         if has_new_vision_image:
             vision_timestamp = vision_timestamps[vision_index]
             vision_screenshot = np.load(f"{folder_name}/vision_{vision_index}.npy")
-            detected_objects, classes, scores, boxes = perception.perceive(vision_screenshot)
+            detections, classes, scores, boxes = perception.perceive(vision_screenshot)
+            detected_objects = detections_to_image_objects(detections)
             vis_screen.update_yolo_image(vision_screenshot)
             vis_screen.draw_detected_objects(classes, scores, boxes)
         else:
@@ -102,7 +104,7 @@ if __name__ == "__main__":
             vis_screen.redraw_world_model_image()
 
         vis_screen.update_world_model(modeling)
-        vis_screen.draw_estimation_errors(modeling.world_model.estimation_errors)
+        vis_screen.draw_estimation_errors(modeling.world_model.drift_estimator.errors())
         vis_screen.draw_time(clock.time())
         vis_screen.export_results(f"{folder_name}/output/{clock.current_time_index - 2}.jpg")
 
@@ -174,12 +176,13 @@ if __name__ == "__main__":
 #     for file, order in zip(sorted_files, orders):
 #         with Image.open(file) as raw_image:
 #             img = np.asarray(raw_image)
-#             objects, classes, scores, boxes = perception.perceive(np.asarray(img))
+#             _, classes, scores, boxes = perception.perceive(np.asarray(img))
+#             objects = perception.objects
 #             vis_screen.update_image(img[:, :, ::-1])
 #             vis_screen.draw_detected_objects(classes, scores, boxes)
 #             modeling.update_model(objects)
 #             vis_screen.update_world_model(modeling)
-#             vis_screen.draw_estimation_errors(modeling.world_model.estimation_errors)
+#             vis_screen.draw_estimation_errors(modeling.world_model.drift_estimator.errors())
 #             decision_making.decide(modeling)
 #             decision_making.secondary_action = order
 #             control.control(decision_making, modeling)
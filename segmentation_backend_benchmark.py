@@ -0,0 +1,50 @@
+import glob
+import time
+
+import numpy as np
+
+from perception.SegmentationModel import SegmentationModel
+
+# recorded frames used in the benchmark (see run_with_recorded_inputs.py)
+FOLDER_NAME = "records/trajectory_2__1"
+BACKENDS = ["cuda", "cpu", "onnx"]
+# maximum number of recorded frames used
+N_FRAMES = 50
+
+
+def benchmark_backend(backend : str, frames : list[np.array]) -> tuple[list[float], list[np.array]]:
+    """Segment the frames with a backend
+
+    :param backend: backend name (see create_inference_backend)
+    :type backend: str
+    :param frames: RGB frames
+    :type frames: list[np.array]
+    :return: time in seconds to process each frame and the predictions
+    :rtype: tuple[list[float], list[np.array]]
+    """
+    seg_model = SegmentationModel(backend=backend)
+    times = []
+    predictions = []
+    for frame in frames:
+        start = time.perf_counter()
+        predictions.append(seg_model.process_frame(frame))
+        times.append(time.perf_counter() - start)
+    return times, predictions
+
+
+if __name__ == "__main__":
+    frame_files = sorted(glob.glob(f"{FOLDER_NAME}/segmentation_*.npy"))[:N_FRAMES]
+    assert len(frame_files) > 0, f"no recorded frames in {FOLDER_NAME}"
+    frames = [np.load(f) for f in frame_files]
+    reference = None
+    for backend in BACKENDS:
+        try:
+            times, predictions = benchmark_backend(backend, frames)
+        except Exception as e:
+            print(f"{backend}: unavailable ({e})")
+            continue
+        if reference is None:
+            reference = predictions
+        agreement = np.mean([np.mean(p == r) for p, r in zip(predictions, reference)])
+        print(f"{backend}: {np.mean(times)*1e3:.1f} ms avg, {np.percentile(times, 95)*1e3:.1f} ms p95, "
+              f"{agreement*100:.2f}% of pixels agree with the first backend")
@@ -1,31 +1,33 @@
 import time
-from multiprocessing import Process, Queue, Value
+from multiprocessing import Process, Queue
 
 import keyboard
 
 from perception.SegmentationModel import SegmentationModel
+from utility.Lifecycle import Lifecycle
 from utility.SegmentationVisualizer import SegmentationVisualizer
 
+# how often the visualizer is refreshed while the main process waits for the stop
+VISUALIZER_REFRESH_INTERVAL = 1/30
 
-def segmentation_main(should_start: Value, should_stop: Value, q: Queue = None):
+
+def segmentation_main(lifecycle: Lifecycle, q: Queue = None):
     seg_model = SegmentationModel(debug=q is not None, queue=q)
-    while should_start.value == 0:
-        pass
+    lifecycle.ready()
+    lifecycle.wait_for_start()
     start = time.time()
-    while should_stop.value == 0 and time.time() - start < 180:
+    while not lifecycle.should_stop() and time.time() - start < 180:
         seg_model.perceive()
 
 if __name__ == "__main__":
-    should_start = Value('b', 0)
-    should_stop = Value('b', 0)
+    lifecycle = Lifecycle(processes=1)
     vis_screen = SegmentationVisualizer()
     segmentation_process = Process(target=segmentation_main, 
-                                    args=(should_start, should_stop, vis_screen.segmentation_debug_queue))
+                                    args=(lifecycle, vis_screen.segmentation_debug_queue))
     segmentation_process.start()
+    keyboard.add_hotkey("p", lifecycle.start)
+    keyboard.add_hotkey("l", lifecycle.stop)
     start = time.time()
-    while time.time() - start < 180:
-        if keyboard.is_pressed("p"):
-            should_start.value = 1
-        elif keyboard.is_pressed("l"):
-            should_stop.value = 1
+    while time.time() - start < 180 and not lifecycle.wait_for_stop(VISUALIZER_REFRESH_INTERVAL):
         vis_screen.update()
+    lifecycle.stop()
@@ -1,8 +1,19 @@
 from modeling.Factory import factory
 from modeling.Modeling import Modeling
+from modeling.ObjectsInfo import objects_info
 from utility.Point2d import Point2d
 
 def test_create_object():
     modeling = Modeling()
     for image_id in range(1, 186+1):
-        factory.create_object(image_id, Point2d(0, 0), Point2d(0, 0), modeling.world_model.scheduler)
\ No newline at end of file
+        factory.create_object(image_id, Point2d(0, 0), Point2d(0, 0), modeling.world_model.scheduler)
+
+def test_factory_covers_objects_info():
+    modeling = Modeling()
+    assert factory.uncovered_image_ids() == []
+    for image_id in objects_info.all_image_ids():
+        object_type = objects_info.object_type_from_image_id(image_id)
+        obj = factory.create_object(image_id, Point2d(0, 0), Point2d(0, 0), modeling.world_model.scheduler)
+        mob = factory.create_mob(image_id, Point2d(0, 0), Point2d(0, 0))
+        assert (obj is not None) == (object_type == "OBJECT")
+        assert (mob is not None) == (object_type == "MOB")
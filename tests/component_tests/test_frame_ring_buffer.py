@@ -0,0 +1,39 @@
+import pickle
+
+import numpy as np
+
+from perception.FrameRingBuffer import FrameRingBuffer
+
+def test_frame_ring_buffer():
+    frame_buffer = FrameRingBuffer(slots=3, frame_shape=(4, 6, 3))
+    try:
+        frame, frame_id, timestamp = frame_buffer.read_latest()
+        assert frame is None and frame_id == -1 and timestamp is None
+
+        # mss frames are BGRA, the alpha channel should be dropped
+        bgra = np.arange(4*6*4, dtype=np.uint8).reshape((4, 6, 4))
+        assert frame_buffer.publish(bgra, 10.0) == 0
+        frame, frame_id, timestamp = frame_buffer.read_latest()
+        assert frame_id == 0 and timestamp == 10.0
+        assert np.array_equal(frame, bgra[:, :, :3])
+        assert not frame.flags.writeable
+        assert frame_buffer.read_newer_than(0)[0] is None
+
+        for i in range(1, 4):
+            frame_buffer.publish(np.full((4, 6, 4), i, dtype=np.uint8), 10.0 + i)
+        frame, frame_id, timestamp = frame_buffer.read_newer_than(0)
+        assert frame_id == 3 and timestamp == 13.0
+        assert (frame == 3).all()
+        # frame 0 was overwritten by frame 3, but 1 and 2 are still there
+        assert not frame_buffer.is_valid(0)
+        assert frame_buffer.is_valid(1) and frame_buffer.is_valid(2) and frame_buffer.is_valid(3)
+
+        # another process attaches to the same memory instead of getting a copy
+        attached = pickle.loads(pickle.dumps(frame_buffer))
+        frame_buffer.publish(np.full((4, 6, 4), 7, dtype=np.uint8), 20.0)
+        frame, frame_id, timestamp = attached.read_latest()
+        assert frame_id == 4 and timestamp == 20.0
+        assert (frame == 7).all()
+        attached.close()
+    finally:
+        frame_buffer.close()
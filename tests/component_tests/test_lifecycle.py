@@ -0,0 +1,44 @@
+import threading
+import time
+
+from utility.Lifecycle import Lifecycle
+
+def test_lifecycle():
+    lifecycle = Lifecycle(processes=2)
+    started = []
+    def worker():
+        lifecycle.ready()
+        started.append(lifecycle.wait_for_start())
+        lifecycle.wait_for_stop()
+
+    workers = [threading.Thread(target=worker) for _ in range(2)]
+    for w in workers:
+        w.start()
+    assert not lifecycle.wait_for_start(timeout=0.01)
+    assert not lifecycle.should_stop()
+    lifecycle.start()
+    assert lifecycle.is_started()
+    start = time.time()
+    while len(started) < 2 and time.time() - start < 5.0:
+        time.sleep(0.001)
+    lifecycle.stop()
+    for w in workers:
+        w.join(timeout=5.0)
+        assert not w.is_alive()
+    assert started == [True, True]
+    assert lifecycle.should_stop()
+
+def test_lifecycle_stop_before_start():
+    lifecycle = Lifecycle(processes=2)
+    # only one of the two processes gets ready, stopping releases it from the barrier
+    results = []
+    def worker():
+        results.append(lifecycle.ready())
+        results.append(lifecycle.wait_for_start())
+
+    w = threading.Thread(target=worker)
+    w.start()
+    lifecycle.stop()
+    w.join(timeout=5.0)
+    assert not w.is_alive()
+    assert results == [False, False]
@@ -0,0 +1,40 @@
+import pickle
+import threading
+import time
+
+import numpy as np
+
+from utility.SharedRingBuffer import SharedRingBuffer
+
+def test_mailbox_wait_for_newer():
+    buffer = SharedRingBuffer(2, (3,), np.int32)
+    try:
+        assert buffer.version() == -1
+        # nothing is posted, so this should just time out
+        start = time.time()
+        assert buffer.wait_for_newer(-1, timeout=0.05) == -1
+        assert time.time() - start >= 0.04
+
+        publisher = threading.Timer(0.05, lambda: buffer.publish(np.array([1, 2, 3]), 1.0))
+        publisher.start()
+        item, item_id, timestamp = buffer.wait_newer_than(-1, timeout=5.0)
+        publisher.join()
+        assert item_id == 0 and timestamp == 1.0
+        assert item.tolist() == [1, 2, 3]
+
+        # only the newest value is read, older ones are simply overwritten
+        buffer.publish(np.array([4, 5, 6]), 2.0)
+        buffer.publish(np.array([7, 8, 9]), 3.0)
+        assert buffer.wait_for_newer(0) == 2
+        item, item_id, timestamp = buffer.wait_newer_than(0)
+        assert item_id == 2 and item.tolist() == [7, 8, 9]
+
+        # a copy that didn't inherit the condition still sees new versions
+        attached = pickle.loads(pickle.dumps(buffer))
+        publisher = threading.Timer(0.05, lambda: buffer.publish(np.array([0, 0, 0]), 4.0))
+        publisher.start()
+        assert attached.wait_for_newer(2, timeout=5.0) == 3
+        publisher.join()
+        attached.close()
+    finally:
+        buffer.close()
@@ -5,14 +5,21 @@ import numpy as np
 import pytest
 from PIL import Image
 
+from modeling.objects.Ashes import Ashes
 from modeling.objects.Grass import GRASS_HARVESTED, GRASS_READY, Grass
 from modeling.objects.Sapling import SAPLING_HARVESTED, SAPLING_READY, Sapling
+from modeling.CameraModel import CameraModel
+from modeling.DriftEstimator import DriftEstimator
 from modeling.Modeling import Modeling
 from modeling.PlayerModel import PlayerModel
 from modeling.WorldModel import WorldModel
 from modeling.constants import CAMERA_HEADING, CAMERA_PITCH, CAMERA_DISTANCE, FOV
 from modeling.constants import DISTANCE_FOR_SAME_OBJECT, CHUNK_SIZE, CYCLES_TO_ADMIT_OBJECT, DISTANCE_FOR_VALID_PLAYER_POSITION
 from modeling.Scheduler import SchedulerMock
+from utility.GameTime import GameTime
+from modeling.ObjectStore import ObjectStore
+from modeling.SpatialHash import SpatialHash
+from modeling.TerrainMap import TerrainMap
 from perception.constants import SCREEN_SIZE
 from perception.YoloIdConverter import yolo_id_converter
 from perception.ImageObject import ImageObject
@@ -367,6 +374,291 @@ def test_distance_for_same_object():
     
     assert len(modeling.world_model.object_lists["Sapling"]) == 2
 
+def test_recent_objects_bookkeeping():
+    modeling = Modeling()
+    world_model = modeling.world_model
+    sapling_image = ImageObject(SAPLING_READY, 1, [SCREEN_SIZE["width"]//2, SCREEN_SIZE["height"]//2, SCREEN_SIZE["width"]*0.2, SCREEN_SIZE["height"]*0.2])
+    for count in range(1, CYCLES_TO_ADMIT_OBJECT):
+        world_model.start_cycle()
+        world_model.handle_object_at_position(sapling_image, Point2d(0, 0))
+        world_model.finish_cycle()
+        assert len(world_model.recent_objects) == 1
+        assert list(world_model.recent_objects.values()) == [count]
+    sapling = next(iter(world_model.recent_objects))
+    world_model.start_cycle()
+    assert world_model.objects_detected_this_cycle == {sapling: False}
+    world_model.handle_object_at_position(sapling_image, Point2d(0.5, 0))
+    assert world_model.objects_detected_this_cycle == {sapling: True}
+    world_model.finish_cycle()
+    # the object was admitted, so it's not a recent object anymore
+    assert len(world_model.recent_objects) == 0
+    assert world_model.object_lists["Sapling"] == [sapling]
+    assert sapling.position.x1 == 0.5
+
+def test_batch_object_association():
+    """objects_detected should have the same effects as calling object_detected for each object"""
+    random.seed(1234)
+    sequential = Modeling()
+    batch = Modeling()
+    width = SCREEN_SIZE["width"]
+    height = SCREEN_SIZE["height"]
+    anchors = [(random.uniform(0.2, 0.8)*width, random.uniform(0.2, 0.8)*height) for _ in range(15)]
+    for _ in range(8):
+        detections = []
+        for x, y in anchors:
+            if random.random() < 0.8:
+                class_id = random.choice([SAPLING_READY, GRASS_READY])
+                box = [int(x + random.uniform(-40, 40)), int(y + random.uniform(-40, 40)), 40, 60]
+                detections.append(ImageObject(class_id, 1.0, box))
+        for modeling in [sequential, batch]:
+            modeling.world_model.start_cycle()
+        for obj in detections:
+            sequential.world_model.object_detected(obj)
+        batch.world_model.objects_detected(detections)
+        for modeling in [sequential, batch]:
+            modeling.world_model.finish_cycle()
+
+        assert sequential.world_model.object_lists.keys() == batch.world_model.object_lists.keys()
+        for name, obj_list in sequential.world_model.object_lists.items():
+            batch_list = batch.world_model.object_lists[name]
+            assert [(o.position.x1, o.position.x2) for o in obj_list] == [(o.position.x1, o.position.x2) for o in batch_list]
+            assert [o.get_cycles_to_be_deleted() for o in obj_list] == [o.get_cycles_to_be_deleted() for o in batch_list]
+        assert ([(o.name_str(), o.position.x1, o.position.x2, count) for o, count in sequential.world_model.recent_objects.items()] == 
+                [(o.name_str(), o.position.x1, o.position.x2, count) for o, count in batch.world_model.recent_objects.items()])
+        assert sequential.world_model.avg_observed_error.x1 == batch.world_model.avg_observed_error.x1
+        assert sequential.world_model.avg_observed_error.x2 == batch.world_model.avg_observed_error.x2
+
+def test_spatial_hash():
+    scheduler = SchedulerMock(Clock(), None)
+    index = SpatialHash(DISTANCE_FOR_SAME_OBJECT)
+    sap1 = Sapling(Point2d(0, 0), Point2d(0, 0), SAPLING_READY, scheduler)
+    sap2 = Sapling(Point2d(2.4, 0.5), Point2d(0, 0), SAPLING_READY, scheduler)
+    gr1 = Grass(Point2d(0.1, 0.1), Point2d(0, 0), GRASS_READY, scheduler)
+    for obj in [sap1, sap2, gr1]:
+        index.insert(obj)
+    assert len(index) == 3
+    # only objects with the same name are matched
+    assert index.nearest(Point2d(0.2, 0.2), "Sapling")[0] is sap1
+    assert index.nearest(Point2d(0.2, 0.2), "Grass")[0] is gr1
+    # objects in neighboring cells are found, objects further than the radius aren't
+    assert index.nearest(Point2d(2.6, 0.5), "Sapling")[0] is sap2
+    assert index.nearest(Point2d(-2.5, 0), "Sapling") == (sap1, 2.5)
+    assert index.nearest(Point2d(5.0, 3.0), "Sapling") == (None, None)
+
+    index.move(sap2, sap2.position, Point2d(10, 10))
+    sap2.position = Point2d(10, 10)
+    assert index.nearest(Point2d(9, 9), "Sapling")[0] is sap2
+    assert index.nearest(Point2d(2.4, 0.5), "Sapling")[0] is sap1
+    index.remove(sap1)
+    assert index.nearest(Point2d(0.2, 0.2), "Sapling") == (None, None)
+    assert len(index) == 2
+
+def test_camera_model():
+    camera = CameraModel.get(CAMERA_HEADING, CAMERA_PITCH, CAMERA_DISTANCE, FOV)
+    # the same camera setup is only computed once
+    assert CameraModel.get(CAMERA_HEADING, CAMERA_PITCH, CAMERA_DISTANCE, FOV) is camera
+    assert CameraModel.get(CAMERA_HEADING + 45, CAMERA_PITCH, CAMERA_DISTANCE, FOV) is not camera
+    expected_corners = [(2.202, -36.468), (16.263, -2.791), (-2.791, 16.263), (-36.468, 2.202)]
+    for corner, (x1, x2) in zip(camera.view_corners, expected_corners):
+        assert abs(corner.x1 - x1) < 0.01 and abs(corner.x2 - x2) < 0.01
+    screen_points = np.array([[0, 0], [SCREEN_SIZE["width"]/2, SCREEN_SIZE["height"]/2], [1500, 900.5], [300, 1000]])
+    world_points = camera.screen_to_world(screen_points)
+    assert np.allclose(camera.world_to_screen(world_points), screen_points)
+    # a single point gives exactly the same result as in a batch
+    for screen_point, world_point in zip(screen_points, world_points):
+        assert (camera.screen_to_world(screen_point[None, :])[0] == world_point).all()
+
+def test_terrain_map():
+    terrain_map = TerrainMap(block_size=4, votes=3)
+    # the tiles span negative indices and several blocks
+    x1 = np.array([-5, -1, 0, 3, 4, 9])
+    x2 = np.array([0, -7, 2, 3, 5, -1])
+    terrain_map.add_detections(x1, x2, np.array([1, 2, 3, 4, 0, 5]))
+    # detections of type 0 are ignored
+    assert len(terrain_map) == 5
+    assert (4, 5) not in terrain_map
+    assert terrain_map.type_at(-1, -7) == 2
+    assert terrain_map.type_at(100, 100) == 0
+    region = terrain_map.region(-5, 10, -7, 6)
+    assert region.shape == (15, 13)
+    for a, b, t in [(-5, 0, 1), (-1, -7, 2), (0, 2, 3), (3, 3, 4), (9, -1, 5)]:
+        assert region[a + 5, b + 7] == t
+    assert np.count_nonzero(region) == 5
+
+    # the type is the most common among the latest votes, ties go to the smallest type
+    tile = (np.array([0]), np.array([2]))
+    terrain_map.add_detections(*tile, np.array([5]))
+    assert terrain_map.type_at(0, 2) == 3
+    terrain_map.add_detections(*tile, np.array([5]))
+    assert terrain_map.type_at(0, 2) == 5
+    # the first vote (3) is dropped
+    terrain_map.add_detections(*tile, np.array([1]))
+    assert terrain_map.type_at(0, 2) == 5
+    terrain_map.add_detections(*tile, np.array([1]))
+    assert terrain_map.type_at(0, 2) == 1
+
+def test_object_store():
+    clock = Clock()
+    world_model = WorldModel(PlayerModel(clock), clock)
+    world_model.object_store = ObjectStore(capacity=2)
+    scheduler = SchedulerMock(clock, world_model)
+    sap1 = Sapling(Point2d(0, 0), Point2d(0, 0), SAPLING_READY, scheduler)
+    sap2 = Sapling(Point2d(3, 4), Point2d(0, 0), SAPLING_HARVESTED, scheduler)
+    gr1 = Grass(Point2d(1, 0), Point2d(0, 0), GRASS_READY, scheduler)
+    # the store grows past its initial capacity
+    for obj in [sap1, sap2, gr1]:
+        world_model.add_object(obj)
+    store = world_model.object_store
+    assert len(store) == 3
+    assert store.nearest(Point2d(0.9, 0), ["Sapling"]) == (sap1, 0.9)
+    assert store.nearest(Point2d(0.9, 0))[0] is gr1
+    assert store.nearest(Point2d(10, 10), ["Sapling"], radius=1) == (None, None)
+    assert store.nearest(Point2d(0, 0), ["Evergreen"]) == (None, None)
+    assert store.within_radius(Point2d(0, 0), 5) == [sap1, sap2, gr1]
+    assert store.within_radius(Point2d(0, 0), 5, ["Sapling"]) == [sap1, sap2]
+    assert store.with_states(["Sapling"], [SAPLING_READY]) == [sap1]
+
+    # changes made through the objects are seen by the store
+    sap1.set_state(SAPLING_HARVESTED)
+    sap2.set_position(0.5, 0)
+    assert store.with_states(["Sapling"], [SAPLING_READY]) == []
+    assert store.nearest(Point2d(0.9, 0), ["Sapling"])[0] is sap2
+    sap1.countdown_cycles_to_be_deleted()
+    assert store.cycles_to_be_deleted[sap1._handle] == sap1.get_cycles_to_be_deleted()
+
+    # rows of removed objects are reused
+    handle = sap1._handle
+    world_model.remove_object(sap1, sap1.position)
+    assert len(store) == 2
+    assert store.within_radius(Point2d(0, 0), 5, ["Sapling"]) == [sap2]
+    sap3 = Sapling(Point2d(20, 20), Point2d(0, 0), SAPLING_READY, scheduler)
+    world_model.add_object(sap3)
+    assert sap3._handle == handle
+    assert store.nearest(Point2d(19, 19), ["Sapling"])[0] is sap3
+
+def test_filter_index():
+    clock = Clock()
+    world_model = WorldModel(PlayerModel(clock), clock)
+    scheduler = SchedulerMock(clock, world_model)
+    sap1 = Sapling(Point2d(0, 0), Point2d(0, 0), SAPLING_READY, scheduler)
+    sap2 = Sapling(Point2d(1, 0), Point2d(0, 0), SAPLING_HARVESTED, scheduler)
+    gr1 = Grass(Point2d(2, 0), Point2d(0, 0), GRASS_READY, scheduler)
+    for obj in [sap1, sap2, gr1]:
+        world_model.add_object(obj)
+    results = world_model.get_all_of(["Grass", "Sapling", "Evergreen"], "only_not_harvested")
+    assert results == {"Grass": [gr1], "Sapling": [sap1], "Evergreen": []}
+
+    # harvesting, growing and removal update the filters
+    sap1.harvest()
+    sap2.update("grow")
+    assert world_model.get_all_of(["Sapling"], "only_not_harvested")["Sapling"] == [sap2]
+    world_model.remove_object(sap2, sap2.position)
+    assert world_model.get_all_of(["Sapling"], "only_not_harvested")["Sapling"] == []
+    sap3 = Sapling(Point2d(3, 0), Point2d(0, 0), SAPLING_READY, scheduler)
+    world_model.add_object(sap3)
+    assert world_model.get_all_of(["Sapling"], "only_not_harvested")["Sapling"] == [sap3]
+
+    # new filters can be registered
+    world_model.filter_index.register("harvested", lambda obj: obj.is_harvested())
+    assert world_model.get_all_of(["Sapling"], "harvested")["Sapling"] == [sap1]
+    with pytest.raises(ValueError):
+        world_model.get_all_of(["Sapling"], "not_a_filter")
+
+def test_scheduler():
+    clock = Clock()
+    world_model = WorldModel(PlayerModel(clock), clock)
+    scheduler = world_model.scheduler
+    gr1 = Grass(Point2d(0, 0), Point2d(0, 0), GRASS_READY, scheduler)
+    gr2 = Grass(Point2d(5, 0), Point2d(0, 0), GRASS_READY, scheduler)
+    world_model.add_object(gr1)
+    world_model.add_object(gr2)
+    # harvesting again replaces the pending regrowth
+    gr1.harvest()
+    gr1.harvest()
+    gr2.harvest()
+    assert scheduler.queue_depth() == 2
+    # removed objects don't grow later
+    world_model.remove_object(gr2, gr2.position)
+    assert scheduler.queue_depth() == 1
+
+    # changes in the current slot and in far slots are applied in time order, cancelled ones are skipped
+    handles = scheduler.schedule_changes([(GameTime(seconds=30), gr1.position, "grow", gr1),
+                                          (GameTime(seconds=1), gr1.position, "grow", gr1)])
+    assert scheduler.cancel(handles[1])
+    assert not scheduler.cancel(handles[1])
+    clock.time_in_seconds = 10
+    scheduler.update()
+    assert gr1.is_harvested()
+    clock.time_in_seconds = 30
+    scheduler.update()
+    assert not gr1.is_harvested()
+    assert scheduler.queue_depth() == 1
+    gr1.harvest()
+    clock.time_in_seconds = GameTime(days=100).seconds()
+    scheduler.update()
+    assert not gr1.is_harvested()
+    assert gr2.is_harvested()
+    assert scheduler.queue_depth() == 0
+
+def test_scheduler_discarded_recent_object():
+    clock = Clock()
+    world_model = WorldModel(PlayerModel(clock), clock)
+    world_model.start_cycle()
+    scheduler = world_model.scheduler
+    # ashes that are seen once and then missed are discarded before being admitted
+    ashes = Ashes(Point2d(0, 0), Point2d(0, 0), scheduler)
+    world_model.recent_objects[ashes] = 1
+    world_model.recent_object_index.insert(ashes)
+    world_model.objects_detected_this_cycle = {ashes: False}
+    world_model.finish_cycle()
+    assert ashes not in world_model.recent_objects
+    assert scheduler.queue_depth() == 0
+    # disappearing objects that aren't in the world model are ignored
+    Ashes(Point2d(0, 0), Point2d(0, 0), scheduler)
+    clock.time_in_seconds = 100
+    scheduler.update()
+    assert scheduler.queue_depth() == 0
+
+def test_scheduler_moved_object_disappears():
+    modeling = Modeling(clock=Clock())
+    world_model = modeling.world_model
+    ashes_image = ImageObject(30, 1, [SCREEN_SIZE["width"]//2, SCREEN_SIZE["height"]//2, SCREEN_SIZE["width"]*0.2, SCREEN_SIZE["height"]*0.2])
+    # the ashes schedule their disappearance at (2.4, 0), then move to another cell before being admitted
+    for x in [2.4, 2.6, 2.7]:
+        world_model.start_cycle()
+        world_model.handle_object_at_position(ashes_image, Point2d(x, 0))
+        world_model.finish_cycle()
+    ashes = world_model.object_lists["Ashes"][0]
+    assert ashes.position.x1 == 2.7
+    modeling.clock.time_in_seconds = 1000
+    world_model.scheduler.update()
+    assert world_model.object_lists["Ashes"] == []
+    assert ashes not in world_model.object_index.near(ashes.position, "Ashes", DISTANCE_FOR_SAME_OBJECT)
+    assert all(ashes not in chunk_objs for chunk_objs in world_model.objects_by_chunks.values())
+
+def test_drift_estimator():
+    estimator = DriftEstimator(capacity=20, trim_fraction=0.1, smoothing=0.5)
+    estimate = estimator.finish_cycle()
+    assert (estimate.x1, estimate.x2) == (0, 0)
+    # few errors aren't trimmed, so the estimate is the plain mean
+    estimator.start_cycle()
+    estimator.add(Point2d(1, 0))
+    estimator.add(Point2d(3, 2))
+    assert [(err.x1, err.x2) for err in estimator.errors()] == [(1, 0), (3, 2)]
+    estimate = estimator.finish_cycle()
+    assert (estimator.cycle_mean.x1, estimator.cycle_mean.x2) == (2, 1)
+    assert (estimate.x1, estimate.x2) == (1, 0.5)
+    # the farthest errors are trimmed and older errors are replaced once the capacity is reached
+    estimator.start_cycle()
+    for _ in range(29):
+        estimator.add(Point2d(1, 1))
+    estimator.add(Point2d(100, 100))
+    assert len(estimator) == 20
+    assert estimator.stats()["replaced"] == 10
+    estimate = estimator.finish_cycle()
+    assert estimator.stats()["trimmed"] == 2
+    assert (estimate.x1, estimate.x2) == (1, 0.75)
+
 def test_player_choice_algorithm():
     modeling = Modeling()
 
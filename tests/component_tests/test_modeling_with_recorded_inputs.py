@@ -41,12 +41,13 @@ def try_out_modeling_with_recorded_inputs():
     for file, order in zip(sorted_files, orders):
         with Image.open(file) as raw_image:
             img = np.asarray(raw_image)
-            objects, classes, scores, boxes = perception.perceive(np.asarray(img))
+            _, classes, scores, boxes = perception.perceive(np.asarray(img))
+            objects = perception.objects
             vis_screen.update_yolo_image(img[:, :, ::-1])
             vis_screen.draw_detected_objects(classes, scores, boxes)
             modeling.update_model(objects)
             vis_screen.update_world_model(modeling)
-            vis_screen.draw_estimation_errors(modeling.world_model.estimation_errors)
+            vis_screen.draw_estimation_errors(modeling.world_model.drift_estimator.errors())
             decision_making.decide(modeling)
             decision_making.secondary_action = order
             control.control(decision_making, modeling)
@@ -0,0 +1,21 @@
+import numpy as np
+
+from perception.MotionGate import MotionGate
+
+def test_motion_gate():
+    gate = MotionGate(threshold=2., max_skipped=2, thumbnail_size=(9, 16))
+    frame = np.zeros((90, 160, 3), dtype=np.uint8)
+    # the first frame is always processed
+    assert not gate.should_skip(frame)
+    # small changes are skipped, but only max_skipped frames in a row
+    slightly_changed = frame.copy()
+    slightly_changed[:10, :10] = 255
+    assert gate.should_skip(slightly_changed)
+    assert gate.should_skip(slightly_changed)
+    assert not gate.should_skip(slightly_changed)
+    # big changes are always processed
+    assert not gate.should_skip(np.full_like(frame, 100))
+    assert gate.stats()["hits"] == 2
+    assert gate.stats()["misses"] == 3
+    assert gate.stats()["forced"] == 1
+    assert gate.stats()["latest_difference"] > 90
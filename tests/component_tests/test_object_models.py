@@ -2,6 +2,7 @@ import pandas as pd
 import numpy as np
 
 from modeling.Modeling import Modeling
+from modeling.ObjectsInfo import ObjectsInfo
 from modeling.objects.Ashes import Ashes
 from modeling.objects.BerryBush import BerryBush, BERRYBUSH_READY, BERRYBUSH_HARVESTED
 from modeling.objects.Evergreen import Evergreen, EVERGREEN_SMALL
@@ -221,3 +222,19 @@ def test_possible_states():
     possible_states = nest.object_ids
     ground_truth = objects_info[objects_info["name"] == "SpiderNest"]["image_id"].values
     assert np.all(possible_states == ground_truth)
+
+def test_objects_info_lookups():
+    table = pd.read_csv("utility/objects_info.csv")
+    info = ObjectsInfo()
+    # lookups give the same as filtering the table, using the first row when there are several
+    for key in ["image_id", "name", "obj_id"]:
+        for value in table[key].unique():
+            row = table[table[key] == value].iloc[0]
+            for attr in ["image_id", "name", "obj_id", "object_type"]:
+                assert info.get_item_info(info=attr, **{key: value}) == row[attr]
+    for _, row in table.iterrows():
+        assert info.name_from_image_id(row["image_id"]) == row["name"]
+        assert info.obj_id_from_image_id(row["image_id"]) == row["obj_id"]
+        assert info.object_type_from_image_id(row["image_id"]) == row["object_type"]
+    assert info.obj_id_from_name("Rocks") == table[table["name"] == "Rocks"]["obj_id"].iloc[0]
+    assert info.name_from_obj_id(4) == "Grass"
@@ -0,0 +1,55 @@
+import pickle
+
+import numpy as np
+
+from perception.ImageObject import ImageObject, image_objects_to_detections, detections_to_image_objects
+from perception.SharedDetections import SharedDetections
+from perception.SharedSegmentationMask import SharedSegmentationMask
+from perception.YoloIdConverter import yolo_id_converter
+
+def test_shared_detections():
+    shared_detections = SharedDetections(capacity=4, slots=2)
+    try:
+        assert shared_detections.read_latest()[0] is None
+        objects = [ImageObject(1, 0.75, (10, 20, 30, 40)), ImageObject(5, 0.5, (1, 2, 3, 4))]
+        assert shared_detections.publish(objects, 1.0) == 0
+        detections, detections_id, timestamp = shared_detections.read_latest()
+        assert detections_id == 0 and timestamp == 1.0
+        assert len(detections) == 2
+        result = detections_to_image_objects(detections)
+        for obj, res in zip(objects, result):
+            assert obj.id == res.id and obj.score == res.score and list(obj.box) == res.box
+
+        # empty results are valid too
+        shared_detections.publish([], 2.0)
+        assert len(shared_detections.read_newer_than(0)[0]) == 0
+
+        # anything beyond the capacity is dropped
+        many_objects = [ImageObject(i, 0.5, (i, i, i, i)) for i in range(6)]
+        attached = pickle.loads(pickle.dumps(shared_detections))
+        shared_detections.publish(image_objects_to_detections(many_objects), 3.0)
+        detections, detections_id, timestamp = attached.read_newer_than(1)
+        assert detections_id == 2 and timestamp == 3.0
+        assert detections["class"].tolist() == [0, 1, 2, 3]
+        attached.close()
+    finally:
+        shared_detections.close()
+
+def test_yolo_ids_to_actual_ids():
+    yolo_ids = np.arange(len(yolo_id_converter.important_classes))[::-1]
+    actual_ids = yolo_id_converter.yolo_to_actual_ids(yolo_ids)
+    assert actual_ids.tolist() == [yolo_id_converter.yolo_to_actual_id(i) for i in yolo_ids.tolist()]
+    assert yolo_id_converter.yolo_to_actual_ids(np.zeros(0)).shape == (0,)
+
+def test_shared_segmentation_mask():
+    shared_mask = SharedSegmentationMask(mask_shape=(4, 4), slots=2)
+    try:
+        mask = np.arange(16, dtype=np.int64).reshape((4, 4)) % 3
+        assert shared_mask.publish(mask, 5.0) == 0
+        result, mask_id, timestamp = shared_mask.read_latest()
+        assert mask_id == 0 and timestamp == 5.0
+        assert result.dtype == np.uint8
+        assert np.array_equal(result, mask)
+        assert shared_mask.read_newer_than(0)[0] is None
+    finally:
+        shared_mask.close()
@@ -0,0 +1,46 @@
+import threading
+import time
+
+import numpy as np
+
+from utility.SharedRingBuffer import SharedRingBuffer
+from utility.TickScheduler import TickScheduler
+
+def test_tick_scheduler_rate():
+    scheduler = TickScheduler(rate=100, measure_time=True)
+    start = time.perf_counter()
+    for _ in range(10):
+        assert not scheduler.wait_for_next_tick()
+        assert not scheduler.end_tick()
+    # the first tick runs right away, then one every 10 ms
+    elapsed = time.perf_counter() - start
+    assert 0.085 <= elapsed < 0.5
+    assert len(scheduler.time_records) == 10
+    assert len(scheduler.time_records[0]) == len(scheduler.split_names)
+
+    # a tick that takes longer than the period overruns, and the next one runs right away
+    scheduler.wait_for_next_tick()
+    time.sleep(0.02)
+    assert scheduler.end_tick()
+    assert scheduler.overruns == 1
+    start = time.perf_counter()
+    scheduler.wait_for_next_tick()
+    assert time.perf_counter() - start < 0.05
+
+def test_tick_scheduler_new_data():
+    buffer = SharedRingBuffer(2, (1,), np.int32)
+    try:
+        scheduler = TickScheduler(rate=2, mailbox=buffer)
+        scheduler.wait_for_next_tick()
+        scheduler.end_tick()
+        # new data starts a tick way before the 500 ms period
+        publisher = threading.Timer(0.02, lambda: buffer.publish(np.array([1]), 1.0))
+        publisher.start()
+        start = time.perf_counter()
+        assert scheduler.wait_for_next_tick()
+        assert time.perf_counter() - start < 0.3
+        publisher.join()
+        scheduler.end_tick()
+        assert scheduler.last_version == 0
+    finally:
+        buffer.close()
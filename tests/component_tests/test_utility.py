@@ -1,4 +1,6 @@
-from utility.utility import lines_cross, is_inside_convex_polygon, get_multiples_in_range, iou
+import numpy as np
+
+from utility.utility import lines_cross, is_inside_convex_polygon, points_inside_convex_polygon, get_multiples_in_range, iou, block_modes, resize_and_normalize
 from utility.Point2d import Point2d
 
 def test_lines_cross():
@@ -47,6 +49,12 @@ def test_is_inside_convex_polygon():
     ]
     for test_case in test_cases:
         assert is_inside_convex_polygon(test_case[0], test_case[1]) == test_case[2]
+    # the vectorized version gives the same results
+    for poly in [poly_1, poly_2, poly_3, poly_4]:
+        cases = [test_case for test_case in test_cases if test_case[0] is poly]
+        positions = np.array([(test_case[1].x1, test_case[1].x2) for test_case in cases])
+        assert points_inside_convex_polygon(poly, positions).tolist() == [test_case[2] for test_case in cases]
+    assert points_inside_convex_polygon(poly_4, np.zeros((0, 2))).shape == (0,)
 
 def test_get_multiples_in_range():
     assert get_multiples_in_range(5, [11, 29]) == [15, 20, 25]
@@ -58,3 +66,30 @@ def test_iou():
     assert abs(iou([100, 100, 200, 200], [100, 100, 100, 200]) - 0.5) < 1e-4
     assert abs(iou([100, 100, 200, 200], [100, 100, 100, 100]) - 0.25) < 1e-4
     assert abs(iou([100, 100, 200, 200], [300, 300, 100, 200]) - 0.0) < 1e-4
+
+def test_block_modes():
+    rng = np.random.default_rng(0)
+    for _ in range(20):
+        # few values in small blocks, so there are plenty of ties
+        image = rng.integers(0, 8, size=(60, 50), dtype=np.uint8)
+        row_lines = sorted(rng.choice(np.arange(61), size=rng.integers(2, 8), replace=False).tolist())
+        column_lines = sorted(rng.choice(np.arange(51), size=rng.integers(2, 8), replace=False).tolist())
+        modes = block_modes(image, row_lines, column_lines)
+        assert modes.shape == (len(row_lines)-1, len(column_lines)-1)
+        for i in range(len(row_lines)-1):
+            for j in range(len(column_lines)-1):
+                values, counts = np.unique(image[row_lines[i]:row_lines[i+1], column_lines[j]:column_lines[j+1]], return_counts=True)
+                assert modes[i, j] == values[np.argmax(counts)]
+    assert block_modes(image, [3], [0, 10]).shape == (0, 1)
+
+def test_resize_and_normalize():
+    image = np.zeros((4, 6, 3), dtype=np.uint8)
+    image[:, 3:] = 255
+    mean = np.array([0.5, 0.5, 0.5])
+    std = np.array([0.5, 0.25, 0.5])
+    out = np.empty((2, 2, 3), dtype=np.float32)
+    result = resize_and_normalize(image, (2, 2), mean, std, out=out)
+    assert result is out
+    # each output pixel is the average of a 2x3 block
+    assert np.allclose(result[:, 0], [-1, -2, -1])
+    assert np.allclose(result[:, 1], [1, 2, 1])
@@ -16,7 +16,8 @@ def run_perception_modeling_single_frame(input_image_path):
     img = cv2.imread(input_image_path)
     # converting img from BGR to RGB
     img = img[:, :, ::-1]
-    objects = perception.perceive(img)[0]
+    perception.perceive(img)
+    objects = perception.objects
     modeling.received_yolo_info = True
     modeling.update_model_using_info(objects, None)
 
@@ -54,7 +55,8 @@ def run_perception_modeling_multiple_frames(input_image_paths, expected_results=
         vis_screen.update_yolo_image(img)
         # converting img from BGR to RGB
         img = img[:, :, ::-1]
-        objects, classes, scores, boxes = perception.perceive(img)
+        _, classes, scores, boxes = perception.perceive(img)
+        objects = perception.objects
         vis_screen.draw_detected_objects(classes, scores, boxes)
         modeling.update_model(objects)
         vis_screen.update_world_model(modeling)
@@ -18,7 +18,8 @@ def run_perception_modeling_decision_making_single_frame(input_image_path):
     vis_screen.update_yolo_image(img)
     # converting img from BGR to RGB
     img = img[:, :, ::-1]
-    objects = perception.perceive(img)[0]
+    perception.perceive(img)
+    objects = perception.objects
     modeling.update_model(objects)
     vis_screen.update_world_model(modeling)
     decision_making.decide(modeling)
@@ -7,7 +7,7 @@ from PIL import Image, ImageTk
 
 from perception.constants import SCREEN_SIZE
 from modeling.constants import CHUNK_SIZE, TILE_SIZE
-from modeling.TerrainTile import TerrainTile
+from modeling.TerrainMap import TerrainMap
 from utility.utility import get_multiples_in_range, get_color_representation_dict
 from utility.Point2d import Point2d
 
@@ -40,6 +40,8 @@ class DebugScreen:
         self.key_label.grid(row=3, column=0, pady=2)
         self.mouse_label = ttk.Label(text="Mouse command: -", font=("Arial", 30), wraplength=800, justify='center')
         self.mouse_label.grid(row=4, column=0, pady=2)
+        self.drift_label = ttk.Label(text="Drift: -", font=("Arial", 15), wraplength=800, justify='center')
+        self.drift_label.grid(row=5, column=0, pady=2)
         # self.local_map_div = ttk.LabelFrame(self.window, text="Local modeling", padding=40)
         # self.local_map = tk.Canvas(self.local_map_div, height=self.LOCAL_CANVAS_HEIGHT, width=self.LOCAL_CANVAS_WIDTH, highlightbackground="red", highlightcolor="red", relief='ridge')
         # self.local_map.pack()
@@ -93,7 +95,7 @@ class DebugScreen:
         if info is not None and info[0] == "segmentation_results" and self.perception_display_choice == "segmentation":
             colored_prediction = np.zeros((info[1].shape[0], info[1].shape[1], 3), dtype=np.uint8)
             for i, color in self.palette.items():
-                colored_prediction[info[1][:, :, i]] = color
+                colored_prediction[info[1] == i] = color
             img = Image.fromarray(colored_prediction)
             img = img.resize((SCREEN_SIZE["width"]//3, SCREEN_SIZE["height"]//3))
             tk_image = ImageTk.PhotoImage(img)
@@ -106,7 +108,7 @@ class DebugScreen:
         # only use the most updated info
         if info is not None and info[0] == "control_info":
             _, q1, q2, q3 = info
-            world_model_objects, fov_corners, player_position, terrain_tiles = q1
+            world_model_objects, fov_corners, player_position, terrain_map, drift_stats = q1
             primary_action, secondary_action = q2
             current_action, key_action, mouse_action = q3
             self.primary_action_label["text"] = "Primary action: " + str(primary_action)
@@ -121,6 +123,10 @@ class DebugScreen:
                 self.current_action_label["text"] = f"Current action: {str(current_action[0])}, {str(current_action[1])}"
             else:
                 self.current_action_label["text"] = "Current action: " + str(current_action)
+            self.drift_label["text"] = (f"Drift: ({drift_stats['estimate_x1']:.3f}, {drift_stats['estimate_x2']:.3f}), "
+                                        f"cycle mean ({drift_stats['cycle_mean_x1']:.3f}, {drift_stats['cycle_mean_x2']:.3f}), "
+                                        f"{drift_stats['errors']} errors, {drift_stats['trimmed']} trimmed, "
+                                        f"{drift_stats['replaced']} replaced")
             self.world_map.delete('all')
             for name, pos_list in world_model_objects:
                 if name == "Grass":
@@ -139,7 +145,7 @@ class DebugScreen:
         if self.player_position is not None:
             x1_range = (self.player_position.x1 - self.CLOSE_OBJECTS_X1/2, self.player_position.x1 + self.CLOSE_OBJECTS_X1/2)
             x2_range = (self.player_position.x2 - self.CLOSE_OBJECTS_X2/2, self.player_position.x2 + self.CLOSE_OBJECTS_X2/2)
-            self.draw_tiles(terrain_tiles, TILE_SIZE, x1_range, x2_range)
+            self.draw_tiles(terrain_map, TILE_SIZE, x1_range, x2_range)
             for name, position in self.world_objects:
                 if position.x1 > x1_range[0] and position.x1 < x1_range[1] and position.x2 > x2_range[0] and position.x2 < x2_range[1]:
                     if name == "Grass":
@@ -187,22 +193,25 @@ class DebugScreen:
         
         map_.create_polygon(x1, y1, x2, y2, x3, y3, x4, y4, fill='', outline="black")
     
-    def draw_tiles(self, terrain_tiles: dict[tuple[int, int], TerrainTile], tile_size : int, x1_range : tuple[int, int], x2_range : tuple[int, int]):
+    def draw_tiles(self, terrain_map : TerrainMap, tile_size : int, x1_range : tuple[int, int], x2_range : tuple[int, int]):
         x1_lines = get_multiples_in_range(tile_size, x1_range)
         x2_lines = get_multiples_in_range(tile_size, x2_range)
         map_ = self.world_map
         color_dict = get_color_representation_dict()
-        for x1 in x1_lines:
-            for x2 in x2_lines:
-                if x1 + tile_size < x1_range[1] and x2 + tile_size < x2_range[1]:
-                    if (int(x1//tile_size), int(x2//tile_size)) not in terrain_tiles:
-                        continue
-                    tile_type = terrain_tiles[int(x1//tile_size), int(x2//tile_size)].type
-                    lx, ly = self.convert_world_coords_to_world_graph(x1, x2, x1_range, x2_range)
-                    rx, ry = self.convert_world_coords_to_world_graph(x1+tile_size, x2+tile_size, x1_range, x2_range)
-                    color = color_dict[tile_type][1]
-                    if color is not None:
-                        map_.create_rectangle(lx, ly, rx, ry, fill=color)
+        if len(x1_lines) == 0 or len(x2_lines) == 0:
+            return
+        tile_types = terrain_map.region(int(x1_lines[0]//tile_size), int(x1_lines[-1]//tile_size) + 1,
+                                        int(x2_lines[0]//tile_size), int(x2_lines[-1]//tile_size) + 1)
+        # only known tiles are drawn
+        for i, j in zip(*np.nonzero(tile_types)):
+            x1 = x1_lines[i]
+            x2 = x2_lines[j]
+            if x1 + tile_size < x1_range[1] and x2 + tile_size < x2_range[1]:
+                lx, ly = self.convert_world_coords_to_world_graph(x1, x2, x1_range, x2_range)
+                rx, ry = self.convert_world_coords_to_world_graph(x1+tile_size, x2+tile_size, x1_range, x2_range)
+                color = color_dict[tile_types[i, j]][1]
+                if color is not None:
+                    map_.create_rectangle(lx, ly, rx, ry, fill=color)
 
     def draw_chunk_lines_world_canvas(self, chunk_size : int, x1_range : tuple[int, int], x2_range : tuple[int, int]):
         x1_lines = get_multiples_in_range(chunk_size, x1_range)
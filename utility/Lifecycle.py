@@ -0,0 +1,66 @@
+from multiprocessing import Barrier, Event
+from threading import BrokenBarrierError
+
+
+class Lifecycle:
+    def __init__(self, processes : int):
+        """Start/stop signalling shared by the main process and its worker processes. Workers block (instead of
+        spinning) until every one of them is ready and the run is started, and then get notified when they should stop
+
+        :param processes: number of worker processes that will call ready()
+        :type processes: int
+        """
+        self._ready_barrier = Barrier(processes)
+        self._start_event = Event()
+        self._stop_event = Event()
+
+    def ready(self, timeout : float = None) -> bool:
+        """Signal that the calling process finished initializing and wait for all the others
+
+        :param timeout: maximum time to wait in seconds, defaults to None (wait forever)
+        :type timeout: float, optional
+        :return: whether every process got ready, False if the timeout expired or a process aborted
+        :rtype: bool
+        """
+        try:
+            self._ready_barrier.wait(timeout)
+        except BrokenBarrierError:
+            return False
+        return True
+
+    def start(self) -> None:
+        self._start_event.set()
+
+    def stop(self) -> None:
+        """Ask every process to stop, this also wakes up the processes that are still waiting for the start
+        """
+        self._stop_event.set()
+        self._start_event.set()
+        # processes stuck on the barrier (because another one crashed, for example) are released as well
+        self._ready_barrier.abort()
+
+    def is_started(self) -> bool:
+        return self._start_event.is_set()
+
+    def should_stop(self) -> bool:
+        return self._stop_event.is_set()
+
+    def wait_for_start(self, timeout : float = None) -> bool:
+        """Block until the run is started
+
+        :param timeout: maximum time to wait in seconds, defaults to None (wait forever)
+        :type timeout: float, optional
+        :return: whether the run started, False if it timed out or was stopped before starting
+        :rtype: bool
+        """
+        return self._start_event.wait(timeout) and not self.should_stop()
+
+    def wait_for_stop(self, timeout : float = None) -> bool:
+        """Block until a stop is requested
+
+        :param timeout: maximum time to wait in seconds, defaults to None (wait forever)
+        :type timeout: float, optional
+        :return: whether a stop was requested, False if the timeout expired
+        :rtype: bool
+        """
+        return self._stop_event.wait(timeout)
@@ -0,0 +1,71 @@
+import time
+from multiprocessing import Condition
+from multiprocessing.context import get_spawning_popen
+
+import numpy as np
+
+from utility.SharedArray import SharedArray
+
+# how often a copy without the condition (see __getstate__) checks the version while waiting
+MAILBOX_POLL_INTERVAL = 0.0005
+
+
+class Mailbox:
+    def __init__(self):
+        """Latest value mailbox: producers overwrite the previous value and bump a version counter, consumers only
+        look at the newest version (in O(1)) and can block until a version newer than the one they have is posted.
+        Subclasses decide how the value itself is stored (see SharedRingBuffer)
+        """
+        # version of the latest value, -1 means nothing was posted yet
+        self._version = SharedArray((1,), np.int64)
+        self._version.array[0] = -1
+        self._condition = Condition()
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        # the condition can only be inherited by a process that is being started, a copy made any other way
+        # (by pickling it directly, for example) falls back to polling the version
+        if get_spawning_popen() is None:
+            state["_condition"] = None
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+
+    def version(self) -> int:
+        return int(self._version.array[0])
+
+    def _post(self, version : int) -> None:
+        """Make a new version visible to consumers and wake up the ones that are waiting for it
+
+        :param version: new version, it should be greater than the current one
+        :type version: int
+        """
+        if self._condition is None:
+            self._version.array[0] = version
+            return
+        with self._condition:
+            self._version.array[0] = version
+            self._condition.notify_all()
+
+    def wait_for_newer(self, version : int, timeout : float = None) -> int:
+        """Block until a version newer than the given one is posted
+
+        :param version: latest version the consumer already has
+        :type version: int
+        :param timeout: maximum time to wait in seconds, defaults to None (wait forever)
+        :type timeout: float, optional
+        :return: latest version, it's not newer than the given one if the timeout expired
+        :rtype: int
+        """
+        if self._condition is None:
+            start = time.time()
+            while self.version() <= version and (timeout is None or time.time() - start < timeout):
+                time.sleep(MAILBOX_POLL_INTERVAL)
+            return self.version()
+        with self._condition:
+            self._condition.wait_for(lambda: self.version() > version, timeout)
+            return self.version()
+
+    def close(self) -> None:
+        self._version.close()
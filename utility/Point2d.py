@@ -2,6 +2,8 @@ import math
 
 
 class Point2d:
+    __slots__ = ("x1", "x2")
+
     def __init__(self, x1 : float, x2 : float):
         self.x1 = x1
         self.x2 = x2
@@ -0,0 +1,43 @@
+from multiprocessing import shared_memory
+
+import numpy as np
+
+
+class SharedArray:
+    def __init__(self, shape : tuple[int, ...], dtype, name : str = None):
+        """NumPy array backed by shared memory, it can be passed to other processes (as a Process argument, for
+        example) and they'll attach to the same memory instead of receiving a copy
+
+        :param shape: array shape
+        :type shape: tuple[int, ...]
+        :param dtype: array dtype
+        :type dtype: np.dtype
+        :param name: name of an existing shared memory block to attach to, defaults to None (creates a new one)
+        :type name: str, optional
+        """
+        self.shape = tuple(shape)
+        self.dtype = np.dtype(dtype)
+        size = max(1, int(np.prod(self.shape))*self.dtype.itemsize)
+        self._owner = name is None
+        self._shm = shared_memory.SharedMemory(name=name, create=self._owner, size=size)
+        self.array = np.ndarray(self.shape, dtype=self.dtype, buffer=self._shm.buf)
+        if self._owner:
+            self.array.fill(0)
+
+    @property
+    def name(self) -> str:
+        return self._shm.name
+
+    def __getstate__(self):
+        return {"shape": self.shape, "dtype": self.dtype, "name": self.name}
+
+    def __setstate__(self, state):
+        self.__init__(state["shape"], state["dtype"], state["name"])
+
+    def close(self) -> None:
+        """Detach from the shared memory block, the creator also frees it
+        """
+        self.array = None
+        self._shm.close()
+        if self._owner:
+            self._shm.unlink()
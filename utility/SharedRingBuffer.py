@@ -0,0 +1,127 @@
+import numpy as np
+
+from utility.Mailbox import Mailbox
+from utility.SharedArray import SharedArray
+
+
+class SharedRingBuffer(Mailbox):
+    def __init__(self, slots : int, item_shape : tuple[int, ...], dtype):
+        """Shared memory ring buffer with a single producer. Each published item gets an increasing id (which works as a
+        sequence counter) and a timestamp, consumers read the latest item in place, without copying or unpickling it.
+        The item id is the mailbox version, so consumers can also block until a newer item is published
+
+        :param slots: number of items kept, a view returned by a read stays valid until the producer wraps around
+        :type slots: int
+        :param item_shape: shape of each item
+        :type item_shape: tuple[int, ...]
+        :param dtype: item dtype (can be a structured dtype)
+        :type dtype: np.dtype
+        """
+        super().__init__()
+        self.slots = slots
+        self._items = SharedArray((slots, *item_shape), dtype)
+        # id of the item stored in each slot, -1 means the slot is empty or being written
+        self._ids = SharedArray((slots,), np.int64)
+        self._ids.array.fill(-1)
+        self._timestamps = SharedArray((slots,), np.float64)
+        # how many entries along the first item axis are in use, for variable sized items
+        self._lengths = SharedArray((slots,), np.int64)
+
+    def _begin_write(self) -> tuple[np.array, int]:
+        """Get the slot the next item should be written to and mark it as being written
+
+        :return: slot array and the id the item will have
+        :rtype: tuple[np.array, int]
+        """
+        item_id = self.version() + 1
+        slot = item_id % self.slots
+        self._ids.array[slot] = -1
+        return self._items.array[slot], item_id
+
+    def _finish_write(self, item_id : int, timestamp : float, length : int) -> int:
+        slot = item_id % self.slots
+        self._timestamps.array[slot] = timestamp
+        self._lengths.array[slot] = length
+        self._ids.array[slot] = item_id
+        self._post(item_id)
+        return item_id
+
+    def publish(self, item : np.array, timestamp : float) -> int:
+        """Write a new item into the next slot, this should only be called by the producer. Items smaller than the slot
+        (along the first axis) are allowed, only the used part is returned when reading
+
+        :param item: item to be published
+        :type item: np.array
+        :param timestamp: timestamp of the item
+        :type timestamp: float
+        :return: id of the published item
+        :rtype: int
+        """
+        slot_array, item_id = self._begin_write()
+        length = len(item)
+        slot_array[:length] = item
+        return self._finish_write(item_id, timestamp, length)
+
+    def latest_id(self) -> int:
+        return self.version()
+
+    def read_latest(self) -> tuple[np.array, int, float]:
+        """Get the latest published item without copying it
+
+        :return: read-only view of the item, its id and its timestamp, or (None, -1, None) if nothing was published yet
+        :rtype: tuple[np.array, int, float]
+        """
+        while True:
+            item_id = self.version()
+            if item_id < 0:
+                return None, -1, None
+            slot = item_id % self.slots
+            timestamp = float(self._timestamps.array[slot])
+            length = int(self._lengths.array[slot])
+            # if the producer already started overwriting this slot, we just try again with the newer item
+            if self._ids.array[slot] == item_id:
+                item = self._items.array[slot][:length]
+                item.flags.writeable = False
+                return item, item_id, timestamp
+
+    def read_newer_than(self, item_id : int) -> tuple[np.array, int, float]:
+        """Same as read_latest, but only returns an item if it's newer than item_id
+
+        :param item_id: id of the last item the consumer used
+        :type item_id: int
+        :return: read-only view of the item, its id and its timestamp, or (None, -1, None) if there is no newer item
+        :rtype: tuple[np.array, int, float]
+        """
+        if self.latest_id() <= item_id:
+            return None, -1, None
+        return self.read_latest()
+
+    def wait_newer_than(self, item_id : int, timeout : float = None) -> tuple[np.array, int, float]:
+        """Same as read_newer_than, but blocks until a newer item is published instead of returning right away
+
+        :param item_id: id of the last item the consumer used
+        :type item_id: int
+        :param timeout: maximum time to wait in seconds, defaults to None (wait forever)
+        :type timeout: float, optional
+        :return: read-only view of the item, its id and its timestamp, or (None, -1, None) if the timeout expired
+        :rtype: tuple[np.array, int, float]
+        """
+        self.wait_for_newer(item_id, timeout)
+        return self.read_newer_than(item_id)
+
+    def is_valid(self, item_id : int) -> bool:
+        """Checks whether the item is still in the buffer, views of items that aren't valid anymore may have been overwritten
+
+        :param item_id: item id
+        :type item_id: int
+        :return: whether the item wasn't overwritten
+        :rtype: bool
+        """
+        return item_id >= 0 and self._ids.array[item_id % self.slots] == item_id
+
+    def close(self) -> None:
+        self._items.close()
+        self._ids.close()
+        self._timestamps.close()
+        self._lengths.close()
+        super().close()
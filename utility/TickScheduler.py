@@ -0,0 +1,94 @@
+import time
+
+from utility.Mailbox import Mailbox
+
+# time.sleep can oversleep by a few milliseconds (up to ~15 ms on Windows), so the end of each wait is spun instead
+SLEEP_SPIN_MARGIN = 0.002
+
+
+def precise_sleep(until : float) -> None:
+    """Sleep until the given time.perf_counter() value, sleeping coarsely first and then spinning for the last bit
+
+    :param until: perf_counter value to wake up at
+    :type until: float
+    """
+    remaining = until - time.perf_counter()
+    if remaining > SLEEP_SPIN_MARGIN:
+        time.sleep(remaining - SLEEP_SPIN_MARGIN)
+    while time.perf_counter() < until:
+        pass
+
+
+class TickScheduler:
+    def __init__(self, rate : float = None, mailbox : Mailbox = None, budget : float = None, measure_time=False):
+        """Decides when the next tick of a loop should run. With a rate, ticks run at that rate. With a mailbox, a tick
+        runs as soon as a new value is posted to it. With both, new values start a tick right away, but ticks still
+        run at the given rate when nothing new arrives
+
+        :param rate: target rate in ticks per second, defaults to None (no fixed rate)
+        :type rate: float, optional
+        :param mailbox: mailbox whose new values start a tick, defaults to None
+        :type mailbox: Mailbox, optional
+        :param budget: maximum duration of a tick in seconds, defaults to None (the tick period)
+        :type budget: float, optional
+        """
+        self.period = None if rate is None else 1/rate
+        self.mailbox = mailbox
+        self.budget = budget if budget is not None else self.period
+        self.last_version = -1
+        self.overruns = 0
+        self._next_tick = None
+        self._tick_start = None
+        self._wait_start = None
+        self._lateness = 0.
+        self._new_data = False
+        self.measure_time = measure_time
+        if self.measure_time:
+            self.time_records = []
+            self.split_names = ["wait", "tick", "lateness", "new_data", "overrun"]
+
+    def wait_for_next_tick(self) -> bool:
+        """Block until the next tick should run
+
+        :return: whether the mailbox has a new value
+        :rtype: bool
+        """
+        self._wait_start = time.perf_counter()
+        if self._next_tick is None:
+            self._next_tick = self._wait_start
+        new_data = False
+        if self.mailbox is not None:
+            if self.period is None:
+                version = self.mailbox.wait_for_newer(self.last_version)
+            else:
+                version = self.mailbox.wait_for_newer(self.last_version, max(0., self._next_tick - time.perf_counter()))
+            new_data = version > self.last_version
+            self.last_version = version
+        if not new_data and self.period is not None:
+            precise_sleep(self._next_tick)
+        self._tick_start = time.perf_counter()
+        # how late this tick started, only meaningful when it wasn't started by new data
+        self._lateness = 0. if new_data or self.period is None else self._tick_start - self._next_tick
+        self._new_data = new_data
+        return new_data
+
+    def end_tick(self) -> bool:
+        """Mark the end of the current tick and schedule the next one
+
+        :return: whether the tick took longer than the budget
+        :rtype: bool
+        """
+        tick_end = time.perf_counter()
+        overrun = self.budget is not None and tick_end - self._tick_start > self.budget
+        if overrun:
+            self.overruns += 1
+        if self.period is not None:
+            self._next_tick = self._tick_start + self.period
+            # after an overrun we don't try to catch up on the missed ticks, the next one just runs right away
+            if self._next_tick < tick_end:
+                self._next_tick = tick_end
+
+        if self.measure_time:
+            self.time_records.append([int((self._tick_start - self._wait_start)*1e9), int((tick_end - self._tick_start)*1e9),
+                                      int(self._lateness*1e9), int(self._new_data), int(overrun)])
+        return overrun
@@ -6,7 +6,7 @@ from modeling.objects.ObjectModel import ObjectModel
 from modeling.ObjectsInfo import objects_info
 from perception.constants import SCREEN_SIZE, SEGMENTATION_INPUT_SIZE
 from modeling.constants import CHUNK_SIZE, DISTANCE_FOR_SAME_OBJECT, TILE_SIZE
-from modeling.TerrainTile import TerrainTile
+from modeling.TerrainMap import TerrainMap
 from utility.Point2d import Point2d
 from utility.utility import draw_annotations, get_multiples_in_range, get_color_representation_dict
 
@@ -165,18 +165,18 @@ class Visualizer:
                 world_objects.append((obj_id, obj.position))
         player_position = player.position
         player_position_no_corrections = player.position_before_correction
-        new_recent_obj = [obj_pair[0] for obj_pair in recent_objects]
-        terrain_tiles = modeling.world_model.tiles
+        new_recent_obj = list(recent_objects)
+        terrain_map = modeling.world_model.terrain_map
         self.draw_world_model(world_objects, player_position, player_position_no_corrections,
                                 vision_corners, deletion_corners, origin_coordinates, 
-                                new_recent_obj, estimation_pairs, terrain_tiles)
+                                new_recent_obj, estimation_pairs, terrain_map)
 
     def draw_world_model(self, world_objects : list[tuple[str, Point2d]], player_position : Point2d, player_position_no_corrections : Point2d,
                             vision_corners : tuple[Point2d, Point2d, Point2d, Point2d], 
                             deletion_corners : tuple[Point2d, Point2d, Point2d, Point2d], 
                             origin_coordinates : Point2d, recent_objects : list[ObjectModel], 
                             estimation_pairs : list[tuple[str, Point2d, Point2d]],
-                            terrain_tiles : dict[tuple[int, int], TerrainTile]) -> None:
+                            terrain_map : TerrainMap) -> None:
         """Draw world model
 
         :param world_objects: list of relevant world objects
@@ -195,11 +195,13 @@ class Visualizer:
         :type recent_objects: list[ObjectModel]
         :param estimation_pairs: list of tuples of object name, estimated position and model position
         :type estimation_pairs: list[tuple[str, Point2d, Point2d]]
+        :param terrain_map: known terrain
+        :type terrain_map: TerrainMap
         """
         if player_position is not None:
             x1_range = (player_position.x1 - self.CLOSE_OBJECTS_X1/2, player_position.x1 + self.CLOSE_OBJECTS_X1/2)
             x2_range = (player_position.x2 - self.CLOSE_OBJECTS_X2/2, player_position.x2 + self.CLOSE_OBJECTS_X2/2)
-            self.draw_tiles(terrain_tiles, TILE_SIZE, x1_range, x2_range)
+            self.draw_tiles(terrain_map, TILE_SIZE, x1_range, x2_range)
             # black for objects in world model
             for obj_id, position in world_objects:
                 if position.x1 > x1_range[0] and position.x1 < x1_range[1] and position.x2 > x2_range[0] and position.x2 < x2_range[1]:
@@ -287,21 +289,24 @@ class Visualizer:
         self.draw.polygon([p1_x, p1_y, p2_x, p2_y, p3_x, p3_y, p4_x, p4_y], outline=color)
 
     
-    def draw_tiles(self, terrain_tiles: dict[tuple[int, int], TerrainTile], tile_size : int, x1_range : tuple[int, int], x2_range : tuple[int, int]):
+    def draw_tiles(self, terrain_map : TerrainMap, tile_size : int, x1_range : tuple[int, int], x2_range : tuple[int, int]):
         x1_lines = get_multiples_in_range(tile_size, x1_range)
         x2_lines = get_multiples_in_range(tile_size, x2_range)
         color_dict = get_color_representation_dict()
-        for x1 in x1_lines:
-            for x2 in x2_lines:
-                if x1 + tile_size < x1_range[1] and x2 + tile_size < x2_range[1]:
-                    if (int(x1//tile_size), int(x2//tile_size)) not in terrain_tiles:
-                        continue
-                    tile_type = terrain_tiles[int(x1//tile_size), int(x2//tile_size)].type
-                    lx, ly = self.convert_world_coords_to_world_graph(x1, x2, x1_range, x2_range)
-                    rx, ry = self.convert_world_coords_to_world_graph(x1+tile_size, x2+tile_size, x1_range, x2_range)
-                    color = color_dict[tile_type][1]
-                    if color is not None:
-                        self.draw.rectangle((lx, ly, rx, ry), outline="gray", fill=color)
+        if len(x1_lines) == 0 or len(x2_lines) == 0:
+            return
+        tile_types = terrain_map.region(int(x1_lines[0]//tile_size), int(x1_lines[-1]//tile_size) + 1,
+                                        int(x2_lines[0]//tile_size), int(x2_lines[-1]//tile_size) + 1)
+        # only known tiles are drawn
+        for i, j in zip(*np.nonzero(tile_types)):
+            x1 = x1_lines[i]
+            x2 = x2_lines[j]
+            if x1 + tile_size < x1_range[1] and x2 + tile_size < x2_range[1]:
+                lx, ly = self.convert_world_coords_to_world_graph(x1, x2, x1_range, x2_range)
+                rx, ry = self.convert_world_coords_to_world_graph(x1+tile_size, x2+tile_size, x1_range, x2_range)
+                color = color_dict[tile_types[i, j]][1]
+                if color is not None:
+                    self.draw.rectangle((lx, ly, rx, ry), outline="gray", fill=color)
 
     def export_results(self, output_path : str):
         self.image.save(output_path)
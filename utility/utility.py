@@ -190,6 +190,43 @@ def is_inside_convex_polygon(points: list[Point2d], p: Point2d) -> bool:
     # Return true if count is odd, false otherwise
     return True
 
+def points_inside_convex_polygon(points: list[Point2d], positions: np.array) -> np.array:
+    """Checks whether each position is inside the polygon described by points, the result is the same as calling
+    is_inside_convex_polygon for each one
+
+    :param points: points describing polygon
+    :type points: list[Point2d]
+    :param positions: array with shape (N, 2) with the positions to check
+    :type positions: np.array
+    :return: boolean array with shape (N,), whether each position is inside the polygon
+    :rtype: np.array
+    """
+    positions = np.asarray(positions, dtype=np.float64).reshape(-1, 2)
+    n = len(points)
+    if n < 3:
+        return np.zeros(len(positions), dtype=bool)
+    p1 = positions[:, 0]
+    p2 = positions[:, 1]
+    result = np.ones(len(positions), dtype=bool)
+    undecided = np.ones(len(positions), dtype=bool)
+    previous = None
+    # same edges and order of checks as is_inside_convex_polygon, the first check that decides a position wins
+    for i in range(n - 1):
+        a, b = points[i], points[i + 1]
+        # orientation(a, p, b), 0 for collinear, 1 for clockwise and 2 for counterclockwise
+        val = (p2 - a.x2) * (b.x1 - p1) - (p1 - a.x1) * (b.x2 - p2)
+        current = np.where(np.abs(val) < 1e-4, 0, np.where(val > 0, 1, 2))
+        collinear = undecided & (current == 0)
+        result[collinear] = ((p1 <= max(a.x1, b.x1)) & (p1 >= min(a.x1, b.x1)) &
+                             (p2 <= max(a.x2, b.x2)) & (p2 >= min(a.x2, b.x2)))[collinear]
+        undecided &= ~collinear
+        if previous is not None:
+            different = undecided & (previous != current)
+            result[different] = False
+            undecided &= ~different
+        previous = current
+    return result
+
 def get_multiples_in_range(number : int, range_ : tuple[int, int]) -> list[int]:
     """Get multiples of number inside the range range_
 
@@ -209,6 +246,61 @@ def get_multiples_in_range(number : int, range_ : tuple[int, int]) -> list[int]:
         aux_ += number
     return ans
 
+def block_modes(image : np.array, row_lines : list[int], column_lines : list[int]) -> np.array:
+    """Finds the most common value in each block of an integer image, the blocks are delimited by consecutive row and
+    column lines, which don't need to be evenly spaced. Ties are resolved to the smallest value and empty blocks get 0
+
+    :param image: 2D image with small non-negative integer values
+    :type image: np.array
+    :param row_lines: increasing row indices delimiting the blocks
+    :type row_lines: list[int]
+    :param column_lines: increasing column indices delimiting the blocks
+    :type column_lines: list[int]
+    :return: array with shape (len(row_lines)-1, len(column_lines)-1) with the mode of each block
+    :rtype: np.array
+    """
+    n_rows = max(len(row_lines) - 1, 0)
+    n_columns = max(len(column_lines) - 1, 0)
+    if n_rows == 0 or n_columns == 0:
+        return np.zeros((n_rows, n_columns), dtype=image.dtype)
+    cropped = image[row_lines[0]:row_lines[-1], column_lines[0]:column_lines[-1]]
+    n_values = int(cropped.max()) + 1 if cropped.size > 0 else 1
+    # block index of every row and column of the cropped image
+    row_blocks = np.repeat(np.arange(n_rows), np.diff(row_lines))
+    column_blocks = np.repeat(np.arange(n_columns), np.diff(column_lines))
+    # a single histogram over (block row, block column, value) counts every block at once
+    keys = (row_blocks[:, None]*n_columns + column_blocks[None, :])*n_values + cropped
+    counts = np.bincount(keys.ravel(), minlength=n_rows*n_columns*n_values).reshape(n_rows, n_columns, n_values)
+    # argmax returns the first maximum, so ties go to the smallest value and empty blocks to 0
+    return np.argmax(counts, axis=2).astype(image.dtype)
+
+def resize_and_normalize(image : np.array, size : tuple[int, int], mean : np.array, std : np.array,
+                         out : np.array = None) -> np.array:
+    """Resizes an image (area interpolation) and normalizes it as (image/255 - mean)/std. The image is resized while
+    it's still uint8, so only the small image is ever converted to float
+
+    :param image: uint8 image with shape (height, width, channels), values in [0, 255]
+    :type image: np.array
+    :param size: output (height, width)
+    :type size: tuple[int, int]
+    :param mean: mean of each channel, in [0, 1]
+    :type mean: np.array
+    :param std: standard deviation of each channel, in [0, 1]
+    :type std: np.array
+    :param out: float32 array with shape (height, width, channels) to write the result to, defaults to None (a new one)
+    :type out: np.array, optional
+    :return: normalized image with shape (height, width, channels)
+    :rtype: np.array
+    """
+    if out is None:
+        out = np.empty((size[0], size[1], image.shape[2]), dtype=np.float32)
+    small = cv2.resize(image, (size[1], size[0]), interpolation=cv2.INTER_AREA)
+    scale = (1/(255*np.asarray(std))).astype(np.float32)
+    offset = (np.asarray(mean)/np.asarray(std)).astype(np.float32)
+    np.multiply(small, scale, out=out)
+    out -= offset
+    return out
+
 def draw_annotations(image : np.array, classes : list[int], scores : list[float], 
                      boxes : list[list[int]], colors : list[tuple[int]] = [], positions : list[str] = []) -> tuple[np.array, list[str]]:
     """Draws (into image) annotations described by classes, scores and boxes